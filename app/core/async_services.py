@@ -0,0 +1,434 @@
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Optional, Awaitable, Callable, Iterator
+
+from app.core.db.async_connection import close_async_mysql_pool, run_async_mysql_read
+from app.core.db.async_mongo_connection import get_async_mongo_db, close_async_mongo_client
+from app.core.db.mongo_connection import pymongo_error
+from app.core.metrics import SERVICE_LATENCY, timed
+from app.core.query_hooks import timed_aggregate_async, timed_find_async, timed_write_async
+from app.core.repositories import films_mysql_async_repo as async_repo
+from app.core.repositories import query_logs_mongo_repo as repo_mogo
+from app.core.services import (
+    FilmSearchService,
+    add_page_tokens,
+    batch_query_keys,
+    batch_results,
+    calculate_total_pages,
+    decode_page_token,
+    format_last_unique_queries,
+    format_top_queries,
+    log_search_query,
+    name_log_collection,
+    name_rollup_collection,
+    normalize_year_range_for_category,
+    rollup_doc_to_last_query,
+    rollup_doc_to_top_query,
+    _to_int_or_none,
+)
+from app.core.user_settings import (
+    window_count_enabled,
+    query_log_async_enabled,
+    query_rollup_enabled,
+    search_many_max_workers,
+)
+
+_window_functions_supported = None
+# (search_type, params) of the search logs written in the current context, see `record_search_logs`
+_recorded_search_logs: ContextVar[Optional[list[tuple[str, dict]]]] = ContextVar("recorded_search_logs",
+                                                                                  default=None)
+
+
+def _parse_server_version(server_info: str) -> tuple[int, ...]:
+    """Parse a MySQL server version string such as "8.0.36-log" into a tuple."""
+    version = []
+    for part in server_info.split("-")[0].split("."):
+        if not part.isdigit():
+            break
+        version.append(int(part))
+    return tuple(version)
+
+
+def use_window_count_async(conn) -> bool:
+    """
+    Async-pool counterpart of `services.use_window_count`.
+
+    Args:
+        conn: aiomysql connection.
+
+    Returns:
+        bool: True if `window_count_enabled` is set and the server supports window functions.
+    """
+    global _window_functions_supported
+    if not window_count_enabled:
+        return False
+    if _window_functions_supported is None:
+        _window_functions_supported = _parse_server_version(conn.get_server_info() or "") >= (8, 0)
+    return _window_functions_supported
+
+
+@contextmanager
+def record_search_logs() -> Iterator[list[tuple[str, dict]]]:
+    """
+    Collect the search logs written by `log_search_query_async` inside the block.
+
+    Tasks started inside the block (e.g. the route behind an HTTP middleware) share the
+    list, so the caller can replay the same logs later without running the search.
+
+    Yields:
+        list[tuple[str, dict]]: (search_type, params) of every logged search, in order.
+    """
+    recorded = []
+    token = _recorded_search_logs.set(recorded)
+    try:
+        yield recorded
+    finally:
+        _recorded_search_logs.reset(token)
+
+
+async def log_search_query_async(search_type: str, params: dict) -> None:
+    """
+    Async version of `services.log_search_query`.
+
+    With `query_log_async_enabled` the record goes to the background writer queue
+    (no I/O in the request); otherwise it is written with the async MongoDB client.
+    """
+    recorded = _recorded_search_logs.get()
+    if recorded is not None:
+        recorded.append((search_type, params))
+    if query_log_async_enabled:
+        log_search_query(search_type, params)
+        return
+
+    rec = {"timestamp": datetime.now().isoformat(), "search_type": search_type, "params": params}
+    try:
+        db = get_async_mongo_db()
+        await timed_write_async(db.get_collection(name_log_collection), "insert_one_log", "insert_one", rec)
+        if query_rollup_enabled:
+            query_filter, update = repo_mogo.build_rollup_update(search_type, params, rec["timestamp"])
+            await timed_write_async(db.get_collection(name_rollup_collection), "update_one_rollup", "update_one",
+                                    query_filter, update=update, upsert=True)
+    except pymongo_error():
+        pass
+
+
+class AsyncFilmSearchService(FilmSearchService):
+    """
+    Async variant of `FilmSearchService` for the FastAPI interface.
+
+    Uses its own aiomysql pool and shares the in-memory catalog, category registry
+    and result cache with the sync service. Public methods have the same arguments
+    and return the same results as the sync ones, but must be awaited.
+    """
+
+    async def _cached_async(self, key: tuple,
+                            fetch: Callable[[], Awaitable[tuple[list[dict], int]]]) -> tuple[list[dict], int]:
+        """Async counterpart of `FilmSearchService._cached` (coalesces with `SingleFlight.do_async`)."""
+        if self.cache is None:
+            if self.single_flight is None:
+                return await fetch()
+            items, total = await self.single_flight.do_async(key, fetch)
+            return [dict(item) for item in items], total
+
+        cached = self.cache.get(key)
+        if cached is None:
+            async def fetch_and_store() -> tuple[list[dict], int]:
+                result = await fetch()
+                self.cache.set(key, result)
+                return result
+
+            if self.single_flight is None:
+                cached = await fetch_and_store()
+            else:
+                cached = await self.single_flight.do_async(key, fetch_and_store)
+
+        items, total = cached
+        return [dict(item) for item in items], total
+
+    async def _call_loaded(self, source, method: Callable, *args):
+        """
+        Call a catalog/registry method without blocking the event loop on a (re)load.
+
+        The (re)load from MySQL runs in a worker thread; lookups on loaded data run inline.
+        """
+        if source.is_stale():
+            return await asyncio.to_thread(method, *args)
+        return method(*args)
+
+    async def _fetch_by_keyword_async(self, keyword: str, limit: int, offset: int) -> tuple[list[dict], int]:
+        if self.catalog is not None:
+            return await self._call_loaded(self.catalog, self.catalog.search_by_keyword, keyword, limit, offset)
+
+        async def fetch(conn) -> tuple[list[dict], int]:
+            if use_window_count_async(conn):
+                return await async_repo.search_films_by_title_like_with_total(conn, keyword, limit, offset)
+            items = await async_repo.search_films_by_title_like(conn, keyword, limit, offset)
+            total = await async_repo.count_films_by_title_like(conn, keyword)
+            return items, total
+
+        return await run_async_mysql_read(fetch)
+
+    async def _fetch_by_category_async(self, category_id, limit: int, offset: int,
+                                       keyset: bool = False, cursor: Optional[str] = None) -> tuple[list[dict], int]:
+        seek = decode_page_token(cursor) if keyset else None
+        after = seek[1] if seek and seek[0] == "next" else None
+        before = seek[1] if seek and seek[0] == "prev" else None
+        if seek:
+            offset = 0
+
+        if self.catalog is not None:
+            if keyset:
+                return await self._call_loaded(self.catalog, self.catalog.search_by_category_keyset,
+                                               category_id, limit, after, before, offset)
+            return await self._call_loaded(self.catalog, self.catalog.search_by_category,
+                                           category_id, limit, offset)
+
+        async def fetch(conn) -> tuple[list[dict], int]:
+            if keyset:
+                items = await async_repo.search_films_by_category_keyset(conn, category_id, limit,
+                                                                         after, before, offset)
+            elif use_window_count_async(conn):
+                return await async_repo.search_films_by_category_with_total(conn, category_id, limit, offset)
+            else:
+                items = await async_repo.search_films_by_category(conn, category_id, limit, offset)
+            total = await async_repo.count_films_by_category(conn, category_id)
+            return items, total
+
+        return await run_async_mysql_read(fetch)
+
+    async def _fetch_by_category_year_async(self, category_id, year_from: int, year_to: int,
+                                            limit: int, offset: int, keyset: bool = False,
+                                            cursor: Optional[str] = None) -> tuple[list[dict], int]:
+        seek = decode_page_token(cursor) if keyset else None
+        after = seek[1] if seek and seek[0] == "next" else None
+        before = seek[1] if seek and seek[0] == "prev" else None
+        if seek:
+            offset = 0
+
+        if self.catalog is not None:
+            if keyset:
+                return await self._call_loaded(self.catalog, self.catalog.search_by_category_in_year_range_keyset,
+                                               category_id, year_from, year_to, limit, after, before, offset)
+            return await self._call_loaded(self.catalog, self.catalog.search_by_category_in_year_range,
+                                           category_id, year_from, year_to, limit, offset)
+
+        async def fetch(conn) -> tuple[list[dict], int]:
+            if keyset:
+                items = await async_repo.search_films_by_category_in_year_range_keyset(
+                    conn, category_id, year_from, year_to, limit, after, before, offset
+                )
+            elif use_window_count_async(conn):
+                return await async_repo.search_films_by_category_in_year_range_with_total(
+                    conn, category_id, year_from, year_to, limit, offset
+                )
+            else:
+                items = await async_repo.search_films_by_category_in_year_range(
+                    conn, category_id, year_from, year_to, limit, offset
+                )
+            total = await async_repo.count_films_by_category_in_year_range(conn, category_id, year_from, year_to)
+            return items, total
+
+        return await run_async_mysql_read(fetch)
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "search_by_keyword"))
+    async def search_by_keyword(self, keyword: str, page_size: int = 10, page: int = 1, log: bool = True,
+                                **kwargs) -> dict:
+        """Async version of `FilmSearchService.search_by_keyword`."""
+        offset = (page - 1) * page_size
+        cache_key = ("keyword", keyword.lower(), page_size, offset)
+        items, total = await self._cached_async(
+            cache_key, lambda: self._fetch_by_keyword_async(keyword, page_size, offset)
+        )
+        pages = calculate_total_pages(total, page_size)
+
+        if log:
+            params = {"keyword": keyword.lower(), "results_count": total}
+            await log_search_query_async("keyword", params)
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages
+        }
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "search_by_category"))
+    async def search_by_category(self, dict_category, page_size: int = 10, page: int = 1, log: bool = True,
+                                 keyset: bool = False, cursor: Optional[str] = None, **kwargs) -> dict:
+        """Async version of `FilmSearchService.search_by_category`."""
+        offset = (page - 1) * page_size
+        category_id = dict_category.get("category_id")
+        category_name = dict_category.get("category_name")
+
+        cache_key = ("category", _to_int_or_none(category_id), page_size, offset, keyset, cursor)
+        items, total = await self._cached_async(
+            cache_key, lambda: self._fetch_by_category_async(category_id, page_size, offset, keyset, cursor)
+        )
+        pages = calculate_total_pages(total, page_size)
+
+        if log:
+            params = {"category_name": category_name, "results_count": total}
+            await log_search_query_async("category", params)
+
+        result = {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages
+        }
+        if keyset:
+            add_page_tokens(result)
+        return result
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "search_by_category_year"))
+    async def search_by_category_year(self, dict_category, year_from, year_to, page_size: int = 10, page: int = 1,
+                                      log: bool = True, keyset: bool = False, cursor: Optional[str] = None,
+                                      **kwargs) -> dict:
+        """Async version of `FilmSearchService.search_by_category_year`."""
+        offset = (page - 1) * page_size
+        category_id = dict_category.get("category_id")
+        category_name = dict_category.get("category_name")
+
+        period = await self.get_year_range_by_category(dict_category) or {}
+        norm_year_from, norm_year_to = normalize_year_range_for_category(
+            year_from, year_to, int(period.get("year_from", 0)), int(period.get("year_to", 0))
+        )
+
+        cache_key = ("category_year", _to_int_or_none(category_id), norm_year_from, norm_year_to,
+                     page_size, offset, keyset, cursor)
+        items, total = await self._cached_async(
+            cache_key, lambda: self._fetch_by_category_year_async(category_id, norm_year_from, norm_year_to,
+                                                                  page_size, offset, keyset, cursor)
+        )
+        pages = calculate_total_pages(total, page_size)
+
+        if log:
+            params = {"category_name": category_name,
+                      "years_range": f"{year_from} - {year_to}",
+                      "results_count": total}
+            await log_search_query_async("category_year", params)
+
+        result = {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages
+        }
+        if keyset:
+            add_page_tokens(result)
+        return result
+
+    async def _run_batch_query_async(self, key: tuple, log: bool) -> dict:
+        """Async version of `FilmSearchService._run_batch_query`."""
+        try:
+            search_type, page, page_size = key[0], key[-2], key[-1]
+            if search_type == "keyword":
+                result = await self.search_by_keyword(key[1], page_size=page_size, page=page, log=log)
+                return {"ok": True, "result": result}
+
+            dict_category = await self.get_dict_category_by_name(key[1])
+            if dict_category is None:
+                return {"ok": False, "error": f"Category not found: {key[1]}"}
+            if search_type == "category":
+                result = await self.search_by_category(dict_category, page_size=page_size, page=page, log=log)
+            else:
+                result = await self.search_by_category_year(dict_category, key[2], key[3], page_size=page_size,
+                                                            page=page, log=log)
+            return {"ok": True, "result": result}
+        except Exception as err:  # one failed query must not fail the batch
+            return {"ok": False, "error": str(err) or type(err).__name__}
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "search_many"))
+    async def search_many(self, queries: list[dict], log: bool = False,
+                          max_page_size: Optional[int] = None) -> list[dict]:
+        """
+        Async version of `FilmSearchService.search_many`.
+
+        The unique queries run as concurrent tasks, at most `search_many_max_workers`
+        of them holding a connection of the async pool at a time.
+        """
+        keys = batch_query_keys(queries, max_page_size)
+        unique = list(dict.fromkeys(key for key in keys if not isinstance(key, ValueError)))
+        semaphore = asyncio.Semaphore(search_many_max_workers)
+
+        async def run(key: tuple) -> dict:
+            async with semaphore:
+                return await self._run_batch_query_async(key, log)
+
+        outcomes = dict(zip(unique, await asyncio.gather(*(run(key) for key in unique))))
+        return batch_results(keys, outcomes)
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "get_year_range_by_category"))
+    async def get_year_range_by_category(self, dict_category: dict) -> Optional[dict]:
+        """Async version of `FilmSearchService.get_year_range_by_category`."""
+        category_id = dict_category.get("category_id")
+        if self.categories is not None:
+            return await self._call_loaded(self.categories, self.categories.get_year_range, category_id)
+        if self.catalog is not None:
+            return await self._call_loaded(self.catalog, self.catalog.get_year_range_by_category, category_id)
+
+        return await run_async_mysql_read(async_repo.get_year_range_by_category, category_id)
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "list_all_categories"))
+    async def list_all_categories(self) -> list[dict]:
+        """Async version of `FilmSearchService.list_all_categories`."""
+        if self.categories is not None:
+            return await self._call_loaded(self.categories, self.categories.list_categories)
+
+        return await run_async_mysql_read(async_repo.list_categories)
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "suggest_titles"))
+    async def suggest_titles(self, prefix: str, limit: int = 10) -> list[dict]:
+        """Async version of `FilmSearchService.suggest_titles`."""
+        return await self._call_loaded(self.titles, self.titles.suggest, prefix, limit)
+
+    @timed(SERVICE_LATENCY.labels("AsyncFilmSearchService", "get_dict_category_by_name"))
+    async def get_dict_category_by_name(self, category_name) -> Optional[dict]:
+        """Async version of `FilmSearchService.get_dict_category_by_name`."""
+        if self.categories is not None:
+            return await self._call_loaded(self.categories, self.categories.get_by_name, category_name)
+
+        return await run_async_mysql_read(async_repo.get_category_by_category_name, category_name)
+
+
+class AsyncQueryLogService:
+    """Async variant of `QueryLogService` backed by the async MongoDB client."""
+
+    async def get_top_queries(self, limit: int = 5) -> list[dict]:
+        """Async version of `QueryLogService.get_top_queries`."""
+        db = get_async_mongo_db()
+        if query_rollup_enabled:
+            rollup = db.get_collection(name_rollup_collection)
+            docs = await timed_find_async(rollup, "find_top_queries_rollup", {},
+                                          sort=repo_mogo.build_top_queries_rollup_sort(), limit=limit)
+            result = [rollup_doc_to_top_query(doc) for doc in docs]
+        else:
+            collection = db.get_collection(name_log_collection)
+            result = await timed_aggregate_async(collection, "aggregate_top_queries",
+                                                 repo_mogo.build_top_queries_pipeline(limit))
+        return format_top_queries(result)
+
+    async def get_last_unique_queries(self, limit: int = 5) -> list[dict]:
+        """Async version of `QueryLogService.get_last_unique_queries`."""
+        db = get_async_mongo_db()
+        if query_rollup_enabled:
+            rollup = db.get_collection(name_rollup_collection)
+            docs = await timed_find_async(rollup, "find_last_unique_queries_rollup", {},
+                                          sort=repo_mogo.build_last_unique_rollup_sort(), limit=limit)
+            result = [rollup_doc_to_last_query(doc) for doc in docs]
+        else:
+            collection = db.get_collection(name_log_collection)
+            result = await timed_aggregate_async(collection, "aggregate_last_unique_queries",
+                                                 repo_mogo.build_last_unique_queries_pipeline(limit))
+        return format_last_unique_queries(result)
+
+
+async def shutdown_async_services() -> None:
+    """Close the async MySQL pool and MongoDB client."""
+    await close_async_mysql_pool()
+    await close_async_mongo_client()
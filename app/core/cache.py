@@ -0,0 +1,174 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.metrics import Sample, registry
+from app.core.user_settings import (
+    result_cache_ttl_seconds,
+    result_cache_max_entries,
+    result_cache_max_bytes,
+)
+
+_result_cache = None
+
+
+def approx_size(obj: Any) -> int:
+    """
+    Estimate the memory size of a search result in bytes.
+
+    Walks lists, tuples and dicts recursively; the estimate is only used to bound
+    the total cache size, so shared objects (e.g. interned strings) may be counted twice.
+    """
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(approx_size(k) + approx_size(v) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(approx_size(item) for item in obj)
+    return size
+
+
+class ResultCache:
+    """
+    Thread-safe TTL + LRU cache for search results.
+
+    Entries expire `ttl_seconds` after they were stored. When the cache holds more
+    than `max_entries` entries or `max_bytes` (approximate) bytes, the least
+    recently used entries are evicted.
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_entries: int = 1024, max_bytes: int = 8 * 1024 * 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[float, int, Any]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Canonical cache key.
+
+        Returns:
+            Any | None: Cached value, or None if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, size, value = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value and evict least recently used entries if the cache is over its bounds.
+
+        Args:
+            key: Canonical cache key.
+            value: Value to cache. It must not be modified after it was stored.
+        """
+        size = approx_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def invalidate(self, search_type: Optional[str] = None) -> None:
+        """
+        Drop cached entries.
+
+        Args:
+            search_type: Drop only entries whose key starts with this search type
+                (e.g. "keyword"). If None, the whole cache is cleared.
+        """
+        with self._lock:
+            if search_type is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if k[0] == search_type]:
+                self._remove(key)
+
+    def stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            dict: entries, bytes, hits, misses, evictions and hit_ratio.
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / requests if requests else 0.0,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+
+def cache_stats_samples(cache_name: str, stats: dict) -> list[Sample]:
+    """Convert `ResultCache.stats()` into metric samples labelled with the cache name."""
+    labels = {"cache": cache_name}
+    return [
+        Sample("cache_entries", "gauge", "Entries in the cache", labels, stats["entries"]),
+        Sample("cache_bytes", "gauge", "Approximate cache size in bytes", labels, stats["bytes"]),
+        Sample("cache_hits_total", "counter", "Cache hits", labels, stats["hits"]),
+        Sample("cache_misses_total", "counter", "Cache misses", labels, stats["misses"]),
+        Sample("cache_evictions_total", "counter", "Cache evictions", labels, stats["evictions"]),
+        Sample("cache_hit_ratio", "gauge", "Cache hit ratio since start", labels, stats["hit_ratio"]),
+    ]
+
+
+@registry.register_collector
+def collect_result_cache_stats() -> list[Sample]:
+    """Export the search result cache statistics (if the cache was created)."""
+    if _result_cache is None:
+        return []
+    return cache_stats_samples("result", _result_cache.stats())
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Get (or create) the global search result cache shared by all service instances.
+
+    Returns:
+        ResultCache: Result cache instance.
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ResultCache(
+            ttl_seconds=result_cache_ttl_seconds,
+            max_entries=result_cache_max_entries,
+            max_bytes=result_cache_max_bytes,
+        )
+    return _result_cache
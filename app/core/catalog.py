@@ -0,0 +1,367 @@
+import threading
+import unicodedata
+from bisect import bisect_left, bisect_right
+import time
+from array import array
+from typing import Optional
+
+from app.core.catalog_version import get_catalog_version
+from app.core.db.connection import run_mysql_read
+from app.core.repositories import films_mysql_repo as repo
+from app.core.trigram_index import TrigramIndex
+from app.core.user_settings import catalog_refresh_seconds
+
+NO_YEAR = -1
+
+_catalog = None
+
+
+def collation_key(text: str) -> str:
+    """
+    Get a sort key that orders titles like MySQL's case- and accent-insensitive collation.
+
+    Keyset pages are ordered by `f.title, f.film_id` under the column collation
+    (utf8mb4_0900_ai_ci), so a page token issued by one backend (MySQL or the catalog)
+    must seek to the same row in the other. Accents are stripped (NFKD without combining
+    marks) and case is folded; punctuation order may still differ from the collation.
+    """
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+class CatalogSnapshot:
+    """
+    Column arrays of a single catalog load.
+
+    Each row is one (film, category) pair, ordered by (film_id, category_id), i.e. the
+    same rows the search JOINs in `films_mysql_repo` return. A snapshot is never
+    modified after it was built; a refresh builds a new one and swaps it in.
+    """
+
+    def __init__(self, films: list[dict], categories: list[dict],
+                 previous: Optional["CatalogSnapshot"] = None):
+        """
+        Args:
+            films: Rows from `films_mysql_repo.list_films_with_categories`.
+            categories: Rows from `films_mysql_repo.list_categories`.
+            previous: Previous snapshot; its title index is updated incrementally
+                instead of being rebuilt from scratch.
+        """
+        self.film_ids = array("i")
+        self.release_years = array("h")
+        self.category_ids = array("h")
+        self.titles: list[str] = []
+        self.title_sort_keys: list[str] = []  # `collation_key` of each title
+
+        self.category_names: dict[int, str] = {
+            int(c["category_id"]): c["category_name"] for c in categories
+        }
+        rows_by_category: dict[int, array] = {cid: array("i") for cid in self.category_names}
+        rows_by_film: dict[int, array] = {}
+        titles_by_film: dict[int, str] = {}
+        year_range: dict[int, list[int]] = {}
+
+        for row_id, film in enumerate(films):
+            category_id = int(film["category_id"])
+            year = film.get("release_year")
+            year = NO_YEAR if year is None else int(year)
+
+            self.film_ids.append(int(film["film_id"]))
+            self.release_years.append(year)
+            self.category_ids.append(category_id)
+            self.titles.append(film["title"])
+            self.title_sort_keys.append(collation_key(film["title"]))
+            rows_by_category.setdefault(category_id, array("i")).append(row_id)
+            rows_by_film.setdefault(self.film_ids[row_id], array("i")).append(row_id)
+            titles_by_film[self.film_ids[row_id]] = film["title"]
+
+            if year != NO_YEAR:
+                bounds = year_range.setdefault(category_id, [year, year])
+                bounds[0] = min(bounds[0], year)
+                bounds[1] = max(bounds[1], year)
+
+        self.rows_by_category = rows_by_category
+        self.rows_by_film = rows_by_film
+        self.rows_by_category_title = {
+            cid: sorted(rows, key=self.title_key) for cid, rows in rows_by_category.items()
+        }
+        if previous is not None:
+            self.title_index = previous.title_index.updated(titles_by_film)
+        else:
+            self.title_index = TrigramIndex.build(titles_by_film)
+        self.year_range_by_category = {cid: tuple(b) for cid, b in year_range.items()}
+
+    def __len__(self) -> int:
+        return len(self.film_ids)
+
+    def row_to_dict(self, row_id: int) -> dict:
+        """Build a result item in the same format as the repository rows."""
+        year = self.release_years[row_id]
+        return {
+            "film_id": self.film_ids[row_id],
+            "title": self.titles[row_id],
+            "release_year": None if year == NO_YEAR else year,
+            "category_name": self.category_names.get(self.category_ids[row_id]),
+        }
+
+    def title_key(self, row_id: int) -> tuple[str, int]:
+        """Get the keyset pagination key of a row: (`collation_key` of the title, film_id)."""
+        return self.title_sort_keys[row_id], self.film_ids[row_id]
+
+    def seek(self, row_ids: list[int], limit: int, after: Optional[tuple] = None,
+             before: Optional[tuple] = None, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Get a keyset page of rows sorted by (title, film_id) and count distinct films.
+
+        Titles are compared with `collation_key`, the same order as the MySQL keyset queries.
+
+        Args:
+            row_ids: Matching row ids sorted by `title_key`.
+            limit: Maximum number of results to return.
+            after: (title, film_id) of the last row of the previous page.
+            before: (title, film_id) of the first row of the next page.
+            offset: Number of items to skip after the boundary (ignored with `before`).
+
+        Returns:
+            tuple: (items, total) where total is the number of distinct matching films.
+        """
+        if before is not None:
+            end = bisect_left(row_ids, (collation_key(before[0]), before[1]), key=self.title_key)
+            page_rows = row_ids[max(end - limit, 0):end]
+        else:
+            start = 0
+            if after is not None:
+                start = bisect_right(row_ids, (collation_key(after[0]), after[1]), key=self.title_key)
+            page_rows = row_ids[start + offset:start + offset + limit]
+        items = [self.row_to_dict(r) for r in page_rows]
+        total = len({self.film_ids[r] for r in row_ids})
+        return items, total
+
+    def paginate(self, row_ids, limit: int, offset: int) -> tuple[list[dict], int]:
+        """
+        Slice matching rows into a page and count distinct films.
+
+        Args:
+            row_ids: Matching row ids in catalog order.
+            limit: Maximum number of results to return.
+            offset: Number of items to skip (for pagination).
+
+        Returns:
+            tuple: (items, total) where total is the number of distinct matching films.
+        """
+        items = [self.row_to_dict(r) for r in row_ids[offset:offset + limit]]
+        total = len({self.film_ids[r] for r in row_ids})
+        return items, total
+
+
+class FilmCatalog:
+    """
+    In-memory film catalog engine.
+
+    Loads film/film_category/category from MySQL once and answers keyword, category
+    and category + year range searches (and their counts) fully in memory.
+    MySQL is only used for the initial load and for refreshes.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        """
+        Args:
+            refresh_seconds: Reload the catalog from MySQL when the current snapshot
+                is older than this number of seconds. None or 0 disables timed refresh.
+        """
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._snapshot is not None
+
+    def load(self) -> None:
+        """
+        Load (or reload) the catalog from MySQL.
+
+        The new snapshot replaces the current one only after it is fully built,
+        so concurrent searches always see a consistent catalog.
+
+        Raises:
+            DatabaseConnectionError: If a MySQL connection cannot be obtained.
+        """
+        films, categories = run_mysql_read(
+            lambda conn: (repo.list_films_with_categories(conn), repo.list_categories(conn))
+        )
+        self.load_rows(films, categories)
+
+    def load_rows(self, films: list[dict], categories: list[dict]) -> None:
+        """
+        Load the catalog from already fetched rows.
+
+        Args:
+            films: Rows from `films_mysql_repo.list_films_with_categories`.
+            categories: Rows from `films_mysql_repo.list_categories`.
+        """
+        self._snapshot = CatalogSnapshot(films, categories, previous=self._snapshot)
+        self._loaded_at = time.monotonic()
+
+    def refresh(self) -> None:
+        """Reload the catalog from MySQL on demand."""
+        with self._lock:
+            self.load()
+
+    def on_catalog_change(self, version: str) -> None:
+        """Reload a loaded catalog before a new catalog version is published (see `CatalogVersion`)."""
+        if self.is_loaded:
+            self.refresh()
+
+    def is_stale(self) -> bool:
+        """Check whether the data has to be (re)loaded from MySQL before the next lookup."""
+        if self._snapshot is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Get the current snapshot, loading or refreshing it if required."""
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.load()
+        return self._snapshot
+
+    def search_by_keyword(self, keyword: str, limit: int = 10, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Search films by a keyword in the film title.
+
+        Candidate films are taken from the trigram title index and verified, so the
+        result matches `LOWER(title) LIKE LOWER('%keyword%')`.
+
+        Args:
+            keyword: Keyword to search for.
+            limit: Maximum number of results to return.
+            offset: Number of items to skip (for pagination).
+
+        Returns:
+            tuple: (items, total) in the same format as the repository functions.
+        """
+        snap = self.snapshot()
+        row_ids = [r for film_id in snap.title_index.search(keyword) for r in snap.rows_by_film[film_id]]
+        return snap.paginate(row_ids, limit, offset)
+
+    def search_by_category(self, category_id, limit: int = 10, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Search films by category.
+
+        Args:
+            category_id: Category ID.
+            limit: Maximum number of results to return.
+            offset: Number of items to skip (for pagination).
+
+        Returns:
+            tuple: (items, total) in the same format as the repository functions.
+        """
+        snap = self.snapshot()
+        row_ids = snap.rows_by_category.get(int(category_id), array("i"))
+        return snap.paginate(row_ids, limit, offset)
+
+    def search_by_category_in_year_range(self, category_id, year_from: int, year_to: int,
+                                         limit: int = 10, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Search films by category and release year range.
+
+        Args:
+            category_id: Category ID.
+            year_from: Start year (inclusive).
+            year_to: End year (inclusive).
+            limit: Maximum number of results to return.
+            offset: Number of items to skip (for pagination).
+
+        Returns:
+            tuple: (items, total) in the same format as the repository functions.
+        """
+        snap = self.snapshot()
+        years = snap.release_years
+        row_ids = [r for r in snap.rows_by_category.get(int(category_id), ())
+                   if years[r] != NO_YEAR and year_from <= years[r] <= year_to]
+        return snap.paginate(row_ids, limit, offset)
+
+    def search_by_category_keyset(self, category_id, limit: int = 10, after: Optional[tuple] = None,
+                                  before: Optional[tuple] = None, offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Search films by category with keyset pagination ordered by (title, film_id).
+
+        Args:
+            category_id: Category ID.
+            limit: Maximum number of results to return.
+            after: (title, film_id) of the last row of the previous page.
+            before: (title, film_id) of the first row of the next page.
+            offset: Number of items to skip after the boundary (ignored with `before`).
+
+        Returns:
+            tuple: (items, total) in the same format as the repository functions.
+        """
+        snap = self.snapshot()
+        row_ids = snap.rows_by_category_title.get(int(category_id), [])
+        return snap.seek(row_ids, limit, after, before, offset)
+
+    def search_by_category_in_year_range_keyset(self, category_id, year_from: int, year_to: int,
+                                                limit: int = 10, after: Optional[tuple] = None,
+                                                before: Optional[tuple] = None,
+                                                offset: int = 0) -> tuple[list[dict], int]:
+        """
+        Search films by category and release year range with keyset pagination ordered by (title, film_id).
+
+        Args:
+            category_id: Category ID.
+            year_from: Start year (inclusive).
+            year_to: End year (inclusive).
+            limit: Maximum number of results to return.
+            after: (title, film_id) of the last row of the previous page.
+            before: (title, film_id) of the first row of the next page.
+            offset: Number of items to skip after the boundary (ignored with `before`).
+
+        Returns:
+            tuple: (items, total) in the same format as the repository functions.
+        """
+        snap = self.snapshot()
+        years = snap.release_years
+        row_ids = [r for r in snap.rows_by_category_title.get(int(category_id), [])
+                   if years[r] != NO_YEAR and year_from <= years[r] <= year_to]
+        return snap.seek(row_ids, limit, after, before, offset)
+
+    def get_year_range_by_category(self, category_id) -> Optional[dict]:
+        """
+        Get the available release year range for a category.
+
+        Returns:
+            dict | None: Same format as `films_mysql_repo.get_year_range_by_category`,
+                or None if the category has no films.
+        """
+        snap = self.snapshot()
+        category_id = int(category_id)
+        bounds = snap.year_range_by_category.get(category_id)
+        if bounds is None:
+            return None
+        return {
+            "year_from": bounds[0],
+            "year_to": bounds[1],
+            "category_name": snap.category_names.get(category_id),
+        }
+
+
+def get_film_catalog() -> FilmCatalog:
+    """
+    Get (or create) the global in-memory film catalog.
+
+    The catalog is created only once; it is loaded from MySQL lazily on first search
+    and reloaded when the catalog version changes.
+
+    Returns:
+        FilmCatalog: Film catalog instance.
+    """
+    global _catalog
+    if _catalog is None:
+        _catalog = FilmCatalog(refresh_seconds=catalog_refresh_seconds)
+        get_catalog_version().add_listener(_catalog.on_catalog_change)
+    return _catalog
@@ -0,0 +1,96 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from app.core.cache import get_result_cache
+from app.core.db.connection import run_mysql_read
+from app.core.repositories import films_mysql_repo as repo
+from app.core.user_settings import catalog_version_refresh_seconds, result_cache_enabled
+
+_catalog_version = None
+
+
+class CatalogVersion:
+    """
+    Cached version of the film catalog (see `films_mysql_repo.get_catalog_version`).
+
+    The version is re-read from MySQL at most once per `refresh_seconds`, so it can be
+    checked on every request. When it changes, the in-memory structures registered with
+    `add_listener` (catalog, category registry, title index) are reloaded and the search
+    result cache is cleared before the new version is published: ETags and fragment cache
+    keys built from a version never cover data loaded for an older one.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        """
+        Args:
+            refresh_seconds: Re-read the version when it is older than this number of
+                seconds. None or 0 reads it only once.
+        """
+        self.refresh_seconds = refresh_seconds
+        self._version: Optional[str] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str], None]] = []
+
+    def add_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Register a callback that reloads in-memory data when the catalog version changes.
+
+        Args:
+            listener: Called with the new version before it is published. If it raises,
+                the new version is not published and is re-read on the next check.
+        """
+        self._listeners.append(listener)
+
+    def load(self) -> None:
+        """
+        Read the catalog version from MySQL.
+
+        Raises:
+            DatabaseConnectionError: If a MySQL connection cannot be obtained.
+        """
+        self.set_version(run_mysql_read(repo.get_catalog_version))
+
+    def set_version(self, version: str) -> None:
+        """Store a freshly read catalog version; reloads the listeners and clears the result cache if it changed."""
+        if self._version is not None and version != self._version:
+            for listener in self._listeners:
+                listener(version)
+            if result_cache_enabled:
+                get_result_cache().invalidate()
+        self._version = version
+        self._loaded_at = time.monotonic()
+
+    def peek(self) -> Optional[str]:
+        """Get the last read catalog version without querying MySQL (None if it was never read)."""
+        return self._version
+
+    def is_stale(self) -> bool:
+        """Check whether the version has to be re-read from MySQL."""
+        if self._version is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._loaded_at > self.refresh_seconds
+
+    def get(self) -> str:
+        """Get the catalog version, re-reading it from MySQL if it is stale."""
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.load()
+        return self._version
+
+
+def get_catalog_version() -> CatalogVersion:
+    """
+    Get (or create) the global catalog version tracker.
+
+    Returns:
+        CatalogVersion: Catalog version tracker instance.
+    """
+    global _catalog_version
+    if _catalog_version is None:
+        _catalog_version = CatalogVersion(refresh_seconds=catalog_version_refresh_seconds)
+    return _catalog_version
@@ -0,0 +1,158 @@
+import threading
+import time
+from typing import Optional
+
+from app.core.catalog_version import get_catalog_version
+from app.core.db.connection import run_mysql_read
+from app.core.repositories import films_mysql_repo as repo
+from app.core.user_settings import category_registry_refresh_seconds
+
+_category_registry = None
+
+
+class CategorySnapshot:
+    """
+    Categories and year ranges of a single registry load.
+
+    A snapshot is never modified after it was built; a refresh builds a new one and
+    swaps it in with one assignment, so a lookup never sees the mappings of two loads.
+    """
+
+    def __init__(self, categories: list[dict], year_ranges: list[dict]):
+        """
+        Args:
+            categories: Rows from `films_mysql_repo.list_categories`.
+            year_ranges: Rows from `films_mysql_repo.list_year_ranges_by_category`.
+        """
+        self.categories = categories
+        self.by_id: dict[int, dict] = {int(c["category_id"]): c for c in categories}
+        self.by_name: dict[str, dict] = {c["category_name"].lower(): c for c in categories}
+        self.year_ranges: dict[int, tuple[int, int]] = {
+            int(r["category_id"]): (int(r["year_from"]), int(r["year_to"]))
+            for r in year_ranges if r.get("year_from") is not None
+        }
+        self.loaded_at = time.monotonic()
+
+
+class CategoryRegistry:
+    """
+    Process-wide dictionary of film categories.
+
+    Loads categories and their release year ranges from MySQL once and serves
+    id <-> name lookups (case-insensitive by name) and year ranges from memory.
+    The data is reloaded when it is older than `refresh_seconds` or on demand.
+    """
+
+    def __init__(self, refresh_seconds: Optional[float] = None):
+        """
+        Args:
+            refresh_seconds: Reload the registry when it is older than this number of
+                seconds. None or 0 disables timed refresh.
+        """
+        self.refresh_seconds = refresh_seconds
+        self._snapshot: Optional[CategorySnapshot] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        Load (or reload) categories and year ranges from MySQL.
+
+        Raises:
+            DatabaseConnectionError: If a MySQL connection cannot be obtained.
+        """
+        categories, year_ranges = run_mysql_read(
+            lambda conn: (repo.list_categories(conn), repo.list_year_ranges_by_category(conn))
+        )
+        self.load_rows(categories, year_ranges)
+
+    def load_rows(self, categories: list[dict], year_ranges: list[dict]) -> None:
+        """
+        Load the registry from already fetched rows.
+
+        Args:
+            categories: Rows from `films_mysql_repo.list_categories`.
+            year_ranges: Rows from `films_mysql_repo.list_year_ranges_by_category`.
+        """
+        self._snapshot = CategorySnapshot(categories, year_ranges)
+
+    def refresh(self) -> None:
+        """Reload the registry from MySQL on demand."""
+        with self._lock:
+            self.load()
+
+    def on_catalog_change(self, version: str) -> None:
+        """Reload a loaded registry before a new catalog version is published (see `CatalogVersion`)."""
+        if self._snapshot is not None:
+            self.refresh()
+
+    def is_stale(self) -> bool:
+        """Check whether the data has to be (re)loaded from MySQL before the next lookup."""
+        snap = self._snapshot
+        if snap is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - snap.loaded_at > self.refresh_seconds
+
+    def snapshot(self) -> CategorySnapshot:
+        """Get the current snapshot, loading or refreshing it if required."""
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.load()
+        return self._snapshot
+
+    def list_categories(self) -> list[dict]:
+        """
+        Get all categories.
+
+        Returns:
+            list[dict]: Same format as `films_mysql_repo.list_categories`.
+        """
+        return [dict(c) for c in self.snapshot().categories]
+
+    def get_by_id(self, category_id) -> Optional[dict]:
+        """Get a category dict (category_id, category_name) by id, or None."""
+        category = self.snapshot().by_id.get(int(category_id))
+        return dict(category) if category else None
+
+    def get_by_name(self, category_name: str) -> Optional[dict]:
+        """Get a category dict (category_id, category_name) by case-insensitive name, or None."""
+        category = self.snapshot().by_name.get((category_name or "").lower())
+        return dict(category) if category else None
+
+    def get_year_range(self, category_id) -> Optional[dict]:
+        """
+        Get the available release year range for a category.
+
+        Returns:
+            dict | None: Same format as `films_mysql_repo.get_year_range_by_category`,
+                or None if the category has no films.
+        """
+        snap = self.snapshot()
+        category_id = int(category_id)
+        bounds = snap.year_ranges.get(category_id)
+        if bounds is None:
+            return None
+        return {
+            "year_from": bounds[0],
+            "year_to": bounds[1],
+            "category_name": snap.by_id[category_id]["category_name"],
+        }
+
+
+def get_category_registry() -> CategoryRegistry:
+    """
+    Get (or create) the global category registry.
+
+    The registry is created only once; it is loaded from MySQL lazily on first use
+    and reloaded when the catalog version changes.
+
+    Returns:
+        CategoryRegistry: Category registry instance.
+    """
+    global _category_registry
+    if _category_registry is None:
+        _category_registry = CategoryRegistry(refresh_seconds=category_registry_refresh_seconds)
+        get_catalog_version().add_listener(_category_registry.on_catalog_change)
+    return _category_registry
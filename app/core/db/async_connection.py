@@ -0,0 +1,239 @@
+#  pip install aiomysql
+import asyncio
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Optional
+
+from app.core.exceptions import DatabaseConnectionError
+from app.core.metrics import Sample, registry
+from app.core.db.connection import READ, get_mysql_replica_set, replica_dbconfigs
+from app.core.db.local_settings import dbconfig
+from app.core.db.replicas import NoHealthyReplicaError
+from app.core.user_settings import (
+    async_mysql_pool_minsize,
+    async_mysql_pool_maxsize,
+    mysql_replica_fallback_to_primary,
+)
+
+if TYPE_CHECKING:
+    import aiomysql
+
+_async_pool = None
+_async_replica_pools: dict = {}
+# serializes pool creation: concurrent first requests must not each create (and leak) a pool
+_async_pool_lock = asyncio.Lock()
+
+
+def _get_aiomysql_config(config: Optional[dict] = None) -> dict:
+    """Translate a mysql-connector config (the primary `dbconfig` by default) into aiomysql connection arguments."""
+    config = config or dbconfig
+    return {
+        "host": config.get("host", "localhost"),
+        "port": int(config.get("port", 3306)),
+        "user": config.get("user"),
+        "password": config.get("password", ""),
+        "db": config.get("database") or config.get("db"),
+        "charset": config.get("charset", "utf8mb4"),
+        "autocommit": True,
+    }
+
+
+def _mysql_error() -> type[Exception]:
+    """Get `pymysql.MySQLError` (the driver is imported on first use)."""
+    import pymysql
+
+    return pymysql.MySQLError
+
+
+def _replica_failure_errors() -> tuple[type[Exception], ...]:
+    """Async counterpart of `connection.replica_failure_errors` (pymysql error classes)."""
+    import pymysql
+
+    return pymysql.err.InterfaceError, pymysql.err.OperationalError
+
+
+async def _create_pool(config: dict, error_message: str) -> "aiomysql.Pool":
+    import aiomysql
+
+    try:
+        return await aiomysql.create_pool(
+            minsize=async_mysql_pool_minsize,
+            maxsize=async_mysql_pool_maxsize,
+            **_get_aiomysql_config(config)
+        )
+    except _mysql_error() as err:
+        raise DatabaseConnectionError(error_message) from err
+
+
+async def get_async_mysql_pool() -> "aiomysql.Pool":
+    """
+    Get (or create) the global async MySQL connection pool.
+
+    The pool is independent of the sync pool used by the CLI and is created only
+    once per process (concurrent first callers wait for the same pool).
+
+    Returns:
+        aiomysql.Pool: Async MySQL connection pool instance.
+
+    Raises:
+        DatabaseConnectionError: If the pool cannot be created.
+    """
+    global _async_pool
+    if _async_pool is None:
+        async with _async_pool_lock:
+            if _async_pool is None:
+                _async_pool = await _create_pool(dbconfig, "Failed to create async MySQL connection pool")
+    return _async_pool
+
+
+async def _get_async_replica_pool(name: str):
+    """
+    Get (or create) the async pool of a read replica.
+
+    Raises:
+        DatabaseConnectionError: If the pool cannot be created.
+    """
+    pool = _async_replica_pools.get(name)
+    if pool is None:
+        async with _async_pool_lock:
+            pool = _async_replica_pools.get(name)
+            if pool is None:
+                pool = await _create_pool(replica_dbconfigs[name],
+                                          f"Failed to create async MySQL pool for replica {name}")
+                _async_replica_pools[name] = pool
+    return pool
+
+
+def _replica_in_use(name: str) -> int:
+    pool = _async_replica_pools.get(name)
+    return pool.size - pool.freesize if pool is not None else 0
+
+
+async def _acquire_replica(replicas) -> Optional[tuple]:
+    """Get (replica name, pool, connection) from the first healthy replica that provides one, or None."""
+    for name in replicas.select(_replica_in_use):
+        try:
+            pool = await _get_async_replica_pool(name)
+            conn = await pool.acquire()
+        except DatabaseConnectionError as err:
+            replicas.record_failure(name, err)
+            continue
+        except _mysql_error() as err:
+            replicas.record_failure(name, err)
+            continue
+        replicas.record_checkout(name)
+        return name, pool, conn
+    return None
+
+
+@registry.register_collector
+def collect_async_mysql_pool_stats() -> list[Sample]:
+    """Export the async MySQL pool sizes (of the pools that were created)."""
+    samples = []
+    if _async_pool is not None:
+        documentation = "Async MySQL pool connections by state"
+        samples += [
+            Sample("async_mysql_pool_connections", "gauge", documentation, {"state": "in_use"},
+                   _async_pool.size - _async_pool.freesize),
+            Sample("async_mysql_pool_connections", "gauge", documentation, {"state": "idle"},
+                   _async_pool.freesize),
+        ]
+    documentation = "Async MySQL read replica pool connections by state"
+    for name, pool in _async_replica_pools.items():
+        samples += [
+            Sample("async_mysql_replica_pool_connections", "gauge", documentation,
+                   {"replica": name, "state": "in_use"}, pool.size - pool.freesize),
+            Sample("async_mysql_replica_pool_connections", "gauge", documentation,
+                   {"replica": name, "state": "idle"}, pool.freesize),
+        ]
+    return samples
+
+
+async def _acquire(intent: str) -> tuple:
+    """Get (replica name or None for the primary, pool, connection), see `get_async_mysql_connection`."""
+    if intent == READ:
+        replicas = get_mysql_replica_set()
+        if replicas is not None:
+            acquired = await _acquire_replica(replicas)
+            if acquired is not None:
+                return acquired
+            if not mysql_replica_fallback_to_primary:
+                raise NoHealthyReplicaError("No healthy MySQL replica available")
+    return None, *await _acquire_primary()
+
+
+async def _acquire_primary() -> tuple:
+    pool = await get_async_mysql_pool()
+    try:
+        return pool, await pool.acquire()
+    except _mysql_error() as err:
+        raise DatabaseConnectionError("Failed to get async MySQL connection from pool") from err
+
+
+@asynccontextmanager
+async def get_async_mysql_connection(intent: str = READ):
+    """
+    Get a connection from the async MySQL pool and release it on exit.
+
+    Routing is the same as `connection.get_mysql_connection`: `READ` connections come
+    from a healthy read replica (sharing the sync replica health state) when replicas
+    are configured, `WRITE` connections from the primary. Prefer `run_async_mysql_read`
+    for reads: it also handles a replica that fails while the query runs.
+
+    Usage:
+        async with get_async_mysql_connection() as conn:
+            ...
+
+    Raises:
+        DatabaseConnectionError: If a connection cannot be obtained from the pool
+            (`NoHealthyReplicaError` if no replica is available and fallback is off).
+    """
+    _, pool, conn = await _acquire(intent)
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+async def run_async_mysql_read(query: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+    """
+    Async counterpart of `connection.run_mysql_read`.
+
+    Awaits `query(conn, *args, **kwargs)` on a `READ` connection; a connection-level
+    failure on a replica is reported to the replica set and the query is retried once
+    on the primary (unless `mysql_replica_fallback_to_primary` is off).
+    """
+    replica, pool, conn = await _acquire(READ)
+    try:
+        result = await query(conn, *args, **kwargs)
+    except Exception as err:
+        if replica is None or not isinstance(err, _replica_failure_errors()):
+            raise
+        get_mysql_replica_set().record_failure(replica, err)
+        if not mysql_replica_fallback_to_primary:
+            raise
+    else:
+        if replica is not None:
+            get_mysql_replica_set().record_success(replica)
+        return result
+    finally:
+        pool.release(conn)
+
+    pool, conn = await _acquire_primary()
+    try:
+        return await query(conn, *args, **kwargs)
+    finally:
+        pool.release(conn)
+
+
+async def close_async_mysql_pool() -> None:
+    """Close the global async MySQL pool and the replica pools if they were created."""
+    global _async_pool, _async_pool_lock
+    if _async_pool is not None:
+        _async_pool.close()
+        await _async_pool.wait_closed()
+        _async_pool = None
+    while _async_replica_pools:
+        _, pool = _async_replica_pools.popitem()
+        pool.close()
+        await pool.wait_closed()
+    _async_pool_lock = asyncio.Lock()  # the next pools may belong to another event loop
@@ -0,0 +1,52 @@
+from typing import TYPE_CHECKING
+
+from app.core.db.local_settings import MONGODB_URL_WRITE
+from app.core.db.mongo_connection import MONGODB_DB_NAME, pymongo_error
+from app.core.exceptions import MongoConnectionError
+
+if TYPE_CHECKING:
+    from pymongo import AsyncMongoClient
+
+_async_client = None
+
+
+def get_async_mongo_client() -> "AsyncMongoClient":
+    """
+    Get (or create) the global async MongoDB client.
+
+    Returns:
+        AsyncMongoClient: Async MongoDB client instance (with its own connection pool).
+
+    Raises:
+        MongoConnectionError: If the MongoDB client cannot be created.
+    """
+    global _async_client
+    if _async_client is None:
+        from pymongo import AsyncMongoClient
+
+        try:
+            _async_client = AsyncMongoClient(MONGODB_URL_WRITE)
+        except pymongo_error() as err:
+            raise MongoConnectionError("Failed to create async MongoDB client") from err
+    return _async_client
+
+
+def get_async_mongo_db():
+    """
+    Get the async MongoDB database used for query logging and reports.
+
+    Returns:
+        AsyncDatabase: Async MongoDB database instance.
+
+    Raises:
+        MongoConnectionError: If MongoDB connection fails.
+    """
+    return get_async_mongo_client()[MONGODB_DB_NAME]
+
+
+async def close_async_mongo_client() -> None:
+    """Close the global async MongoDB client if it was created."""
+    global _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
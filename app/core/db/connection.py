@@ -1,75 +1,379 @@
 #  pip install mysql-connector-python
-from app.core.exceptions import DatabaseConnectionError
-import mysql.connector
-from mysql.connector.pooling import MySQLConnectionPool
+import threading
+from contextlib import contextmanager
+from functools import partial
+from typing import Callable, Iterator, Optional, TypeVar
+
+from app.core.exceptions import DatabaseConnectionError, PoolTimeoutError
 
 from app.core.db.local_settings import dbconfig
+from app.core.db.pool import MySQLPool, PooledConnection
+from app.core.db.replicas import NoHealthyReplicaError, ReplicaSet
+from app.core.metrics import Sample, registry
+from app.core.user_settings import (
+    mysql_pool_size,
+    mysql_pool_max_overflow,
+    mysql_pool_acquire_timeout,
+    mysql_pool_leak_seconds,
+    mysql_pool_trace_checkouts,
+    mysql_replicas_enabled,
+    mysql_replica_selection,
+    mysql_replica_pool_size,
+    mysql_replica_max_failures,
+    mysql_replica_readmit_successes,
+    mysql_replica_health_check_seconds,
+    mysql_replica_fallback_to_primary,
+)
+
+try:
+    from app.core.db.local_settings import replica_dbconfigs
+except ImportError:  # optional: no read replicas
+    replica_dbconfigs = {}
+
+# Connection intents: reads may be served by a replica, writes always go to the primary.
+READ = "read"
+WRITE = "write"
 
 _pool = None
+_replica_pools: dict[str, MySQLPool] = {}
+_replicas = None
+_init_lock = threading.Lock()
 
+T = TypeVar("T")
 
-def create_mysql_connection():
+
+def create_mysql_connection(config: Optional[dict] = None):
     """
     Create a new direct MySQL connection.
 
     This function connects to the MySQL database using the configuration from
     local settings.
 
+    Args:
+        config: mysql-connector connection arguments; the primary `dbconfig` if not given.
+
     Returns:
         MySQLConnection: Active MySQL connection.
 
     Raises:
         DatabaseConnectionError: If the connection to MySQL cannot be established.
     """
+    import mysql.connector  # deferred: the driver is loaded with the first connection
+
     try:
-        connection = mysql.connector.connect(**dbconfig)
+        connection = mysql.connector.connect(**(config or dbconfig))
         return connection
     except mysql.connector.Error as err:
         raise DatabaseConnectionError("Failed to connect to MySQL") from err
 
 
-def get_mysql_pool() -> MySQLConnectionPool:
+def get_mysql_pool() -> MySQLPool:
     """
     Get (or create) a global MySQL connection pool.
 
     The pool is created only once and then reused for the whole application
-    runtime.
+    runtime. Connections are opened on demand.
 
     Returns:
-        MySQLConnectionPool: MySQL connection pool instance.
-
-    Raises:
-        DatabaseConnectionError: If the pool cannot be created.
+        MySQLPool: MySQL connection pool instance.
     """
     global _pool
     if _pool is None:
-        try:
-            _pool = MySQLConnectionPool(
-                pool_name="search_film_pool",
-                pool_size=20,
-                **dbconfig
-            )
-        except mysql.connector.Error as err:
-            raise DatabaseConnectionError("Failed to create MySQL connection pool") from err
+        with _init_lock:
+            if _pool is None:
+                _pool = MySQLPool(
+                    create_mysql_connection,
+                    pool_size=mysql_pool_size,
+                    max_overflow=mysql_pool_max_overflow,
+                    acquire_timeout=mysql_pool_acquire_timeout,
+                    leak_seconds=mysql_pool_leak_seconds,
+                    trace_checkouts=mysql_pool_trace_checkouts,
+                )
     return _pool
 
 
-def get_mysql_connection():
+def _check_replica(name: str) -> None:
+    """Health check of a replica: run `SELECT 1` on a connection from its pool."""
+    try:
+        conn = _replica_pools[name].acquire(timeout=mysql_pool_acquire_timeout)
+    except PoolTimeoutError:
+        return  # every connection is busy running queries: the replica is alive
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def _create_replica_set() -> ReplicaSet:
+    """Create the replica pools and the replica set, and start its health checks."""
+    for name, config in replica_dbconfigs.items():
+        _replica_pools[name] = MySQLPool(
+            partial(create_mysql_connection, config),
+            pool_size=mysql_replica_pool_size,
+            max_overflow=mysql_pool_max_overflow,
+            acquire_timeout=mysql_pool_acquire_timeout,
+            leak_seconds=mysql_pool_leak_seconds,
+            trace_checkouts=mysql_pool_trace_checkouts,
+        )
+    replicas = ReplicaSet(
+        list(replica_dbconfigs),
+        _check_replica,
+        selection=mysql_replica_selection,
+        max_failures=mysql_replica_max_failures,
+        readmit_successes=mysql_replica_readmit_successes,
+        health_check_seconds=mysql_replica_health_check_seconds,
+    )
+    replicas.start()
+    return replicas
+
+
+def get_mysql_replica_set() -> Optional[ReplicaSet]:
+    """
+    Get (or create) the global read replica set.
+
+    Replica pools are created from `replica_dbconfigs` (local settings) together with
+    the replica set, which starts its background health checks; concurrent first
+    callers get the same set. The async connection module shares the same replica set
+    (and thus the same health state).
+
+    Returns:
+        ReplicaSet | None: Replica set, or None if no replicas are configured or they are disabled.
+    """
+    global _replicas
+    if _replicas is None and mysql_replicas_enabled and replica_dbconfigs:
+        with _init_lock:
+            if _replicas is None:
+                _replicas = _create_replica_set()
+    return _replicas
+
+
+def replica_failure_errors() -> tuple[type[Exception], ...]:
+    """
+    Get the mysql-connector errors that mean a server or its connection failed.
+
+    Statement errors (syntax, data) would fail on the primary as well, so only these
+    count against a replica when a query fails on it.
+    """
+    from mysql.connector import errors
+
+    return errors.InterfaceError, errors.OperationalError
+
+
+def _acquire_replica(replicas: ReplicaSet) -> tuple[str, PooledConnection]:
+    """Get (replica name, connection) from the first healthy replica that provides one."""
+    for name in replicas.select(lambda replica: _replica_pools[replica].in_use_count):
+        try:
+            conn = _replica_pools[name].acquire()
+        except PoolTimeoutError:
+            continue
+        except DatabaseConnectionError as err:
+            replicas.record_failure(name, err)
+            continue
+        replicas.record_checkout(name)
+        return name, conn
+    raise NoHealthyReplicaError("No healthy MySQL replica available")
+
+
+def get_mysql_replica_connection(replicas: ReplicaSet) -> PooledConnection:
+    """
+    Get a connection from a healthy replica.
+
+    Replicas are tried in the order chosen by the replica set; a replica whose
+    connection cannot be opened is reported (and eventually ejected), a replica whose
+    pool is exhausted is skipped.
+
+    Raises:
+        NoHealthyReplicaError: If no replica could provide a connection.
+    """
+    return _acquire_replica(replicas)[1]
+
+
+def _acquire_read() -> tuple[Optional[str], PooledConnection]:
+    """Get (replica name or None for the primary, connection) for a read, see `get_mysql_connection`."""
+    replicas = get_mysql_replica_set()
+    if replicas is not None:
+        try:
+            return _acquire_replica(replicas)
+        except NoHealthyReplicaError:
+            if not mysql_replica_fallback_to_primary:
+                raise
+    return None, get_mysql_pool().acquire()
+
+
+def get_mysql_connection(intent: str = READ):
     """
     Get a MySQL connection from the global connection pool.
 
+    Routing: `READ` connections (every `films_mysql_repo` query) come from a healthy
+    read replica when replicas are configured, falling back to the primary if none is
+    available (`mysql_replica_fallback_to_primary`); `WRITE` connections always come
+    from the primary. Prefer `run_mysql_read` for reads: it also handles a replica that
+    fails while the query runs.
+
+    Waits for a free connection if the pool is exhausted. Call `close()` on the
+    connection to return it to the pool.
+
+    Args:
+        intent: `READ` or `WRITE`.
+
     Returns:
-        MySQLConnection: A connection instance from the pool.
+        PooledConnection: A connection instance from the pool.
+
+    Raises:
+        DatabaseConnectionError: If a connection cannot be obtained from the pool
+            (`PoolTimeoutError` if none became free within the acquire timeout).
+    """
+    if intent == READ:
+        return _acquire_read()[1]
+    return get_mysql_pool().acquire()
+    # return create_mysql_connection()
+
+
+def run_mysql_read(query: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a read on a `READ` connection (see `get_mysql_connection`) and return its result.
+
+    If the query fails on a replica with a connection-level error (`replica_failure_errors`),
+    the failure is reported to the replica set, so it counts towards ejection like a
+    failed connection attempt, and the query is retried once on the primary (unless
+    `mysql_replica_fallback_to_primary` is off).
+
+    Args:
+        query: Function called as `query(conn, *args, **kwargs)`, e.g. a `films_mysql_repo` function.
+
+    Returns:
+        Result of `query`.
 
     Raises:
         DatabaseConnectionError: If a connection cannot be obtained from the pool.
     """
+    replica, conn = _acquire_read()
     try:
-        pool = get_mysql_pool()
-        return pool.get_connection()
-    except mysql.connector.Error as err:
-        raise DatabaseConnectionError("Failed to get MySQL connection from pool") from err
-    # return create_mysql_connection()
+        result = query(conn, *args, **kwargs)
+    except Exception as err:
+        if replica is None or not isinstance(err, replica_failure_errors()):
+            raise
+        _replicas.record_failure(replica, err)
+        if not mysql_replica_fallback_to_primary:
+            raise
+    else:
+        if replica is not None:
+            _replicas.record_success(replica)
+        return result
+    finally:
+        conn.close()
+
+    conn = get_mysql_pool().acquire()
+    try:
+        return query(conn, *args, **kwargs)
+    finally:
+        conn.close()
+
+
+@contextmanager
+def mysql_read_connection() -> Iterator[PooledConnection]:
+    """
+    Get a `READ` connection for a read that cannot be retried (a row stream) and return it to the pool on exit.
+
+    A connection-level failure on a replica is still reported to the replica set.
+    """
+    replica, conn = _acquire_read()
+    try:
+        yield conn
+    except Exception as err:
+        if replica is not None and isinstance(err, replica_failure_errors()):
+            _replicas.record_failure(replica, err)
+        raise
+    else:
+        if replica is not None:
+            _replicas.record_success(replica)
+    finally:
+        conn.close()
+
+
+def get_mysql_pool_stats() -> dict:
+    """
+    Get live statistics of the global MySQL connection pool.
+
+    Returns:
+        dict: See `MySQLPool.stats`.
+    """
+    return get_mysql_pool().stats()
+
+
+@registry.register_collector
+def collect_mysql_pool_stats() -> list[Sample]:
+    """Export the MySQL pool statistics (if the pool was created)."""
+    if _pool is None:
+        return []
+    stats = _pool.stats()
+    return [
+        Sample("mysql_pool_connections", "gauge", "MySQL pool connections by state", {"state": "in_use"},
+               stats["in_use"]),
+        Sample("mysql_pool_connections", "gauge", "MySQL pool connections by state", {"state": "idle"},
+               stats["idle"]),
+        Sample("mysql_pool_waiters", "gauge", "Threads waiting for a MySQL connection", {}, stats["waiters"]),
+        Sample("mysql_pool_checkouts_total", "counter", "MySQL connection checkouts", {}, stats["checkouts"]),
+        Sample("mysql_pool_timeouts_total", "counter", "MySQL connection acquire timeouts", {}, stats["timeouts"]),
+        Sample("mysql_pool_leaked", "gauge", "MySQL connections held longer than the leak threshold", {},
+               stats["leaked"]),
+        Sample("mysql_pool_acquire_seconds", "histogram", "MySQL connection acquire latency", {},
+               stats["acquire_latency"]),
+    ]
+
+
+def get_mysql_replica_stats() -> dict:
+    """
+    Get the health state and pool statistics of every read replica.
+
+    Returns:
+        dict: Per replica name: `ReplicaSet.stats` plus `pool` (see `MySQLPool.stats`);
+            empty if no replicas are configured.
+    """
+    if _replicas is None:
+        return {}
+    stats = _replicas.stats()
+    for name, replica_stats in stats.items():
+        replica_stats["pool"] = _replica_pools[name].stats()
+    return stats
+
+
+@registry.register_collector
+def collect_mysql_replica_stats() -> list[Sample]:
+    """Export the read replica health and pool usage (if replicas are configured)."""
+    if _replicas is None:
+        return []
+    samples = []
+    for name, stats in _replicas.stats().items():
+        labels = {"replica": name}
+        samples += [
+            Sample("mysql_replica_healthy", "gauge", "Read replica is in rotation (1) or ejected (0)", labels,
+                   int(stats["healthy"])),
+            Sample("mysql_replica_in_use", "gauge", "Read replica connections in use", labels,
+                   _replica_pools[name].in_use_count),
+            Sample("mysql_replica_checkouts_total", "counter", "Read replica connection checkouts", labels,
+                   stats["checkouts"]),
+            Sample("mysql_replica_ejections_total", "counter", "Read replica ejections", labels,
+                   stats["ejections"]),
+        ]
+    return samples
+
+
+def server_supports_window_functions(conn) -> bool:
+    """
+    Check whether the MySQL server supports window functions (MySQL 8.0+).
+
+    Args:
+        conn: Active MySQL connection.
+
+    Returns:
+        bool: True if window functions such as `COUNT(*) OVER ()` can be used.
+    """
+    version = conn.get_server_version() or (0,)
+    return tuple(version) >= (8, 0)
 
 
 if __name__ == '__main__':
@@ -1,14 +1,30 @@
-from pymongo import MongoClient
-from pymongo.errors import PyMongoError
+from typing import TYPE_CHECKING
 
 from app.core.db.local_settings import MONGODB_URL_WRITE
 
 from app.core.exceptions import MongoConnectionError
 
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+MONGODB_DB_NAME = "ich_edit"
+
 _client = None
 
 
-def get_mongo_client() -> MongoClient:
+def pymongo_error() -> type[Exception]:
+    """
+    Get `pymongo.errors.PyMongoError`.
+
+    pymongo is imported on first use (an `except` clause evaluates it only when an
+    exception is raised), so importing the services does not load the driver.
+    """
+    from pymongo.errors import PyMongoError
+
+    return PyMongoError
+
+
+def get_mongo_client() -> "MongoClient":
     """
     Get (or create) a global MongoDB client.
 
@@ -23,9 +39,11 @@ def get_mongo_client() -> MongoClient:
     """
     global _client
     if _client is None:
+        from pymongo import MongoClient
+
         try:
             _client = MongoClient(MONGODB_URL_WRITE)
-        except PyMongoError as err:
+        except pymongo_error() as err:
             raise MongoConnectionError("Failed to create MongoDB client") from err
     return _client
 
@@ -43,9 +61,8 @@ def get_mongo_db():
     try:
         db = get_mongo_client()
         client = get_mongo_client()
-        db_name = "ich_edit"
-        return client[db_name]
-    except PyMongoError  as err:
+        return client[MONGODB_DB_NAME]
+    except pymongo_error() as err:
         raise MongoConnectionError("Failed to get MongoDB database") from err
 
 
@@ -0,0 +1,347 @@
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from typing import Any, Callable, Optional
+
+from app.core.exceptions import DatabaseConnectionError, PoolTimeoutError
+from app.core.metrics import LatencyHistogram, RateCounter
+
+# Hand-off marker: the waiter may open a new connection instead of receiving an idle one.
+_SLOT = object()
+
+
+def mysql_error() -> type[Exception]:
+    """
+    Get the base mysql-connector error class.
+
+    The driver is imported on first use (an `except` clause evaluates it only when an
+    exception is raised), so importing the pool does not load mysql-connector.
+    """
+    import mysql.connector
+
+    return mysql.connector.Error
+
+
+def close_without_reading(conn) -> None:
+    """
+    Close a connection that still has an unread result, without reading the rest of it.
+
+    `close()` would send QUIT, and the driver first drains the pending rows. Instead the
+    socket is shut down. A `PooledConnection` is removed from its pool, which opens a
+    new connection for the slot on demand.
+    """
+    if isinstance(conn, PooledConnection):
+        conn.discard()
+        return
+    try:
+        conn.shutdown()
+        conn.unread_result = False  # cursors closed afterwards must not try to read the rows
+        conn.close()
+    except mysql_error():
+        pass
+
+
+class PooledConnection:
+    """
+    Connection checked out of a `MySQLPool`.
+
+    Proxies all attributes to the underlying MySQL connection; `close()` returns it
+    to the pool (the same contract as mysql-connector's pooled connections).
+    """
+
+    def __init__(self, pool: "MySQLPool", conn, trace: Optional[list[str]] = None):
+        self._pool = pool
+        self._conn = conn
+        self.acquired_at = time.monotonic()
+        self.thread_name = threading.current_thread().name
+        self.trace = trace
+
+    def __getattr__(self, name: str) -> Any:
+        conn = self.__dict__.get("_conn")
+        if conn is None:
+            raise AttributeError(f"Connection was returned to the pool ({name})")
+        return getattr(conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self) -> None:
+        """Return the connection to the pool."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool._release(self, conn)
+
+    def discard(self) -> None:
+        """Close the underlying connection (see `close_without_reading`) instead of returning it to the pool."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            self._pool._drop(self, conn)
+
+    def __del__(self):
+        conn = self.__dict__.get("_conn")
+        if conn is not None:
+            # The cyclic GC may run this on any thread, even one holding the pool lock:
+            # no locking or I/O here, the pool reclaims the connection on its next acquire/release.
+            self._conn = None
+            self._pool._reclaimed.append(conn)
+
+
+class _Waiter:
+    __slots__ = ("event", "conn")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+
+
+class MySQLPool:
+    """
+    Thread-safe MySQL connection pool with blocking, fair (FIFO) acquisition.
+
+    Up to `pool_size` connections are kept open; under load up to `max_overflow`
+    extra connections are opened and closed again when they are returned. When all
+    connections are in use, `acquire` waits (first come, first served) for up to
+    `acquire_timeout` seconds instead of failing immediately.
+    """
+
+    def __init__(self, connect: Callable[[], Any], pool_size: int = 20, max_overflow: int = 10,
+                 acquire_timeout: Optional[float] = 5.0, leak_seconds: Optional[float] = 60.0,
+                 trace_checkouts: bool = False):
+        """
+        Args:
+            connect: Function that opens a new MySQL connection.
+            pool_size: Number of connections kept open.
+            max_overflow: Number of extra connections allowed under load.
+            acquire_timeout: Default maximum time (seconds) to wait for a connection.
+                None waits forever.
+            leak_seconds: A connection checked out for longer than this is reported by
+                `leaked_connections`. None disables the check.
+            trace_checkouts: Store the call stack of every checkout (for leak reports).
+        """
+        self.connect = connect
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.acquire_timeout = acquire_timeout
+        self.leak_seconds = leak_seconds
+        self.trace_checkouts = trace_checkouts
+
+        self._lock = threading.Lock()
+        self._idle: deque = deque()
+        self._waiters: deque[_Waiter] = deque()
+        # weak, so a connection dropped without close() is garbage collected and queued by __del__
+        self._in_use: weakref.WeakSet[PooledConnection] = weakref.WeakSet()
+        self._reclaimed: deque = deque()  # appended without the lock (deque appends are thread-safe)
+        self._opened = 0
+        self._closed = False
+
+        self.acquire_latency = LatencyHistogram()
+        self._checkout_rate = RateCounter()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.collected_unreturned = 0
+
+    @property
+    def max_connections(self) -> int:
+        return self.pool_size + self.max_overflow
+
+    @property
+    def in_use_count(self) -> int:
+        """Number of connections currently checked out."""
+        return len(self._in_use)
+
+    def acquire(self, timeout: Optional[float] = -1) -> PooledConnection:
+        """
+        Check out a connection, waiting for a free one if the pool is exhausted.
+
+        Args:
+            timeout: Maximum time (seconds) to wait; -1 uses `acquire_timeout`, None waits forever.
+
+        Returns:
+            PooledConnection: Connection; call `close()` to return it to the pool.
+
+        Raises:
+            PoolTimeoutError: If no connection became free in time.
+            DatabaseConnectionError: If a new connection cannot be opened.
+        """
+        if timeout == -1:
+            timeout = self.acquire_timeout
+        started = time.monotonic()
+        self._reclaim()
+
+        with self._lock:
+            if self._closed:
+                raise DatabaseConnectionError("MySQL connection pool is closed")
+            if not self._waiters and self._idle:
+                conn = self._idle.popleft()
+            elif not self._waiters and self._opened < self.max_connections:
+                self._opened += 1
+                conn = _SLOT
+            else:
+                waiter = _Waiter()
+                self._waiters.append(waiter)
+                conn = None
+
+        if conn is None:
+            conn = self._wait(waiter, timeout)
+
+        conn = self._prepare(conn)
+        return self._check_out(conn, time.monotonic() - started)
+
+    def _wait(self, waiter: _Waiter, timeout: Optional[float]):
+        waiter.event.wait(timeout)
+        with self._lock:
+            if waiter.conn is None:
+                self._waiters.remove(waiter)
+                self.timeouts += 1
+                raise PoolTimeoutError(
+                    f"Timed out after {timeout}s waiting for a MySQL connection "
+                    f"({len(self._in_use)} in use, {len(self._waiters)} waiting)"
+                )
+            return waiter.conn
+
+    def _prepare(self, conn):
+        """Open a connection for a free slot or make sure an idle one is still alive."""
+        if conn is not _SLOT:
+            try:
+                if conn.is_connected():
+                    return conn
+            except mysql_error():
+                pass
+            self._discard(conn)
+
+        try:
+            return self.connect()
+        except Exception:
+            self._free_slot()
+            raise
+
+    def _check_out(self, conn, waited: float) -> PooledConnection:
+        trace = traceback.format_stack(limit=12)[:-3] if self.trace_checkouts else None
+        pooled = PooledConnection(self, conn, trace)
+        with self._lock:
+            self._in_use.add(pooled)
+            self.checkouts += 1
+        self.acquire_latency.observe(waited)
+        self._checkout_rate.add()
+        return pooled
+
+    def _release(self, pooled: PooledConnection, conn) -> None:
+        with self._lock:
+            self._in_use.discard(pooled)
+        self._return(conn)
+        self._reclaim()
+
+    def _drop(self, pooled: PooledConnection, conn) -> None:
+        with self._lock:
+            self._in_use.discard(pooled)
+        close_without_reading(conn)
+        self._free_slot()
+
+    def _reclaim(self) -> None:
+        """Return the connections queued by `PooledConnection.__del__` (garbage collected without `close()`)."""
+        while self._reclaimed:
+            try:
+                conn = self._reclaimed.popleft()
+            except IndexError:  # taken by another thread
+                return
+            with self._lock:
+                self.collected_unreturned += 1
+            self._return(conn)
+
+    def _return(self, conn) -> None:
+        """Reset a returned connection and hand it to a waiter or keep it idle."""
+        try:
+            # same as mysql-connector's pool: end the transaction and clear session state
+            conn.reset_session()
+        except mysql_error():
+            self._discard(conn)
+            self._free_slot()
+            return
+
+        with self._lock:
+            if self._waiters:
+                waiter = self._waiters.popleft()
+                waiter.conn = conn
+                waiter.event.set()
+                return
+            if not self._closed and self._opened <= self.pool_size:
+                self._idle.append(conn)
+                return
+            # overflow connection (or pool closed)
+            self._opened -= 1
+        self._discard(conn)
+
+    def _free_slot(self) -> None:
+        """Give a closed connection's slot to the next waiter, or release it."""
+        with self._lock:
+            if self._waiters and not self._closed:
+                waiter = self._waiters.popleft()
+                waiter.conn = _SLOT
+                waiter.event.set()
+            else:
+                self._opened -= 1
+
+    @staticmethod
+    def _discard(conn) -> None:
+        try:
+            conn.close()
+        except mysql_error():
+            pass
+
+    def leaked_connections(self) -> list[dict]:
+        """
+        Get connections checked out for longer than `leak_seconds`.
+
+        Returns:
+            list[dict]: thread, held_seconds and trace (call stack or None) per connection.
+        """
+        if self.leak_seconds is None:
+            return []
+        now = time.monotonic()
+        with self._lock:
+            in_use = list(self._in_use)
+        return [
+            {"thread": c.thread_name, "held_seconds": now - c.acquired_at, "trace": c.trace}
+            for c in in_use if now - c.acquired_at > self.leak_seconds
+        ]
+
+    def stats(self) -> dict:
+        """
+        Get live pool statistics.
+
+        Returns:
+            dict: pool_size, max_overflow, opened, in_use, idle, waiters, checkouts,
+                checkouts_per_second (last minute), timeouts, leaked (checked out longer
+                than `leak_seconds`), collected_unreturned (garbage collected without
+                `close()`) and acquire_latency (histogram snapshot, seconds).
+        """
+        with self._lock:
+            stats = {
+                "pool_size": self.pool_size,
+                "max_overflow": self.max_overflow,
+                "opened": self._opened,
+                "in_use": len(self._in_use),
+                "idle": len(self._idle),
+                "waiters": len(self._waiters),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "collected_unreturned": self.collected_unreturned,
+            }
+        stats["checkouts_per_second"] = self._checkout_rate.rate()
+        stats["leaked"] = len(self.leaked_connections())
+        stats["acquire_latency"] = self.acquire_latency.snapshot()
+        return stats
+
+    def close(self) -> None:
+        """Close idle connections; connections in use are closed when they are returned."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = list(self._idle), deque()
+            self._opened -= len(idle)
+        for conn in idle:
+            self._discard(conn)
@@ -0,0 +1,179 @@
+import itertools
+import threading
+from typing import Callable, Optional
+
+from app.core.exceptions import DatabaseConnectionError
+
+ROUND_ROBIN = "round_robin"
+LEAST_OUTSTANDING = "least_outstanding"
+
+
+class NoHealthyReplicaError(DatabaseConnectionError):
+    """Raised when a read has to go to a replica but every replica is ejected or unreachable."""
+    pass
+
+
+class _Replica:
+    __slots__ = ("name", "healthy", "failures", "successes", "ejections", "readmissions", "checkouts",
+                 "last_error")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.healthy = True
+        self.failures = 0      # consecutive failures (while healthy)
+        self.successes = 0     # consecutive successful health checks (while ejected)
+        self.ejections = 0
+        self.readmissions = 0
+        self.checkouts = 0
+        self.last_error: Optional[str] = None
+
+
+class ReplicaSet:
+    """
+    Health and selection state of the MySQL read replicas.
+
+    The replica set does not own connections: callers (the sync and the async
+    connection modules, each with its own pools) ask `select` for healthy replicas in
+    order of preference and report checkouts, completed reads and failures (of a
+    connection attempt or of a query). A replica that failed `max_failures` times in a
+    row (without a completed read or a passed health check in between) is ejected; the
+    background health check
+    (`check_health`, every `health_check_seconds`) re-admits it after
+    `readmit_successes` successful checks in a row.
+    """
+
+    def __init__(self, names: list[str], check: Callable[[str], None], selection: str = ROUND_ROBIN,
+                 max_failures: int = 3, readmit_successes: int = 2,
+                 health_check_seconds: Optional[float] = 5.0):
+        """
+        Args:
+            names: Replica names.
+            check: Health check of one replica; raises if the replica is unusable.
+            selection: `ROUND_ROBIN` or `LEAST_OUTSTANDING` (fewest connections in use first).
+            max_failures: Consecutive failures that eject a replica.
+            readmit_successes: Consecutive successful health checks that re-admit it.
+            health_check_seconds: Interval of the background health check. None or 0 disables it.
+        """
+        if selection not in (ROUND_ROBIN, LEAST_OUTSTANDING):
+            raise ValueError(f"Unknown replica selection: {selection}")
+        self.check = check
+        self.selection = selection
+        self.max_failures = max_failures
+        self.readmit_successes = readmit_successes
+        self.health_check_seconds = health_check_seconds
+
+        self._replicas = {name: _Replica(name) for name in names}
+        self._names = list(self._replicas)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def names(self) -> list[str]:
+        return list(self._names)
+
+    def select(self, outstanding: Optional[Callable[[str], int]] = None) -> list[str]:
+        """
+        Get the healthy replicas in the order they should be tried.
+
+        Args:
+            outstanding: Connections currently in use per replica (required for
+                `LEAST_OUTSTANDING`; the caller knows its own pools).
+
+        Returns:
+            list[str]: Healthy replica names, preferred first (empty if all are ejected).
+        """
+        start = next(self._next)
+        with self._lock:
+            healthy = [name for name in self._names if self._replicas[name].healthy]
+        if not healthy:
+            return []
+        start %= len(healthy)
+        ordered = healthy[start:] + healthy[:start]
+        if self.selection == LEAST_OUTSTANDING and outstanding is not None:
+            ordered.sort(key=outstanding)  # stable: ties keep the round-robin order
+        return ordered
+
+    def record_checkout(self, name: str) -> None:
+        """Report a connection that was obtained from a replica."""
+        with self._lock:
+            self._replicas[name].checkouts += 1
+
+    def record_success(self, name: str) -> None:
+        """Report a read that completed on a replica; resets its consecutive failures."""
+        with self._lock:
+            replica = self._replicas[name]
+            if replica.healthy:
+                replica.failures = 0
+
+    def record_failure(self, name: str, error: Optional[BaseException] = None) -> None:
+        """Report a failed connection attempt or query; ejects the replica after `max_failures` in a row."""
+        with self._lock:
+            replica = self._replicas[name]
+            replica.last_error = repr(error) if error is not None else None
+            if not replica.healthy:
+                replica.successes = 0
+                return
+            replica.failures += 1
+            if replica.failures >= self.max_failures:
+                replica.healthy = False
+                replica.successes = 0
+                replica.ejections += 1
+
+    def check_health(self) -> None:
+        """Run one health check round over all replicas (ejecting and re-admitting them)."""
+        for name in self._names:
+            try:
+                self.check(name)
+            except Exception as err:  # any failure makes the replica unusable
+                self.record_failure(name, err)
+                continue
+            with self._lock:
+                replica = self._replicas[name]
+                if replica.healthy:
+                    replica.failures = 0
+                    continue
+                replica.successes += 1
+                if replica.successes >= self.readmit_successes:
+                    replica.healthy = True
+                    replica.failures = 0
+                    replica.readmissions += 1
+
+    def start(self) -> None:
+        """Start the background health check thread (once)."""
+        if not self.health_check_seconds or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="mysql-replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background health check thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.health_check_seconds):
+            self.check_health()
+
+    def stats(self) -> dict:
+        """
+        Get the replica states.
+
+        Returns:
+            dict: Per replica name: healthy, failures, ejections, readmissions, checkouts and last_error.
+        """
+        with self._lock:
+            return {
+                name: {
+                    "healthy": r.healthy,
+                    "failures": r.failures,
+                    "ejections": r.ejections,
+                    "readmissions": r.readmissions,
+                    "checkouts": r.checkouts,
+                    "last_error": r.last_error,
+                }
+                for name, r in self._replicas.items()
+            }
@@ -3,6 +3,11 @@ class DatabaseConnectionError(RuntimeError):
     pass
 
 
+class PoolTimeoutError(DatabaseConnectionError):
+    """Raised when no MySQL connection becomes free in the pool within the acquire timeout."""
+    pass
+
+
 class MongoConnectionError(RuntimeError):
     """Raised when the application cannot connect to MongoDB."""
     pass
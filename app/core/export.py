@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+EXPORT_COLUMNS = ("film_id", "title", "release_year", "category_name")
+
+CONTENT_TYPES = {
+    CSV: "text/csv; charset=utf-8",
+    NDJSON: "application/x-ndjson",
+}
+
+
+def csv_chunks(batches: Iterable[list[dict]], columns: tuple[str, ...] = EXPORT_COLUMNS) -> Iterator[str]:
+    """
+    Encode row batches as CSV, one text chunk per batch (the header is the first chunk).
+
+    Args:
+        batches: Iterable of row batches.
+        columns: Columns to write, in order.
+
+    Yields:
+        str: CSV text chunks.
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore", lineterminator="\n")
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+
+def ndjson_chunks(batches: Iterable[list[dict]], columns: tuple[str, ...] = EXPORT_COLUMNS) -> Iterator[str]:
+    """
+    Encode row batches as newline-delimited JSON, one text chunk per batch.
+
+    Args:
+        batches: Iterable of row batches.
+        columns: Columns to write, in order.
+
+    Yields:
+        str: NDJSON text chunks.
+    """
+    for rows in batches:
+        yield "".join(
+            json.dumps({column: row.get(column) for column in columns}, ensure_ascii=False, default=str) + "\n"
+            for row in rows
+        )
+
+
+def encode_export(batches: Iterable[list[dict]], export_format: str) -> Iterator[str]:
+    """
+    Encode row batches in the requested export format.
+
+    Args:
+        batches: Iterable of row batches.
+        export_format: "csv" or "ndjson".
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if export_format == CSV:
+        return csv_chunks(batches)
+    if export_format == NDJSON:
+        return ndjson_chunks(batches)
+    raise ValueError(f"Unknown export format: {export_format}")
@@ -0,0 +1,241 @@
+import bisect
+import functools
+import inspect
+import threading
+import time
+from typing import Any, Callable, Iterable, NamedTuple, Optional
+
+# Upper bounds (seconds) of latency histogram buckets; the last bucket is +Inf.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class LatencyHistogram:
+    """Thread-safe fixed-bucket latency histogram (seconds)."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one observation."""
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += seconds
+            self._count += 1
+
+    def time(self) -> "Timer":
+        """Context manager that observes the duration of its block."""
+        return Timer(self)
+
+    def snapshot(self) -> dict:
+        """
+        Get the histogram state.
+
+        Returns:
+            dict: buckets (list of (upper bound, cumulative count); the last bound is
+                float("inf")), count and sum.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, total_sum = self._count, self._sum
+        cumulative, running = [], 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            running += count
+            cumulative.append((bound, running))
+        return {"buckets": cumulative, "count": total, "sum": total_sum}
+
+
+class RateCounter:
+    """Counts events per second over a sliding window of whole seconds."""
+
+    def __init__(self, window_seconds: int = 60):
+        self.window_seconds = window_seconds
+        # one extra slot for the current (incomplete) second
+        self._slots = [0] * (window_seconds + 1)
+        self._slot_seconds = [-1] * (window_seconds + 1)
+        self._lock = threading.Lock()
+
+    def add(self, count: int = 1, now: Optional[float] = None) -> None:
+        second = int(now if now is not None else time.monotonic())
+        index = second % len(self._slots)
+        with self._lock:
+            if self._slot_seconds[index] != second:
+                self._slot_seconds[index] = second
+                self._slots[index] = 0
+            self._slots[index] += count
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """Average events per second over the window (the current second excluded)."""
+        second = int(now if now is not None else time.monotonic())
+        with self._lock:
+            total = sum(count for count, slot_second in zip(self._slots, self._slot_seconds)
+                        if second - self.window_seconds <= slot_second < second)
+        return total / self.window_seconds
+
+
+class Timer:
+    """Context manager returned by `LatencyHistogram.time`."""
+
+    __slots__ = ("histogram", "started")
+
+    def __init__(self, histogram: LatencyHistogram):
+        self.histogram = histogram
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started)
+
+
+def timed(histogram: LatencyHistogram) -> Callable:
+    """
+    Decorator that observes the duration of every call (sync or async function).
+
+    The histogram is bound once at decoration time, so a call only costs two
+    `perf_counter` reads and one `observe`.
+    """
+    def decorator(fn: Callable) -> Callable:
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    histogram.observe(time.perf_counter() - started)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+class HistogramFamily:
+    """
+    Latency histograms of one metric, one per combination of label values.
+
+    `labels()` takes a lock only the first time a label combination is seen; hot
+    paths should bind the child histogram once and reuse it.
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: tuple[str, ...],
+                 buckets: tuple[float, ...] = DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = label_names
+        self.buckets = buckets
+        self._children: dict[tuple[str, ...], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values: str) -> LatencyHistogram:
+        """Get (or create) the histogram for the given label values."""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, LatencyHistogram(self.buckets))
+        return child
+
+    def samples(self) -> list["Sample"]:
+        return [Sample(self.name, "histogram", self.documentation, dict(zip(self.label_names, values)),
+                       child.snapshot())
+                for values, child in list(self._children.items())]
+
+
+class Sample(NamedTuple):
+    """
+    One exported value.
+
+    `kind` is "gauge", "counter" or "histogram"; for histograms `value` is a
+    `LatencyHistogram.snapshot()` dict.
+    """
+    name: str
+    kind: str
+    documentation: str
+    labels: dict
+    value: Any
+
+
+class MetricsRegistry:
+    """Process-wide set of histogram families and stats collectors, rendered in Prometheus text format."""
+
+    def __init__(self):
+        self._families: dict[str, HistogramFamily] = {}
+        self._collectors: list[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, documentation: str, label_names: tuple[str, ...]) -> HistogramFamily:
+        """Get (or create) a histogram family."""
+        with self._lock:
+            family = self._families.get(name)
+            if family is None:
+                family = self._families[name] = HistogramFamily(name, documentation, label_names)
+            return family
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> Callable[[], Iterable[Sample]]:
+        """
+        Register a function called on every scrape; it returns samples for stats that
+        are kept elsewhere (caches, pools) and nothing if the source was not created.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    def collect(self) -> list[Sample]:
+        samples = []
+        for family in list(self._families.values()):
+            samples.extend(family.samples())
+        for collector in self._collectors:
+            samples.extend(collector())
+        return samples
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines = []
+        described = set()
+        for sample in sorted(self.collect(), key=lambda s: s.name):
+            if sample.name not in described:
+                described.add(sample.name)
+                lines.append(f"# HELP {sample.name} {sample.documentation}")
+                lines.append(f"# TYPE {sample.name} {sample.kind}")
+            if sample.kind == "histogram":
+                for bound, count in sample.value["buckets"]:
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{sample.name}_bucket{_format_labels({**sample.labels, 'le': le})} {count}")
+                lines.append(f"{sample.name}_sum{_format_labels(sample.labels)} {sample.value['sum']}")
+                lines.append(f"{sample.name}_count{_format_labels(sample.labels)} {sample.value['count']}")
+            else:
+                lines.append(f"{sample.name}{_format_labels(sample.labels)} {sample.value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label_value(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in labels.items()) + "}"
+
+
+registry = MetricsRegistry()
+
+# Metric families shared by several modules.
+SERVICE_LATENCY = registry.histogram(
+    "film_search_service_seconds", "FilmSearchService method latency", ("service", "method"))
+SQL_LATENCY = registry.histogram(
+    "mysql_query_seconds", "MySQL repository statement latency", ("statement",))
+MONGO_LATENCY = registry.histogram(
+    "mongo_operation_seconds", "MongoDB operation latency", ("operation",))
@@ -0,0 +1,298 @@
+"""
+Timing hooks for repository queries.
+
+Repository helpers time every MySQL statement and MongoDB operation (execution
+and fetch separately) and pass a `QueryEvent` to the registered hooks. The
+`mysql_query_seconds` / `mongo_operation_seconds` metrics are fed by such a hook,
+so a statement is timed once. The slow-query log is another: with
+`slow_query_log_enabled` statements slower than `slow_query_threshold_ms` are
+written as JSON lines to a rotating local log file.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from logging.handlers import RotatingFileHandler
+from typing import Any, Callable, Optional
+
+from app.core.metrics import MONGO_LATENCY, SQL_LATENCY
+from app.core.user_settings import (
+    slow_query_log_enabled,
+    slow_query_threshold_ms,
+    slow_query_log_path,
+    slow_query_log_max_bytes,
+    slow_query_log_backup_count,
+)
+
+_hooks: list[Callable[["QueryEvent"], None]] = []
+_slow_query_logger: Optional[logging.Logger] = None
+
+
+@dataclass
+class QueryEvent:
+    backend: str          # "mysql" or "mongo"
+    name: str             # repository function / operation name
+    params: Any
+    exec_seconds: float
+    fetch_seconds: float
+    rows: int
+
+    @property
+    def total_seconds(self) -> float:
+        return self.exec_seconds + self.fetch_seconds
+
+
+def add_query_hook(hook: Callable[[QueryEvent], None]) -> None:
+    """Register a function called after every timed query."""
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+
+def remove_query_hook(hook: Callable[[QueryEvent], None]) -> None:
+    """Unregister a query hook (no-op if it is not registered)."""
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+
+def has_query_hooks() -> bool:
+    return bool(_hooks)
+
+
+def emit_query_event(backend: str, name: str, params: Any, exec_seconds: float, fetch_seconds: float,
+                     rows: int) -> None:
+    """
+    Pass a query event to all hooks.
+
+    A failing hook never breaks the query; its error is logged.
+    """
+    event = QueryEvent(backend, name, params, exec_seconds, fetch_seconds, rows)
+    for hook in list(_hooks):
+        try:
+            hook(event)
+        except Exception:
+            logging.getLogger(__name__).exception("Query hook %r failed", hook)
+
+
+class TimedCursor:
+    """Cursor wrapper that accumulates execute/fetch time and the number of fetched rows."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self.params = None
+        self.exec_seconds = 0.0
+        self.fetch_seconds = 0.0
+        self.rows = 0
+        self.executed = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def execute(self, operation, params=None):
+        started = time.perf_counter()
+        try:
+            return self._cursor.execute(operation, params)
+        finally:
+            self.exec_seconds += time.perf_counter() - started
+            self.params = params
+            self.executed = True
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self.fetch_seconds += time.perf_counter() - started
+        self.rows += len(rows)
+        return rows
+
+    def fetchmany(self, size: int):
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(size)
+        self.fetch_seconds += time.perf_counter() - started
+        self.rows += len(rows)
+        return rows
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self.fetch_seconds += time.perf_counter() - started
+        if row is not None:
+            self.rows += 1
+        return row
+
+
+@contextmanager
+def timed_cursor(conn, name: str, dictionary: bool = True):
+    """
+    Open a cursor whose statements are reported to the query hooks when it is closed.
+
+    Without registered hooks the plain cursor is returned.
+
+    Args:
+        conn: Active MySQL connection.
+        name: Statement name used in events (the repository function name).
+        dictionary: Return rows as dicts.
+    """
+    with conn.cursor(dictionary=dictionary) as cursor:
+        if not _hooks:
+            yield cursor
+            return
+        timed = TimedCursor(cursor)
+        try:
+            yield timed
+        finally:
+            if timed.executed:
+                emit_query_event("mysql", name, timed.params, timed.exec_seconds, timed.fetch_seconds, timed.rows)
+
+
+def timed_aggregate(collection, name: str, pipeline: list[dict]) -> list[dict]:
+    """
+    Run a MongoDB aggregation and read all result documents, reporting a query event.
+
+    Args:
+        collection: MongoDB collection.
+        name: Operation name used in events (e.g. "aggregate_top_queries").
+        pipeline: Aggregation pipeline.
+
+    Returns:
+        list[dict]: Result documents.
+    """
+    started = time.perf_counter()
+    cursor = collection.aggregate(pipeline)
+    executed = time.perf_counter()
+    docs = list(cursor)
+    if _hooks:
+        emit_query_event("mongo", name, pipeline, executed - started, time.perf_counter() - executed, len(docs))
+    return docs
+
+
+async def timed_aggregate_async(collection, name: str, pipeline: list[dict]) -> list[dict]:
+    """Async (AsyncMongoClient) version of `timed_aggregate`."""
+    started = time.perf_counter()
+    cursor = await collection.aggregate(pipeline)
+    executed = time.perf_counter()
+    docs = await cursor.to_list()
+    if _hooks:
+        emit_query_event("mongo", name, pipeline, executed - started, time.perf_counter() - executed, len(docs))
+    return docs
+
+
+def timed_find(collection, name: str, query_filter: dict, **kwargs) -> list[dict]:
+    """
+    Run a MongoDB find and read all result documents, reporting a query event.
+
+    Args:
+        collection: MongoDB collection.
+        name: Operation name used in events (e.g. "find_top_queries_rollup").
+        query_filter: Find filter.
+        **kwargs: Other `find` arguments (sort, limit...).
+
+    Returns:
+        list[dict]: Result documents.
+    """
+    started = time.perf_counter()
+    cursor = collection.find(query_filter, **kwargs)
+    executed = time.perf_counter()
+    docs = list(cursor)
+    if _hooks:
+        emit_query_event("mongo", name, {"filter": query_filter, **kwargs}, executed - started,
+                         time.perf_counter() - executed, len(docs))
+    return docs
+
+
+async def timed_find_async(collection, name: str, query_filter: dict, **kwargs) -> list[dict]:
+    """Async (AsyncMongoClient) version of `timed_find`."""
+    started = time.perf_counter()
+    cursor = collection.find(query_filter, **kwargs)
+    executed = time.perf_counter()
+    docs = await cursor.to_list()
+    if _hooks:
+        emit_query_event("mongo", name, {"filter": query_filter, **kwargs}, executed - started,
+                         time.perf_counter() - executed, len(docs))
+    return docs
+
+
+def _write_event_params(argument: Any) -> tuple[Any, int]:
+    """Event params and row count of a write: a batch is reported by its size, not its documents."""
+    if isinstance(argument, list):
+        return {"count": len(argument)}, len(argument)
+    return argument, 1
+
+
+def timed_write(collection, name: str, method: str, argument: Any, **kwargs) -> Any:
+    """
+    Run a MongoDB write (insert_one, update_one, insert_many, bulk_write), reporting a query event.
+
+    Args:
+        collection: MongoDB collection.
+        name: Operation name used in events (e.g. "bulk_write_rollup").
+        method: Collection method to call.
+        argument: First argument of the method (document, filter, documents or requests).
+        **kwargs: Other method arguments.
+
+    Returns:
+        Any: Result of the write.
+    """
+    started = time.perf_counter()
+    result = getattr(collection, method)(argument, **kwargs)
+    if _hooks:
+        params, rows = _write_event_params(argument)
+        emit_query_event("mongo", name, params, time.perf_counter() - started, 0.0, rows)
+    return result
+
+
+async def timed_write_async(collection, name: str, method: str, argument: Any, **kwargs) -> Any:
+    """Async (AsyncMongoClient) version of `timed_write`."""
+    started = time.perf_counter()
+    result = await getattr(collection, method)(argument, **kwargs)
+    if _hooks:
+        params, rows = _write_event_params(argument)
+        emit_query_event("mongo", name, params, time.perf_counter() - started, 0.0, rows)
+    return result
+
+
+def _get_slow_query_logger() -> logging.Logger:
+    global _slow_query_logger
+    if _slow_query_logger is None:
+        directory = os.path.dirname(slow_query_log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingFileHandler(slow_query_log_path, maxBytes=slow_query_log_max_bytes,
+                                      backupCount=slow_query_log_backup_count, encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger = logging.getLogger("app.slow_queries")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.addHandler(handler)
+        _slow_query_logger = logger
+    return _slow_query_logger
+
+
+def slow_query_hook(event: QueryEvent) -> None:
+    """Write queries slower than `slow_query_threshold_ms` to the slow-query log."""
+    if event.total_seconds * 1000 < slow_query_threshold_ms:
+        return
+    entry = {
+        "timestamp": datetime.now().isoformat(),
+        **asdict(event),
+        "total_ms": round(event.total_seconds * 1000, 3),
+    }
+    entry["exec_seconds"] = round(event.exec_seconds, 6)
+    entry["fetch_seconds"] = round(event.fetch_seconds, 6)
+    _get_slow_query_logger().info(json.dumps(entry, ensure_ascii=False, default=str))
+
+
+_LATENCY_BY_BACKEND = {"mysql": SQL_LATENCY, "mongo": MONGO_LATENCY}
+
+
+def latency_metrics_hook(event: QueryEvent) -> None:
+    """Observe the query time in the latency histogram of its backend, labelled by the query name."""
+    family = _LATENCY_BY_BACKEND.get(event.backend)
+    if family is not None:
+        family.labels(event.name).observe(event.total_seconds)
+
+
+add_query_hook(latency_metrics_hook)
+if slow_query_log_enabled:
+    add_query_hook(slow_query_hook)
@@ -0,0 +1,297 @@
+import atexit
+import logging
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Optional
+
+from app.core.db.mongo_connection import get_mongo_db, pymongo_error
+from app.core.exceptions import MongoConnectionError
+from app.core.metrics import Sample, registry
+from app.core.query_hooks import timed_write
+from app.core.repositories import query_logs_mongo_repo as repo_mogo
+from app.core.user_settings import (
+    query_log_queue_size,
+    query_log_batch_size,
+    query_log_flush_seconds,
+    query_log_full_policy,
+    query_log_block_timeout_seconds,
+    query_rollup_enabled,
+)
+
+if TYPE_CHECKING:
+    from pymongo import UpdateOne
+
+DROP_OLDEST = "drop_oldest"
+BLOCK = "block"
+
+_writer = None
+
+
+def build_rollup_requests(records: list[dict]) -> list["UpdateOne"]:
+    """
+    Build query rollup upserts for a batch of log records.
+
+    Records of the same query are merged into one upsert.
+    """
+    latest: dict[tuple, tuple[dict, int]] = {}
+    for rec in records:
+        key = tuple(repo_mogo.build_query_key(rec["search_type"], rec["params"]).items())
+        _, count = latest.get(key, (rec, 0))
+        latest[key] = (rec, count + 1)
+
+    from pymongo import UpdateOne
+
+    requests = []
+    for rec, count in latest.values():
+        query_filter, update = repo_mogo.build_rollup_update(rec["search_type"], rec["params"],
+                                                             rec["timestamp"], count)
+        requests.append(UpdateOne(query_filter, update, upsert=True))
+    return requests
+
+
+def insert_query_logs(records: list[dict]) -> None:
+    """
+    Write a batch of search query log records to MongoDB.
+
+    With `query_rollup_enabled` the query rollup counters are updated as well.
+
+    Args:
+        records: Log records built by `log_search_query`.
+    """
+    db = get_mongo_db()
+    collection = db.get_collection(repo_mogo.QUERY_LOGS_COLLECTION_NAME)
+    timed_write(collection, "insert_many_logs", "insert_many", records, ordered=False)
+
+    if query_rollup_enabled:
+        rollup = db.get_collection(repo_mogo.QUERY_ROLLUP_COLLECTION_NAME)
+        requests = build_rollup_requests(records)
+        timed_write(rollup, "bulk_write_rollup", "bulk_write", requests, ordered=False)
+
+
+class QueryLogWriter:
+    """
+    Background writer for search query logs.
+
+    Records are put into a bounded in-process queue and written by a daemon thread
+    in `insert_many` batches. A batch is written when it reaches `batch_size`
+    records or when the oldest waiting record is `flush_interval` seconds old.
+    When the queue is full, the oldest record is dropped ("drop_oldest") or the
+    caller waits for free space ("block").
+    """
+
+    def __init__(self, write_batch: Callable[[list[dict]], None] = insert_query_logs,
+                 max_queue_size: int = 10000, batch_size: int = 100, flush_interval: float = 1.0,
+                 full_policy: str = DROP_OLDEST, block_timeout: Optional[float] = None):
+        """
+        Args:
+            write_batch: Function that writes a list of records.
+            max_queue_size: Maximum number of records waiting in the queue.
+            batch_size: Maximum number of records per write.
+            flush_interval: Maximum time (seconds) a record waits before it is written.
+            full_policy: "drop_oldest" or "block".
+            block_timeout: With "block": maximum time (seconds) to wait for free space,
+                after which the new record is dropped. None waits forever.
+        """
+        if full_policy not in (DROP_OLDEST, BLOCK):
+            raise ValueError(f"Unknown query log full policy: {full_policy}")
+        self.write_batch = write_batch
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.full_policy = full_policy
+        self.block_timeout = block_timeout
+
+        self._queue: deque[dict] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._in_flight = 0
+        self._flush_requests = 0
+        self._closed = False
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+
+    def submit(self, record: dict) -> bool:
+        """
+        Put a record into the queue.
+
+        Args:
+            record: Log record.
+
+        Returns:
+            bool: False if the record was dropped (writer closed or queue full with "block" timeout).
+        """
+        with self._cond:
+            if self._closed:
+                self.dropped += 1
+                return False
+            self._ensure_started()
+
+            if len(self._queue) >= self.max_queue_size:
+                if self.full_policy == DROP_OLDEST:
+                    self._queue.popleft()
+                    self.dropped += 1
+                else:
+                    has_space = self._cond.wait_for(
+                        lambda: len(self._queue) < self.max_queue_size or self._closed, self.block_timeout
+                    )
+                    if not has_space or self._closed:
+                        self.dropped += 1
+                        return False
+
+            self._queue.append(record)
+            if len(self._queue) == 1 or len(self._queue) >= self.batch_size:
+                self._cond.notify_all()
+            return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write all queued records now and wait until they are written.
+
+        Args:
+            timeout: Maximum time (seconds) to wait. None waits until done.
+
+        Returns:
+            bool: True if the queue was fully drained.
+        """
+        with self._cond:
+            if self._thread is None:
+                return not self._queue
+            self._flush_requests += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+            finally:
+                self._flush_requests -= 1
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """
+        Flush queued records and stop the worker thread.
+
+        Records submitted after `close` are dropped.
+
+        Args:
+            timeout: Maximum time (seconds) to wait for the queue to drain.
+        """
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    def stats(self) -> dict:
+        """
+        Get writer statistics.
+
+        Returns:
+            dict: queue_depth, in_flight, dropped, written, failed and batches.
+        """
+        with self._cond:
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": self._in_flight,
+                "dropped": self.dropped,
+                "written": self.written,
+                "failed": self.failed,
+                "batches": self.batches,
+            }
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="query-log-writer", daemon=True)
+            self._thread.start()
+            atexit.register(self.close)
+
+    def _next_batch(self) -> Optional[list[dict]]:
+        """Wait for the next batch; return None when the writer is closed and drained."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._queue or self._closed)
+            if not self._queue:
+                return None
+
+            deadline = time.monotonic() + self.flush_interval
+            while len(self._queue) < self.batch_size and not self._closed and not self._flush_requests:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+            self._in_flight = len(batch)
+            self._cond.notify_all()
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            try:
+                self.write_batch(batch)
+                written, failed = len(batch), 0
+            except (pymongo_error(), MongoConnectionError):
+                written, failed = 0, len(batch)
+            except Exception:  # any other error must not kill the worker thread
+                logging.getLogger(__name__).exception("Query log batch of %d records failed", len(batch))
+                written, failed = 0, len(batch)
+            with self._cond:
+                self.written += written
+                self.failed += failed
+                self.batches += 1
+                self._in_flight = 0
+                self._cond.notify_all()
+
+
+@registry.register_collector
+def collect_query_log_writer_stats() -> list[Sample]:
+    """Export the background writer statistics (if the writer was created)."""
+    if _writer is None:
+        return []
+    stats = _writer.stats()
+    return [
+        Sample("query_log_writer_queue_depth", "gauge", "Query log records waiting in the queue", {},
+               stats["queue_depth"]),
+        Sample("query_log_writer_dropped_total", "counter", "Query log records dropped", {}, stats["dropped"]),
+        Sample("query_log_writer_written_total", "counter", "Query log records written", {}, stats["written"]),
+        Sample("query_log_writer_failed_total", "counter", "Query log records that failed to write", {},
+               stats["failed"]),
+    ]
+
+
+def get_query_log_writer() -> QueryLogWriter:
+    """
+    Get (or create) the global background query log writer.
+
+    The worker thread is started on the first submitted record.
+
+    Returns:
+        QueryLogWriter: Query log writer instance.
+    """
+    global _writer
+    if _writer is None:
+        _writer = QueryLogWriter(
+            max_queue_size=query_log_queue_size,
+            batch_size=query_log_batch_size,
+            flush_interval=query_log_flush_seconds,
+            full_policy=query_log_full_policy,
+            block_timeout=query_log_block_timeout_seconds,
+        )
+    return _writer
+
+
+def close_query_log_writer(timeout: Optional[float] = 5.0) -> None:
+    """
+    Flush and stop the global query log writer if it was created.
+
+    A new writer is created on the next `get_query_log_writer` call.
+    """
+    global _writer
+    if _writer is not None:
+        _writer.close(timeout)
+        _writer = None
@@ -1,11 +1,62 @@
+import importlib
+import threading
 from collections.abc import Callable
-from typing import Any
-
-from app.core.services import FilmSearchService, QueryLogService
+from typing import Any, Optional
 
 
 ACTION_REGISTRY: dict[str, dict[str, Any]] = {}
 
+_services: dict[str, Any] = {}
+_services_lock = threading.Lock()
+
+
+def _get_service(target: str) -> Any:
+    """
+    Get (or create) the shared service instance for a "module:Class" target.
+
+    The module is imported on first use; every action of the same class shares one instance.
+    """
+    service = _services.get(target)
+    if service is None:
+        with _services_lock:
+            service = _services.get(target)
+            if service is None:
+                module_name, class_name = target.split(":")
+                service = getattr(importlib.import_module(module_name), class_name)()
+                _services[target] = service
+    return service
+
+
+class LazyHandler:
+    """
+    Action handler that resolves a service method on its first call.
+
+    Registering actions does not import the service layer (and its database drivers);
+    the service class is imported and instantiated when an action is first run.
+    """
+
+    def __init__(self, target: str, method: str):
+        """
+        Args:
+            target: Service class as "module:Class", e.g. "app.core.services:FilmSearchService".
+            method: Name of the service method that handles the action.
+        """
+        self.target = target
+        self.method = method
+        self._handler: Optional[Callable[..., Any]] = None
+
+    def resolve(self) -> Callable[..., Any]:
+        """Import the service (once) and return the bound handler method."""
+        if self._handler is None:
+            self._handler = getattr(_get_service(self.target), self.method)
+        return self._handler
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"LazyHandler({self.target}.{self.method})"
+
 
 def register_action(action_id: str, title: str, handler: Callable[..., Any], parameters: list[str]) -> None:
     """
@@ -14,7 +65,7 @@ def register_action(action_id: str, title: str, handler: Callable[..., Any], par
     Args:
         action_id: Unique action identifier.
         title: Human-readable action title.
-        handler: Callable handler for the action.
+        handler: Callable handler for the action (a `LazyHandler` defers importing its service).
         parameters: List of parameter names required for the action.
     """
     ACTION_REGISTRY[action_id] = {
@@ -25,25 +76,37 @@ def register_action(action_id: str, title: str, handler: Callable[..., Any], par
     }
 
 
+def warmup_actions() -> None:
+    """Resolve every lazy action handler now instead of on first use."""
+    for action in ACTION_REGISTRY.values():
+        handler = action["handler"]
+        if isinstance(handler, LazyHandler):
+            handler.resolve()
+
+
+FILM_SEARCH_SERVICE = "app.core.services:FilmSearchService"
+QUERY_LOG_SERVICE = "app.core.services:QueryLogService"
+
+
 # --- Film search actions ---
 register_action(
     action_id="search_by_keyword",
     title="Search films by keyword",
-    handler=FilmSearchService().search_by_keyword,
+    handler=LazyHandler(FILM_SEARCH_SERVICE, "search_by_keyword"),
     parameters=["keyword"],
 )
 
 register_action(
     action_id="search_by_category",
     title="Search films by category",
-    handler=FilmSearchService().search_by_category,
+    handler=LazyHandler(FILM_SEARCH_SERVICE, "search_by_category"),
     parameters=["dict_category"],
 )
 
 register_action(
     action_id="search_by_category_year",
     title="Search films by category and year range",
-    handler=FilmSearchService().search_by_category_year,
+    handler=LazyHandler(FILM_SEARCH_SERVICE, "search_by_category_year"),
     parameters=["dict_category", "year_from", "year_to"],
 )
 
@@ -52,13 +115,13 @@ register_action(
 register_action(
     action_id="report_last_unique_queries",
     title="Report: last 5 unique queries",
-    handler=QueryLogService().get_last_unique_queries,
+    handler=LazyHandler(QUERY_LOG_SERVICE, "get_last_unique_queries"),
     parameters=[],
 )
 
 register_action(
     action_id="report_top_queries",
     title="Report: top 5 most frequent queries",
-    handler=QueryLogService().get_top_queries,
+    handler=LazyHandler(QUERY_LOG_SERVICE, "get_top_queries"),
     parameters=[],
 )
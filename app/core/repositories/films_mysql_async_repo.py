@@ -0,0 +1,182 @@
+"""
+Async (aiomysql) versions of the `films_mysql_repo` functions.
+
+The SQL is shared with the sync repository; only the cursor calls differ.
+"""
+import time
+from typing import Optional
+
+from app.core.query_hooks import emit_query_event, has_query_hooks
+from app.core.repositories import films_mysql_repo as repo
+
+
+def _dict_cursor() -> type:
+    """Get `aiomysql.DictCursor` (aiomysql is imported with the first query, not with this module)."""
+    import aiomysql
+
+    return aiomysql.DictCursor
+
+
+async def _fetch_all(conn, name: str, sql: str, parameters: Optional[dict] = None) -> list[dict]:
+    async with conn.cursor(_dict_cursor()) as cursor:
+        started = time.perf_counter()
+        await cursor.execute(sql, parameters)
+        executed = time.perf_counter()
+        rows = list(await cursor.fetchall())
+    if has_query_hooks():
+        emit_query_event("mysql", name, parameters, executed - started, time.perf_counter() - executed, len(rows))
+    return rows
+
+
+async def _fetch_one(conn, name: str, sql: str, parameters: Optional[dict] = None) -> Optional[dict]:
+    async with conn.cursor(_dict_cursor()) as cursor:
+        started = time.perf_counter()
+        await cursor.execute(sql, parameters)
+        executed = time.perf_counter()
+        row = await cursor.fetchone()
+    if has_query_hooks():
+        emit_query_event("mysql", name, parameters, executed - started, time.perf_counter() - executed,
+                         int(row is not None))
+    return row
+
+
+async def list_categories(conn) -> list[dict]:
+    """Async version of `films_mysql_repo.list_categories`."""
+    return await _fetch_all(conn, "list_categories", repo.LIST_CATEGORIES_SQL)
+
+
+async def get_category_by_category_name(conn, category_name) -> Optional[dict]:
+    """Async version of `films_mysql_repo.get_category_by_category_name`."""
+    return await _fetch_one(conn, "get_category_by_category_name",
+                            repo.GET_CATEGORIES_BY_NAME_SQL, {"category_name": category_name})
+
+
+async def get_year_range_by_category(conn, category_id) -> Optional[dict]:
+    """Async version of `films_mysql_repo.get_year_range_by_category`."""
+    return await _fetch_one(conn, "get_year_range_by_category",
+                            repo.GET_YEAR_RANGE_BY_CATEGORY_ID_SQL, {"category_id": category_id})
+
+
+async def search_films_by_title_like(conn, keyword: str, limit: int = 10, offset: int = 0) -> list[dict]:
+    """Async version of `films_mysql_repo.search_films_by_title_like`."""
+    parameters = {"keyword": f"%{keyword}%", "limit": limit, "offset": offset}
+    return await _fetch_all(conn, "search_films_by_title_like", repo.SEARCH_FILMS_BY_TITLE_LIKE_SQL, parameters)
+
+
+async def count_films_by_title_like(conn, keyword: str) -> int:
+    """Async version of `films_mysql_repo.count_films_by_title_like`."""
+    row = await _fetch_one(conn, "count_films_by_title_like",
+                           repo.COUNT_FILMS_BY_TITLE_LIKE_SQL, {"keyword": f"%{keyword}%"})
+    return int(row["total"] if row else 0)
+
+
+async def search_films_by_category(conn, category_id, limit: int = 10, offset: int = 0) -> list[dict]:
+    """Async version of `films_mysql_repo.search_films_by_category`."""
+    parameters = {"category_id": category_id, "limit": limit, "offset": offset}
+    return await _fetch_all(conn, "search_films_by_category", repo.SEARCH_FILMS_BY_CATEGORY_SQL, parameters)
+
+
+async def count_films_by_category(conn, category_id) -> int:
+    """Async version of `films_mysql_repo.count_films_by_category`."""
+    row = await _fetch_one(conn, "count_films_by_category",
+                           repo.COUNT_FILMS_BY_CATEGORY_SQL, {"category_id": category_id})
+    return int(row["total"] if row else 0)
+
+
+async def search_films_by_category_in_year_range(conn, category_id, year_from: int, year_to: int,
+                                                 limit: int = 10, offset: int = 0) -> list[dict]:
+    """Async version of `films_mysql_repo.search_films_by_category_in_year_range`."""
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to,
+                  "limit": limit, "offset": offset}
+    return await _fetch_all(conn, "search_films_by_category_in_year_range",
+                            repo.SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_SQL, parameters)
+
+
+async def count_films_by_category_in_year_range(conn, category_id, year_from: int, year_to: int) -> int:
+    """Async version of `films_mysql_repo.count_films_by_category_in_year_range`."""
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to}
+    row = await _fetch_one(conn, "count_films_by_category_in_year_range",
+                           repo.COUNT_FILMS_BY_CATEGORY_IN_YEAR_RANGE_SQL, parameters)
+    return int(row["total"] if row else 0)
+
+
+async def _search_with_total(conn, name: str, sql: str, parameters: dict, count_coro_fn) -> tuple[list[dict], int]:
+    """Async version of `films_mysql_repo._search_with_total`."""
+    items = await _fetch_all(conn, name, sql, parameters)
+    if not items:
+        total = await count_coro_fn() if parameters.get("offset") else 0
+        return items, total
+
+    total = int(items[0]["total"])
+    for item in items:
+        item.pop("total", None)
+    return items, total
+
+
+async def search_films_by_title_like_with_total(conn, keyword: str, limit: int = 10,
+                                                offset: int = 0) -> tuple[list[dict], int]:
+    """Async version of `films_mysql_repo.search_films_by_title_like_with_total`."""
+    parameters = {"keyword": f"%{keyword}%", "limit": limit, "offset": offset}
+    return await _search_with_total(conn, "search_films_by_title_like_with_total",
+                                    repo.SEARCH_FILMS_BY_TITLE_LIKE_WITH_TOTAL_SQL, parameters,
+                                    lambda: count_films_by_title_like(conn, keyword))
+
+
+async def search_films_by_category_with_total(conn, category_id, limit: int = 10,
+                                              offset: int = 0) -> tuple[list[dict], int]:
+    """Async version of `films_mysql_repo.search_films_by_category_with_total`."""
+    parameters = {"category_id": category_id, "limit": limit, "offset": offset}
+    return await _search_with_total(conn, "search_films_by_category_with_total",
+                                    repo.SEARCH_FILMS_BY_CATEGORY_WITH_TOTAL_SQL, parameters,
+                                    lambda: count_films_by_category(conn, category_id))
+
+
+async def search_films_by_category_in_year_range_with_total(conn, category_id, year_from: int, year_to: int,
+                                                            limit: int = 10,
+                                                            offset: int = 0) -> tuple[list[dict], int]:
+    """Async version of `films_mysql_repo.search_films_by_category_in_year_range_with_total`."""
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to,
+                  "limit": limit, "offset": offset}
+    return await _search_with_total(
+        conn, "search_films_by_category_in_year_range_with_total",
+        repo.SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_WITH_TOTAL_SQL, parameters,
+        lambda: count_films_by_category_in_year_range(conn, category_id, year_from, year_to)
+    )
+
+
+async def _search_keyset(conn, name: str, after_sql: str, before_sql: str, parameters: dict,
+                         after: Optional[tuple] = None, before: Optional[tuple] = None,
+                         offset: int = 0) -> list[dict]:
+    """Async version of `films_mysql_repo._search_keyset`."""
+    if before is not None:
+        parameters = {**parameters, "title": before[0], "film_id": before[1]}
+        items = await _fetch_all(conn, name, before_sql, parameters)
+        items.reverse()
+        return items
+
+    title, film_id = after if after is not None else ("", 0)
+    parameters = {**parameters, "title": title, "film_id": film_id, "offset": offset}
+    return await _fetch_all(conn, name, after_sql, parameters)
+
+
+async def search_films_by_category_keyset(conn, category_id, limit: int = 10,
+                                          after: Optional[tuple] = None, before: Optional[tuple] = None,
+                                          offset: int = 0) -> list[dict]:
+    """Async version of `films_mysql_repo.search_films_by_category_keyset`."""
+    parameters = {"category_id": category_id, "limit": limit}
+    return await _search_keyset(conn, "search_films_by_category_keyset", repo.SEARCH_FILMS_BY_CATEGORY_AFTER_SQL,
+                                repo.SEARCH_FILMS_BY_CATEGORY_BEFORE_SQL,
+                                parameters, after, before, offset)
+
+
+async def search_films_by_category_in_year_range_keyset(conn, category_id, year_from: int, year_to: int,
+                                                        limit: int = 10,
+                                                        after: Optional[tuple] = None,
+                                                        before: Optional[tuple] = None,
+                                                        offset: int = 0) -> list[dict]:
+    """Async version of `films_mysql_repo.search_films_by_category_in_year_range_keyset`."""
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to, "limit": limit}
+    return await _search_keyset(conn, "search_films_by_category_in_year_range_keyset",
+                                repo.SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_AFTER_SQL,
+                                repo.SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_BEFORE_SQL,
+                                parameters, after, before, offset)
@@ -1,3 +1,8 @@
+from typing import Optional, Callable, Iterator
+
+from app.core.db.pool import close_without_reading
+from app.core.query_hooks import timed_cursor
+
 LIST_CATEGORIES_SQL = """
 SELECT 
     category_id,
@@ -104,6 +109,231 @@ WHERE
 ;
 """
 
+# Single round-trip variants: the page and the total count come from one query.
+# Category rows are unique per film (film_category PK), so COUNT(*) OVER () equals
+# COUNT(DISTINCT film_id). Keyword rows may repeat a film with several categories,
+# so the distinct count is computed with the two-way DENSE_RANK trick.
+# Window functions require MySQL 8.0+.
+SEARCH_FILMS_BY_TITLE_LIKE_WITH_TOTAL_SQL = """
+SELECT 
+    f.film_id,
+    f.title,
+    f.release_year,
+    c.name AS category_name,
+    DENSE_RANK() OVER (ORDER BY f.film_id) + DENSE_RANK() OVER (ORDER BY f.film_id DESC) - 1 AS total
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE LOWER(f.title) LIKE LOWER(%(keyword)s)
+LIMIT %(limit)s
+OFFSET %(offset)s
+;
+"""
+
+SEARCH_FILMS_BY_CATEGORY_WITH_TOTAL_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name,
+    COUNT(*) OVER () AS total
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s
+LIMIT %(limit)s
+OFFSET %(offset)s
+;
+"""
+
+SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_WITH_TOTAL_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name,
+    COUNT(*) OVER () AS total
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s AND CAST(f.release_year AS UNSIGNED) BETWEEN %(year_from)s AND %(year_to)s
+LIMIT %(limit)s
+OFFSET %(offset)s
+;
+"""
+
+SEARCH_FILMS_BY_CATEGORY_AFTER_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s
+    AND (f.title > %(title)s OR (f.title = %(title)s AND f.film_id > %(film_id)s))
+ORDER BY f.title, f.film_id
+LIMIT %(limit)s
+OFFSET %(offset)s
+;
+"""
+
+SEARCH_FILMS_BY_CATEGORY_BEFORE_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s
+    AND (f.title < %(title)s OR (f.title = %(title)s AND f.film_id < %(film_id)s))
+ORDER BY f.title DESC, f.film_id DESC
+LIMIT %(limit)s
+;
+"""
+
+SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_AFTER_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s AND CAST(f.release_year AS UNSIGNED) BETWEEN %(year_from)s AND %(year_to)s
+    AND (f.title > %(title)s OR (f.title = %(title)s AND f.film_id > %(film_id)s))
+ORDER BY f.title, f.film_id
+LIMIT %(limit)s
+OFFSET %(offset)s
+;
+"""
+
+SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_BEFORE_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s AND CAST(f.release_year AS UNSIGNED) BETWEEN %(year_from)s AND %(year_to)s
+    AND (f.title < %(title)s OR (f.title = %(title)s AND f.film_id < %(film_id)s))
+ORDER BY f.title DESC, f.film_id DESC
+LIMIT %(limit)s
+;
+"""
+
+LIST_FILMS_WITH_CATEGORIES_SQL = """
+SELECT 
+    f.film_id,
+    f.title,
+    f.release_year,
+    c.category_id
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+ORDER BY f.film_id, c.category_id
+;
+"""
+
+LIST_FILM_TITLES_SQL = """
+SELECT 
+    film_id,
+    title
+FROM film
+;
+"""
+
+LIST_YEAR_RANGES_BY_CATEGORY_SQL = """
+SELECT  
+c.category_id,
+MIN(f.release_year) as year_from,
+MAX(f.release_year) as year_to
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+GROUP BY c.category_id
+;
+"""
+
+# Full result sets for export (no LIMIT/OFFSET), read with an unbuffered cursor.
+EXPORT_FILMS_BY_TITLE_LIKE_SQL = """
+SELECT 
+    f.film_id,
+    f.title,
+    f.release_year,
+    c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE LOWER(f.title) LIKE LOWER(%(keyword)s)
+ORDER BY f.film_id, c.category_id
+;
+"""
+
+EXPORT_FILMS_BY_CATEGORY_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s
+ORDER BY f.title, f.film_id
+;
+"""
+
+EXPORT_FILMS_BY_CATEGORY_IN_YEAR_RANGE_SQL = """
+SELECT 
+    f.film_id AS film_id, f.title AS title, f.release_year AS release_year, c.name AS category_name
+FROM
+    film AS f
+        JOIN
+    film_category AS fc ON (f.film_id = fc.film_id)
+        JOIN
+    category AS c ON (fc.category_id = c.category_id)
+WHERE
+    c.category_id = %(category_id)s AND f.release_year BETWEEN %(year_from)s AND %(year_to)s
+ORDER BY f.title, f.film_id
+;
+"""
+
+GET_CATALOG_VERSION_SQL = """
+SELECT GREATEST(
+    (SELECT COALESCE(MAX(last_update), 0) FROM film),
+    (SELECT COALESCE(MAX(last_update), 0) FROM film_category),
+    (SELECT COALESCE(MAX(last_update), 0) FROM category)
+) AS version,
+(SELECT COUNT(*) FROM film_category) AS row_count
+;
+"""
+
 GET_YEAR_RANGE_BY_CATEGORY_ID_SQL = """
 SELECT  
 MIN(f.release_year) as year_from,
@@ -134,7 +364,7 @@ def list_categories(conn) -> list[dict]:
                 - category_id (int)
                 - category_name (str)
         """
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "list_categories") as cursor:
         # parameters = {"limit": limit, "offset": offset}
         cursor.execute(LIST_CATEGORIES_SQL)
         items = cursor.fetchall()
@@ -143,7 +373,7 @@ def list_categories(conn) -> list[dict]:
 
 
 def get_category_by_category_name(conn, category_name) -> dict:
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "get_category_by_category_name") as cursor:
         parameters = {"category_name": category_name}
         cursor.execute(GET_CATEGORIES_BY_NAME_SQL, parameters)
         items = cursor.fetchone()
@@ -166,7 +396,7 @@ def get_year_range_by_category(conn, category_id: str) -> dict:
             - category (str)
     """
 
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "get_year_range_by_category") as cursor:
         parameters = {"category_id": category_id}
         cursor.execute(GET_YEAR_RANGE_BY_CATEGORY_ID_SQL, parameters)
         items = cursor.fetchone()
@@ -174,6 +404,86 @@ def get_year_range_by_category(conn, category_id: str) -> dict:
     return items
 
 
+def get_catalog_version(conn) -> str:
+    """
+    Get the current version of the film catalog.
+
+    The version changes whenever a film, category or film category row is
+    inserted, updated or deleted (latest `last_update` plus the number of rows).
+
+    Args:
+        conn: Active MySQL connection.
+
+    Returns:
+        str: Catalog version.
+    """
+    with timed_cursor(conn, "get_catalog_version") as cursor:
+        cursor.execute(GET_CATALOG_VERSION_SQL)
+        row = cursor.fetchone()
+    return f"{row['version']}/{row['row_count']}"
+
+
+def list_films_with_categories(conn) -> list[dict]:
+    """
+    Get all films joined with their categories.
+
+    Used to load the in-memory film catalog.
+
+    Args:
+        conn: Active MySQL connection.
+
+    Returns:
+        list[dict]: One row per (film, category) pair, each item contains:
+            - film_id (int)
+            - title (str)
+            - release_year (int)
+            - category_id (int)
+    """
+    with timed_cursor(conn, "list_films_with_categories") as cursor:
+        cursor.execute(LIST_FILMS_WITH_CATEGORIES_SQL)
+        items = cursor.fetchall()
+    return items
+
+
+def list_film_titles(conn) -> list[dict]:
+    """
+    Get the id and title of every film.
+
+    Used to build the in-memory title autocomplete index.
+
+    Args:
+        conn: Active MySQL connection.
+
+    Returns:
+        list[dict]: List of films, each item contains:
+            - film_id (int)
+            - title (str)
+    """
+    with timed_cursor(conn, "list_film_titles") as cursor:
+        cursor.execute(LIST_FILM_TITLES_SQL)
+        items = cursor.fetchall()
+    return items
+
+
+def list_year_ranges_by_category(conn) -> list[dict]:
+    """
+    Get the available release year range for every category.
+
+    Args:
+        conn: Active MySQL connection.
+
+    Returns:
+        list[dict]: One row per category that has films, each item contains:
+            - category_id (int)
+            - year_from (int)
+            - year_to (int)
+    """
+    with timed_cursor(conn, "list_year_ranges_by_category") as cursor:
+        cursor.execute(LIST_YEAR_RANGES_BY_CATEGORY_SQL)
+        items = cursor.fetchall()
+    return items
+
+
 def search_films_by_title_like(conn, keyword: str, limit: int = 10, offset: int = 0) -> list[dict]:
     """
     Search films by a keyword in the film title.
@@ -190,7 +500,7 @@ def search_films_by_title_like(conn, keyword: str, limit: int = 10, offset: int
             - title (str)
             - release_year (int)
     """
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "search_films_by_title_like") as cursor:
         parameters = {"keyword": f"%{keyword}%", "limit": limit, "offset": offset}
         cursor.execute(SEARCH_FILMS_BY_TITLE_LIKE_SQL, parameters)
         items = cursor.fetchall()
@@ -208,7 +518,7 @@ def count_films_by_title_like(conn, keyword: str) -> int:
     Returns:
         int: Total number of matching films.
     """
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "count_films_by_title_like") as cursor:
         parameters = {"keyword": f"%{keyword}%"}
         cursor.execute(COUNT_FILMS_BY_TITLE_LIKE_SQL, parameters)
         row = cursor.fetchone()
@@ -233,7 +543,7 @@ def search_films_by_category(conn, category_id: str, limit: int = 10, offset: in
             - release_year (int)
             - category (str)
     """
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "search_films_by_category") as cursor:
         parameters = {"category_id": category_id, "limit": limit, "offset": offset}
         cursor.execute(SEARCH_FILMS_BY_CATEGORY_SQL, parameters)
         items = cursor.fetchall()
@@ -252,7 +562,7 @@ def count_films_by_category(conn, category_id: str) -> int:
     Returns:
         int: Total number of matching films.
     """
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "count_films_by_category") as cursor:
         parameters = {"category_id": category_id}
         cursor.execute(COUNT_FILMS_BY_CATEGORY_SQL, parameters)
         row = cursor.fetchone()
@@ -282,7 +592,7 @@ def search_films_by_category_in_year_range(conn, category_id: str,
                 - category (str)
         """
 
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "search_films_by_category_in_year_range") as cursor:
         parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to, "limit": limit,
                       "offset": offset}
         cursor.execute(SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_SQL, parameters)
@@ -304,7 +614,7 @@ def count_films_by_category_in_year_range(conn, category_id: str, year_from: int
         Returns:
             int: Total number of matching films.
     """
-    with conn.cursor(dictionary=True) as cursor:
+    with timed_cursor(conn, "count_films_by_category_in_year_range") as cursor:
         parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to}
         cursor.execute(COUNT_FILMS_BY_CATEGORY_IN_YEAR_RANGE_SQL, parameters)
         row = cursor.fetchone()
@@ -312,5 +622,257 @@ def count_films_by_category_in_year_range(conn, category_id: str, year_from: int
     return int(row["total"] if row else 0)
 
 
+def _search_with_total(conn, name: str, sql: str, parameters: dict,
+                       count_fn: Callable[[], int]) -> tuple[list[dict], int]:
+    """
+    Run a search query that returns the total count in the `total` column of every row.
+
+    If the page is empty (e.g. the offset is past the end), the total cannot be read
+    from the rows and `count_fn` is used instead.
+
+    Returns:
+        tuple: (items, total) with `total` removed from the items.
+    """
+    with timed_cursor(conn, name) as cursor:
+        cursor.execute(sql, parameters)
+        items = cursor.fetchall()
+
+    if not items:
+        total = count_fn() if parameters.get("offset") else 0
+        return items, total
+
+    total = int(items[0]["total"])
+    for item in items:
+        item.pop("total", None)
+    return items, total
+
+
+def search_films_by_title_like_with_total(conn, keyword: str, limit: int = 10,
+                                          offset: int = 0) -> tuple[list[dict], int]:
+    """
+    Search films by a keyword in the film title and count all matches in one query.
+
+    Args:
+        conn: Active MySQL connection (MySQL 8.0+).
+        keyword: Keyword to search for.
+        limit: Maximum number of results to return.
+        offset: Number of items to skip (for pagination).
+
+    Returns:
+        tuple: (items, total) - the same results as `search_films_by_title_like`
+            and `count_films_by_title_like`.
+    """
+    parameters = {"keyword": f"%{keyword}%", "limit": limit, "offset": offset}
+    return _search_with_total(conn, "search_films_by_title_like_with_total",
+                              SEARCH_FILMS_BY_TITLE_LIKE_WITH_TOTAL_SQL, parameters,
+                              lambda: count_films_by_title_like(conn, keyword))
+
+
+def search_films_by_category_with_total(conn, category_id: str, limit: int = 10,
+                                        offset: int = 0) -> tuple[list[dict], int]:
+    """
+    Search films by category and count all matches in one query.
+
+    Args:
+        conn: Active MySQL connection (MySQL 8.0+).
+        category_id: Category ID.
+        limit: Maximum number of results to return.
+        offset: Number of items to skip (for pagination).
+
+    Returns:
+        tuple: (items, total) - the same results as `search_films_by_category`
+            and `count_films_by_category`.
+    """
+    parameters = {"category_id": category_id, "limit": limit, "offset": offset}
+    return _search_with_total(conn, "search_films_by_category_with_total",
+                              SEARCH_FILMS_BY_CATEGORY_WITH_TOTAL_SQL, parameters,
+                              lambda: count_films_by_category(conn, category_id))
+
+
+def search_films_by_category_in_year_range_with_total(conn, category_id: str, year_from: int, year_to: int,
+                                                      limit: int = 10, offset: int = 0) -> tuple[list[dict], int]:
+    """
+    Search films by category and release year range and count all matches in one query.
+
+    Args:
+        conn: Active MySQL connection (MySQL 8.0+).
+        category_id: Category ID.
+        year_from: Start year (inclusive).
+        year_to: End year (inclusive).
+        limit: Maximum number of results to return.
+        offset: Number of items to skip (for pagination).
+
+    Returns:
+        tuple: (items, total) - the same results as `search_films_by_category_in_year_range`
+            and `count_films_by_category_in_year_range`.
+    """
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to,
+                  "limit": limit, "offset": offset}
+    return _search_with_total(conn, "search_films_by_category_in_year_range_with_total",
+                              SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_WITH_TOTAL_SQL, parameters,
+                              lambda: count_films_by_category_in_year_range(conn, category_id, year_from, year_to))
+
+
+def _search_keyset(conn, name: str, after_sql: str, before_sql: str, parameters: dict,
+                   after: Optional[tuple] = None, before: Optional[tuple] = None,
+                   offset: int = 0) -> list[dict]:
+    """
+    Run a keyset (seek) search ordered by (title, film_id).
+
+    Args:
+        conn: Active MySQL connection.
+        name: Statement name reported to the query hooks.
+        after_sql: Query returning rows after the (title, film_id) boundary in ascending order.
+        before_sql: Query returning rows before the boundary in descending order.
+        parameters: Query parameters without the boundary.
+        after: (title, film_id) of the last row of the previous page.
+        before: (title, film_id) of the first row of the next page.
+        offset: Number of items to skip after the boundary (ignored with `before`).
+
+    Returns:
+        list[dict]: Rows in ascending (title, film_id) order.
+    """
+    with timed_cursor(conn, name) as cursor:
+        if before is not None:
+            parameters = {**parameters, "title": before[0], "film_id": before[1]}
+            cursor.execute(before_sql, parameters)
+            items = cursor.fetchall()
+            items.reverse()
+        else:
+            title, film_id = after if after is not None else ("", 0)
+            parameters = {**parameters, "title": title, "film_id": film_id, "offset": offset}
+            cursor.execute(after_sql, parameters)
+            items = cursor.fetchall()
+
+    return items
+
+
+def search_films_by_category_keyset(conn, category_id: str, limit: int = 10,
+                                    after: Optional[tuple] = None, before: Optional[tuple] = None,
+                                    offset: int = 0) -> list[dict]:
+    """
+    Search films by category with keyset pagination ordered by (title, film_id).
+
+    Args:
+        conn: Active MySQL connection.
+        category_id: Category ID.
+        limit: Maximum number of results to return.
+        after: (title, film_id) of the last row of the previous page.
+        before: (title, film_id) of the first row of the next page.
+        offset: Number of items to skip after the boundary (ignored with `before`).
+
+    Returns:
+        list[dict]: Same items as `search_films_by_category`.
+    """
+    parameters = {"category_id": category_id, "limit": limit}
+    return _search_keyset(conn, "search_films_by_category_keyset",
+                          SEARCH_FILMS_BY_CATEGORY_AFTER_SQL, SEARCH_FILMS_BY_CATEGORY_BEFORE_SQL,
+                          parameters, after, before, offset)
+
+
+def search_films_by_category_in_year_range_keyset(conn, category_id: str, year_from: int, year_to: int,
+                                                  limit: int = 10,
+                                                  after: Optional[tuple] = None, before: Optional[tuple] = None,
+                                                  offset: int = 0) -> list[dict]:
+    """
+    Search films by category and release year range with keyset pagination ordered by (title, film_id).
+
+    Args:
+        conn: Active MySQL connection.
+        category_id: Category ID.
+        year_from: Start year (inclusive).
+        year_to: End year (inclusive).
+        limit: Maximum number of results to return.
+        after: (title, film_id) of the last row of the previous page.
+        before: (title, film_id) of the first row of the next page.
+        offset: Number of items to skip after the boundary (ignored with `before`).
+
+    Returns:
+        list[dict]: Same items as `search_films_by_category_in_year_range`.
+    """
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to, "limit": limit}
+    return _search_keyset(conn, "search_films_by_category_in_year_range_keyset",
+                          SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_AFTER_SQL,
+                          SEARCH_FILMS_BY_CATEGORY_IN_YEAR_RANGE_BEFORE_SQL,
+                          parameters, after, before, offset)
+
+
+def _stream_rows(conn, name: str, sql: str, parameters: dict, batch_size: int) -> Iterator[list[dict]]:
+    """
+    Execute a query and yield its rows in `fetchmany` batches.
+
+    The cursor is unbuffered, so rows are read from the server as they are fetched and
+    only one batch is held in memory. If the consumer stops early (e.g. the export
+    client disconnected), the connection is closed without reading the rest of a
+    possibly huge result; a pooled connection is dropped from its pool.
+    """
+    with timed_cursor(conn, name) as cursor:
+        cursor.execute(sql, parameters)
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+        except BaseException:
+            if conn.unread_result:
+                close_without_reading(conn)
+            raise
+
+
+def stream_films_by_title_like(conn, keyword: str, batch_size: int = 500) -> Iterator[list[dict]]:
+    """
+    Stream all films matching a keyword in the film title.
+
+    Args:
+        conn: Active MySQL connection. It must not be used for other queries until
+            the iterator is exhausted or closed.
+        keyword: Keyword to search for.
+        batch_size: Number of rows per batch.
+
+    Yields:
+        list[dict]: Batches of films in the `search_films_by_title_like` format.
+    """
+    parameters = {"keyword": f"%{keyword}%"}
+    yield from _stream_rows(conn, "stream_films_by_title_like",
+                            EXPORT_FILMS_BY_TITLE_LIKE_SQL, parameters, batch_size)
+
+
+def stream_films_by_category(conn, category_id: str, batch_size: int = 500) -> Iterator[list[dict]]:
+    """
+    Stream all films of a category ordered by title.
+
+    Args:
+        conn: Active MySQL connection (see `stream_films_by_title_like`).
+        category_id: Category ID.
+        batch_size: Number of rows per batch.
+
+    Yields:
+        list[dict]: Batches of films in the `search_films_by_category` format.
+    """
+    parameters = {"category_id": category_id}
+    yield from _stream_rows(conn, "stream_films_by_category", EXPORT_FILMS_BY_CATEGORY_SQL, parameters, batch_size)
+
+
+def stream_films_by_category_in_year_range(conn, category_id: str, year_from: int, year_to: int,
+                                           batch_size: int = 500) -> Iterator[list[dict]]:
+    """
+    Stream all films of a category released in a year range, ordered by title.
+
+    Args:
+        conn: Active MySQL connection (see `stream_films_by_title_like`).
+        category_id: Category ID.
+        year_from: Start year (inclusive).
+        year_to: End year (inclusive).
+        batch_size: Number of rows per batch.
+
+    Yields:
+        list[dict]: Batches of films in the `search_films_by_category_in_year_range` format.
+    """
+    parameters = {"category_id": category_id, "year_from": year_from, "year_to": year_to}
+    yield from _stream_rows(conn, "stream_films_by_category_in_year_range",
+                            EXPORT_FILMS_BY_CATEGORY_IN_YEAR_RANGE_SQL, parameters, batch_size)
+
+
 if __name__ == '__main__':
     pass
@@ -2,6 +2,18 @@ from typing import Any
 
 QUERY_LOGS_COLLECTION_NAME = "final_project_010825_albert"
 
+QUERY_KEY_FIELDS = ("keyword", "category_name", "years_range")
+
+# Compound index for the last-unique-queries pipeline (used when the query rollup is
+# disabled): the timestamp sort plus all grouped fields, so the aggregation is answered
+# from the index. It still walks every log record; the rollup report does not.
+LAST_UNIQUE_QUERIES_INDEX = [
+    ("timestamp", -1),
+    ("search_type", 1),
+    *[(f"params.{field}", 1) for field in QUERY_KEY_FIELDS],
+    ("params.results_count", 1),
+]
+
 def build_top_queries_pipeline(limit: int = 5) -> list[dict[str, Any]]:
     """Build MongoDB aggregation pipeline for top search queries."""
     return [
@@ -14,16 +26,97 @@ def build_top_queries_pipeline(limit: int = 5) -> list[dict[str, Any]]:
     ]
 
 
-def build_last_unique_queries_pipeline(limit: int = 200) -> list[dict[str, Any]]:
-    """Build MongoDB aggregation pipeline for last unique queries."""
+def build_last_unique_queries_pipeline(limit: int = 5) -> list[dict[str, Any]]:
+    """
+    Build MongoDB aggregation pipeline for last unique queries (without the query rollup).
+
+    Records are grouped by the normalized query (search type + query params) on the
+    server, keeping the latest timestamp and its results count. The initial sort is
+    served by the `LAST_UNIQUE_QUERIES_INDEX` index.
+    """
+    key = {"search_type": "$search_type"}
+    key.update({field: f"$params.{field}" for field in QUERY_KEY_FIELDS})
     return [
-        {
-            "$addFields": {
-                "params.search_type": "$search_type",
-                "params.timestamp": "$timestamp",
-            }
-        },
-        {"$replaceRoot": {"newRoot": "$params"}},
+        {"$sort": {"timestamp": -1}},
+        {"$group": {
+            "_id": key,
+            "timestamp": {"$first": "$timestamp"},
+            "results_count": {"$first": "$params.results_count"},
+        }},
         {"$sort": {"timestamp": -1}},
         {"$limit": limit},
+        {"$replaceRoot": {"newRoot": {
+            "$mergeObjects": ["$_id", {"timestamp": "$timestamp", "results_count": "$results_count"}]
+        }}},
     ]
+
+
+# --- Query rollup: pre-aggregated counters per normalized query ---
+
+QUERY_ROLLUP_COLLECTION_NAME = f"{QUERY_LOGS_COLLECTION_NAME}_rollup"
+
+
+def build_query_key(search_type: str, params: dict) -> dict[str, Any]:
+    """
+    Build the normalized query key of a log record.
+
+    The key contains the search type and the query parameters (without results_count)
+    in a fixed field order, so the same query always produces the same `_id`.
+    """
+    key = {"search_type": search_type}
+    for field in QUERY_KEY_FIELDS:
+        if field in params:
+            key[field] = params[field]
+    return key
+
+
+def build_rollup_update(search_type: str, params: dict, timestamp: str, count: int = 1) -> tuple[dict, dict]:
+    """
+    Build the (filter, update) pair that adds log records to the query rollup.
+
+    Args:
+        search_type: Search type of the records.
+        params: Params of the latest record.
+        timestamp: Timestamp of the latest record.
+        count: Number of records to add.
+
+    Returns:
+        tuple: (filter, update) for an upsert `update_one`/`UpdateOne`.
+    """
+    key = build_query_key(search_type, params)
+    update = {
+        "$inc": {"count": count},
+        "$set": {"results_count": params.get("results_count"), "last_seen": timestamp},
+    }
+    return {"_id": key}, update
+
+
+def build_rollup_backfill_pipeline() -> list[dict[str, Any]]:
+    """Build MongoDB aggregation pipeline that rebuilds the query rollup from all log records."""
+    key = {"search_type": "$search_type"}
+    key.update({field: f"$params.{field}" for field in QUERY_KEY_FIELDS})
+    return [
+        {"$sort": {"timestamp": 1}},
+        {"$group": {
+            "_id": key,
+            "count": {"$sum": 1},
+            "results_count": {"$last": "$params.results_count"},
+            "last_seen": {"$last": "$timestamp"},
+        }},
+        {"$merge": {"into": QUERY_ROLLUP_COLLECTION_NAME, "whenMatched": "replace", "whenNotMatched": "insert"}},
+    ]
+
+
+def build_top_queries_rollup_sort() -> list[tuple[str, int]]:
+    """Sort order for the top-N report over the query rollup (backed by an index)."""
+    return [("count", -1), ("last_seen", -1)]
+
+
+def build_last_unique_rollup_sort() -> list[tuple[str, int]]:
+    """
+    Sort order for the last-unique-queries report over the query rollup (backed by an index).
+
+    The rollup holds one document per normalized query with its latest timestamp, so
+    the report is a walk of the first `limit` index entries, whatever the log size.
+    """
+    return [("last_seen", -1)]
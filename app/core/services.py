@@ -1,15 +1,63 @@
+import base64
+import binascii
+import json
 from collections import defaultdict
 from datetime import datetime
-from typing import Optional, Any, Tuple
-
-from pymongo.errors import PyMongoError
-
-from app.core.db.connection import get_mysql_connection
-from app.core.db.mongo_connection import get_mongo_db
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Any, Tuple, Callable, Iterator
+
+from app.core.cache import ResultCache, get_result_cache
+from app.core.catalog import FilmCatalog, get_film_catalog
+from app.core.categories import CategoryRegistry, get_category_registry
+from app.core.db.connection import mysql_read_connection, run_mysql_read, server_supports_window_functions
+from app.core.db.mongo_connection import get_mongo_db, pymongo_error
+from app.core.db.pool import mysql_error
+from app.core.exceptions import DatabaseConnectionError, MongoConnectionError
+from app.core.export import encode_export
+from app.core.metrics import SERVICE_LATENCY, timed
+from app.core.query_hooks import timed_aggregate, timed_find, timed_write
 from app.core.repositories import films_mysql_repo as repo
 from app.core.repositories import query_logs_mongo_repo as repo_mogo
+from app.core.query_log_writer import get_query_log_writer, close_query_log_writer
+from app.core.single_flight import SingleFlight, get_search_single_flight
+from app.core.title_suggest import TitleSuggester, get_title_suggester
+from app.core.user_settings import (
+    catalog_engine_enabled,
+    window_count_enabled,
+    result_cache_enabled,
+    single_flight_enabled,
+    category_registry_enabled,
+    query_log_async_enabled,
+    query_rollup_enabled,
+    export_batch_size,
+    search_many_max_workers,
+)
 
 name_log_collection = repo_mogo.QUERY_LOGS_COLLECTION_NAME
+name_rollup_collection = repo_mogo.QUERY_ROLLUP_COLLECTION_NAME
+
+_window_functions_supported = None
+_report_indexes_ensured = False
+
+
+def use_window_count(conn) -> bool:
+    """
+    Check whether a search page and its total count can be fetched in one query.
+
+    The server capability is detected once per process.
+
+    Args:
+        conn: Active MySQL connection.
+
+    Returns:
+        bool: True if `window_count_enabled` is set and the server supports window functions.
+    """
+    global _window_functions_supported
+    if not window_count_enabled:
+        return False
+    if _window_functions_supported is None:
+        _window_functions_supported = server_supports_window_functions(conn)
+    return _window_functions_supported
 
 
 def calculate_total_pages(total: int, page_size: int) -> int:
@@ -30,6 +78,54 @@ def calculate_total_pages(total: int, page_size: int) -> int:
     return pages
 
 
+def encode_page_token(item: dict, direction: str) -> str:
+    """
+    Build an opaque keyset pagination token.
+
+    Args:
+        item: Boundary film row (the last row of the page for "next", the first one for "prev").
+        direction: "next" or "prev".
+
+    Returns:
+        str: URL-safe token.
+    """
+    raw = json.dumps([direction, item.get("title"), item.get("film_id")], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_page_token(token: Optional[str]) -> Optional[tuple[str, tuple[str, int]]]:
+    """
+    Parse a keyset pagination token built by `encode_page_token`.
+
+    Args:
+        token: Token string.
+
+    Returns:
+        tuple | None: (direction, (title, film_id)), or None if the token is empty or invalid.
+    """
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        direction, title, film_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        return None
+    if direction not in ("next", "prev") or not isinstance(title, str) or not isinstance(film_id, int):
+        return None
+    return direction, (title, film_id)
+
+
+def add_page_tokens(result: dict) -> dict:
+    """Add keyset `next_token`/`prev_token` to a paginated response."""
+    items = result.get("items")
+    page = result.get("page", 1)
+    has_next = bool(items) and page < result.get("pages", 0)
+    has_prev = bool(items) and page > 1
+    result["next_token"] = encode_page_token(items[-1], "next") if has_next else None
+    result["prev_token"] = encode_page_token(items[0], "prev") if has_prev else None
+    return result
+
+
 def get_text_query(item: dict) -> str:
     """
         Build a human-readable query text based on a logged search record.
@@ -68,6 +164,66 @@ def get_format_date(timestamp: str) -> str:
     return dt.strftime("%d.%m.%Y %H:%M:%S")
 
 
+def rollup_doc_to_top_query(doc: dict) -> dict:
+    """Convert a query rollup document to a `build_top_queries_pipeline` row."""
+    return {**doc["_id"], "count_query": doc.get("count"), "results_count": doc.get("results_count")}
+
+
+def rollup_doc_to_last_query(doc: dict) -> dict:
+    """Convert a query rollup document to a `build_last_unique_queries_pipeline` row."""
+    return {**doc["_id"], "timestamp": doc.get("last_seen"), "results_count": doc.get("results_count")}
+
+
+def format_top_queries(result) -> list[dict]:
+    """
+    Format top-queries aggregation rows into report rows.
+
+    Args:
+        result: Iterable of rows with search_type, query params, count_query and results_count.
+
+    Returns:
+        list[dict]: Report rows with idx, type, query, count and results.
+    """
+    res = list()
+    for i, item in enumerate(result, 1):
+        format_dict = defaultdict(str)
+        q_type = item.get('search_type')
+        format_dict["idx"] = str(i)
+        format_dict["type"] = q_type
+
+        text_query = get_text_query(item)
+        format_dict["query"] = text_query
+
+        format_dict["count"] = item.get('count_query')
+        format_dict["results"] = item.get('results_count')
+        res.append(dict(format_dict))
+
+    return res
+
+
+def format_last_unique_queries(result) -> list[dict]:
+    """
+    Format last-unique-queries aggregation rows into report rows.
+
+    Args:
+        result: Iterable of rows with search_type, query params, timestamp and results_count.
+
+    Returns:
+        list[dict]: Report rows with idx, type, query, timestamp and results.
+    """
+    res = list()
+    for i, item in enumerate(result, 1):
+        format_dict = defaultdict(str)
+        format_dict["idx"] = str(i)
+        format_dict["type"] = item.get('search_type')
+        format_dict["query"] = get_text_query(item)
+        format_dict["timestamp"] = get_format_date(item.get('timestamp'))
+        format_dict["results"] = item.get('results_count')
+        res.append(dict(format_dict))
+
+    return res
+
+
 def _to_int_or_none(value: Any) -> Optional[int]:
     """Convert value to int, return None if value is empty/invalid."""
     if value is None:
@@ -121,11 +277,286 @@ def normalize_year_range_for_category(year_from: Any, year_to: Any,
     return yf, yt
 
 
+def stream_from_mysql(stream: Callable[..., Iterator[list[dict]]], *args,
+                      batch_size: int = export_batch_size) -> Iterator[list[dict]]:
+    """
+    Run a `films_mysql_repo.stream_*` function on a pooled connection.
+
+    The connection is taken when iteration starts and returned to the pool when the
+    iterator is exhausted or closed.
+    """
+    with mysql_read_connection() as conn:
+        yield from stream(conn, *args, batch_size=batch_size)
+
+
+def _batch_int(query: dict, name: str, default: Optional[int] = None) -> Optional[int]:
+    """Get an integer parameter of a batch query (`default` if it is missing or empty)."""
+    value = query.get(name)
+    if value is None or value == "":
+        return default
+    number = _to_int_or_none(value)
+    if number is None:
+        raise ValueError(f"{name} must be an integer")
+    return number
+
+
+def batch_query_key(query: Any, max_page_size: Optional[int] = None) -> tuple:
+    """
+    Get the canonical key of a `search_many` query.
+
+    Queries with the same key return the same result, so a batch runs each key once.
+    Text is normalized the same way as by the single searches (lower case only: the
+    keyword is matched with LIKE as it was typed, surrounding spaces included).
+
+    Args:
+        query: Batch query, see `FilmSearchService.search_many`.
+        max_page_size: Largest allowed page_size (None: no limit).
+
+    Returns:
+        tuple: ("keyword", keyword, page, page_size), ("category", name, page, page_size) or
+            ("category_year", name, year_from, year_to, page, page_size); text in lower case.
+
+    Raises:
+        ValueError: If the query type or its parameters are invalid.
+    """
+    if not isinstance(query, dict):
+        raise ValueError("query must be an object")
+    search_type = query.get("type")
+    page = _batch_int(query, "page", 1)
+    page_size = _batch_int(query, "page_size", 10)
+    if page < 1 or page_size < 1:
+        raise ValueError("page and page_size must be positive integers")
+    if max_page_size is not None and page_size > max_page_size:
+        raise ValueError(f"page_size must not exceed {max_page_size}")
+
+    if search_type == "keyword":
+        keyword = query.get("keyword")
+        if not isinstance(keyword, str) or not keyword:
+            raise ValueError("keyword is required")
+        return "keyword", keyword.lower(), page, page_size
+
+    if search_type in ("category", "category_year"):
+        category_name = query.get("category_name")
+        if not isinstance(category_name, str) or not category_name:
+            raise ValueError("category_name is required")
+        if search_type == "category":
+            return "category", category_name.lower(), page, page_size
+        year_from, year_to = _batch_int(query, "year_from"), _batch_int(query, "year_to")
+        return "category_year", category_name.lower(), year_from, year_to, page, page_size
+
+    raise ValueError(f"Unknown query type: {search_type}")
+
+
+def batch_query_keys(queries: list, max_page_size: Optional[int] = None) -> list:
+    """Get `batch_query_key` of every query, or the ValueError for an invalid one."""
+    keys = []
+    for query in queries:
+        try:
+            keys.append(batch_query_key(query, max_page_size))
+        except ValueError as err:
+            keys.append(err)
+    return keys
+
+
+def batch_results(keys: list, outcomes: dict) -> list[dict]:
+    """
+    Arrange the outcomes of the unique batch queries in the order of the original queries.
+
+    Args:
+        keys: Result of `batch_query_keys`.
+        outcomes: Outcome ({"ok": True, "result": ...} or {"ok": False, "error": ...}) per unique key.
+
+    Returns:
+        list[dict]: One outcome per query; duplicates get their own copy of the page items.
+    """
+    results = []
+    seen = set()
+    for key in keys:
+        if isinstance(key, ValueError):
+            results.append({"ok": False, "error": str(key)})
+            continue
+        outcome = outcomes[key]
+        if key in seen and outcome["ok"]:
+            result = outcome["result"]
+            outcome = {"ok": True, "result": {**result, "items": [dict(item) for item in result["items"]]}}
+        seen.add(key)
+        results.append(outcome)
+    return results
+
+
 class FilmSearchService:
-    def __init__(self):
-        # self.connection = get_mysql_connection()
-        pass
+    def __init__(self, catalog: Optional[FilmCatalog] = None, cache: Optional[ResultCache] = None,
+                 categories: Optional[CategoryRegistry] = None, single_flight: Optional[SingleFlight] = None,
+                 titles: Optional[TitleSuggester] = None):
+        """
+        Args:
+            catalog: In-memory film catalog used to answer searches. If not given, the
+                global catalog is used when `catalog_engine_enabled` is set, otherwise
+                every search goes to MySQL.
+            cache: Search result cache. If not given, the global cache is used when
+                `result_cache_enabled` is set.
+            categories: Category registry used for category lookups and year ranges. If not
+                given, the global registry is used when `category_registry_enabled` is set.
+            single_flight: Coalesces concurrent identical searches into one execution. If not
+                given, the global instance is used when `single_flight_enabled` is set.
+            titles: Title autocomplete index. If not given, the global one is used.
+        """
+        if catalog is None and catalog_engine_enabled:
+            catalog = get_film_catalog()
+        if cache is None and result_cache_enabled:
+            cache = get_result_cache()
+        if categories is None and category_registry_enabled:
+            categories = get_category_registry()
+        if single_flight is None and single_flight_enabled:
+            single_flight = get_search_single_flight()
+        self.catalog = catalog
+        self.cache = cache
+        self.categories = categories
+        self.single_flight = single_flight
+        self.titles = titles if titles is not None else get_title_suggester()
+
+    def _cached(self, key: tuple, fetch: Callable[[], tuple[list[dict], int]]) -> tuple[list[dict], int]:
+        """
+        Get (items, total) from the result cache or fetch and cache them.
+
+        On a miss, concurrent calls with the same key share one `fetch` (single-flight);
+        the result is cached by the call that ran it. Cached and shared items are copied
+        on every call, so callers may modify them freely.
+
+        Args:
+            key: Canonical cache key: (search type, normalized params..., page_size, offset).
+            fetch: Function that runs the search on a cache miss.
+        """
+        if self.cache is None:
+            if self.single_flight is None:
+                return fetch()
+            items, total = self.single_flight.do(key, fetch)
+            return [dict(item) for item in items], total
+
+        cached = self.cache.get(key)
+        if cached is None:
+            def fetch_and_store() -> tuple[list[dict], int]:
+                result = fetch()
+                self.cache.set(key, result)
+                return result
+
+            if self.single_flight is None:
+                cached = fetch_and_store()
+            else:
+                cached = self.single_flight.do(key, fetch_and_store)
+
+        items, total = cached
+        return [dict(item) for item in items], total
+
+    def invalidate_cache(self, search_type: Optional[str] = None) -> None:
+        """
+        Drop cached search results.
+
+        Args:
+            search_type: "keyword", "category" or "category_year" to drop only that
+                search type; None to clear the whole cache.
+        """
+        if self.cache is not None:
+            self.cache.invalidate(search_type)
+
+    def cache_stats(self) -> Optional[dict]:
+        """Get result cache statistics (hits, misses, entries, bytes...), or None if caching is off."""
+        if self.cache is None:
+            return None
+        return self.cache.stats()
+
+    def single_flight_stats(self) -> Optional[dict]:
+        """Get search coalescing statistics (executions, coalesced...), or None if single-flight is off."""
+        if self.single_flight is None:
+            return None
+        return self.single_flight.stats()
+
+    def _fetch_by_keyword(self, keyword: str, limit: int, offset: int) -> tuple[list[dict], int]:
+        """Get one page of films matching the keyword and the total count."""
+        if self.catalog is not None:
+            return self.catalog.search_by_keyword(keyword, limit, offset)
+
+        def fetch(conn) -> tuple[list[dict], int]:
+            if use_window_count(conn):
+                return repo.search_films_by_title_like_with_total(conn, keyword, limit, offset)
+            items = repo.search_films_by_title_like(conn, keyword, limit, offset)
+            total = repo.count_films_by_title_like(conn, keyword)
+            return items, total
+
+        return run_mysql_read(fetch)
+
+    def _fetch_by_category(self, category_id, limit: int, offset: int,
+                           keyset: bool = False, cursor: Optional[str] = None) -> tuple[list[dict], int]:
+        """
+        Get one page of films in the category and the total count.
+
+        In keyset mode the page is ordered by (title, film_id) and located by `cursor`
+        (if it is valid) instead of `offset`.
+        """
+        seek = decode_page_token(cursor) if keyset else None
+        after = seek[1] if seek and seek[0] == "next" else None
+        before = seek[1] if seek and seek[0] == "prev" else None
+        if seek:
+            offset = 0
+
+        if self.catalog is not None:
+            if keyset:
+                return self.catalog.search_by_category_keyset(category_id, limit, after, before, offset)
+            return self.catalog.search_by_category(category_id, limit, offset)
+
+        def fetch(conn) -> tuple[list[dict], int]:
+            if keyset:
+                items = repo.search_films_by_category_keyset(conn, category_id, limit, after, before, offset)
+            elif use_window_count(conn):
+                return repo.search_films_by_category_with_total(conn, category_id, limit, offset)
+            else:
+                items = repo.search_films_by_category(conn, category_id, limit, offset)
+            total = repo.count_films_by_category(conn, category_id)
+            return items, total
+
+        return run_mysql_read(fetch)
 
+    def _fetch_by_category_year(self, category_id, year_from: int, year_to: int, limit: int, offset: int,
+                                keyset: bool = False, cursor: Optional[str] = None) -> tuple[list[dict], int]:
+        """
+        Get one page of films in the category within the (normalized) year range and the total count.
+
+        In keyset mode the page is ordered by (title, film_id) and located by `cursor`
+        (if it is valid) instead of `offset`.
+        """
+        seek = decode_page_token(cursor) if keyset else None
+        after = seek[1] if seek and seek[0] == "next" else None
+        before = seek[1] if seek and seek[0] == "prev" else None
+        if seek:
+            offset = 0
+
+        if self.catalog is not None:
+            if keyset:
+                return self.catalog.search_by_category_in_year_range_keyset(category_id, year_from, year_to,
+                                                                            limit, after, before, offset)
+            return self.catalog.search_by_category_in_year_range(category_id, year_from, year_to,
+                                                                 limit, offset)
+
+        def fetch(conn) -> tuple[list[dict], int]:
+            if keyset:
+                items = repo.search_films_by_category_in_year_range_keyset(conn, category_id,
+                                                                           year_from, year_to,
+                                                                           limit, after, before, offset)
+            elif use_window_count(conn):
+                return repo.search_films_by_category_in_year_range_with_total(conn, category_id,
+                                                                              year_from, year_to,
+                                                                              limit, offset)
+            else:
+                items = repo.search_films_by_category_in_year_range(conn, category_id,
+                                                                    year_from, year_to,
+                                                                    limit, offset)
+            total = repo.count_films_by_category_in_year_range(conn, category_id,
+                                                               year_from, year_to)
+            return items, total
+
+        return run_mysql_read(fetch)
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "search_by_keyword"))
     def search_by_keyword(self, keyword: str, page_size: int = 10, page: int = 1, log: bool = True, **kwargs) -> dict:
         """
     Search films by a keyword in the title.
@@ -150,31 +581,28 @@ class FilmSearchService:
             - pages (int): total number of pages
     """
         # print('services.search_by_keyword',keyword)
-        conn = get_mysql_connection()
-        # conn = self.connection
         offset = (page - 1) * page_size
-        try:
-            items = repo.search_films_by_title_like(conn, keyword, page_size, offset)
-            total = repo.count_films_by_title_like(conn, keyword)
-            pages = calculate_total_pages(total, page_size)
-
-            if log:
-                search_type = "keyword"
-                lower_keyword = keyword.lower()
-                params = {"keyword": lower_keyword, "results_count": total}
-                log_search_query(search_type, params)
-
-            return {
-                "items": items,
-                "total": total,
-                "page": page,
-                "page_size": page_size,
-                "pages": pages
-            }
-        finally:
-            conn.close()
-
-    def search_by_category(self, dict_category, page_size: int = 10, page: int = 1, log: bool = True, **kwargs) -> dict:
+        cache_key = ("keyword", keyword.lower(), page_size, offset)
+        items, total = self._cached(cache_key, lambda: self._fetch_by_keyword(keyword, page_size, offset))
+        pages = calculate_total_pages(total, page_size)
+
+        if log:
+            search_type = "keyword"
+            lower_keyword = keyword.lower()
+            params = {"keyword": lower_keyword, "results_count": total}
+            log_search_query(search_type, params)
+
+        return {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages
+        }
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "search_by_category"))
+    def search_by_category(self, dict_category, page_size: int = 10, page: int = 1, log: bool = True,
+                           keyset: bool = False, cursor: Optional[str] = None, **kwargs) -> dict:
         """
         Search films by a selected category.
 
@@ -187,6 +615,10 @@ class FilmSearchService:
             page_size: Number of items per page.
             page: Page number (1-based).
             log: If True, writes the search query to analytics logs (only for the first request).
+            keyset: If True, films are ordered by (title, film_id) and pages are located
+                with continuation tokens instead of OFFSET.
+            cursor: `next_token`/`prev_token` of the previous response (keyset mode only).
+                Without a valid cursor the page is located by `page`.
 
         Returns:
             dict: Paginated response with the following keys:
@@ -199,35 +631,40 @@ class FilmSearchService:
                 - page (int): current page number
                 - page_size (int): number of items per page
                 - pages (int): total number of pages
+                - next_token (str | None): keyset mode only, token of the next page
+                - prev_token (str | None): keyset mode only, token of the previous page
         """
 
-        conn = get_mysql_connection()
-
         offset = (page - 1) * page_size
         category_id = dict_category.get("category_id")
         category_name = dict_category.get("category_name")
-        try:
-            items = repo.search_films_by_category(conn, category_id, page_size, offset)
-            total = repo.count_films_by_category(conn, category_id)
-            pages = calculate_total_pages(total, page_size)
-
-            if log:
-                search_type = "category"
-                params = {"category_name": category_name, "results_count": total}
-                log_search_query(search_type, params)
-
-            return {
-                "items": items,
-                "total": total,
-                "page": page,
-                "page_size": page_size,
-                "pages": pages
-            }
-        finally:
-            conn.close()
 
+        cache_key = ("category", _to_int_or_none(category_id), page_size, offset, keyset, cursor)
+        items, total = self._cached(
+            cache_key, lambda: self._fetch_by_category(category_id, page_size, offset, keyset, cursor)
+        )
+        pages = calculate_total_pages(total, page_size)
+
+        if log:
+            search_type = "category"
+            params = {"category_name": category_name, "results_count": total}
+            log_search_query(search_type, params)
+
+        result = {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages
+        }
+        if keyset:
+            add_page_tokens(result)
+        return result
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "search_by_category_year"))
     def search_by_category_year(self, dict_category, year_from, year_to, page_size: int = 10, page: int = 1,
-                                log: bool = True, **kwargs) -> dict:
+                                log: bool = True, keyset: bool = False, cursor: Optional[str] = None,
+                                **kwargs) -> dict:
         """
         Search films by a selected category and release year range.
 
@@ -242,6 +679,10 @@ class FilmSearchService:
             page_size: Number of items per page.
             page: Page number (1-based).
             log: If True, writes the search query to analytics logs (only for the first request).
+            keyset: If True, films are ordered by (title, film_id) and pages are located
+                with continuation tokens instead of OFFSET.
+            cursor: `next_token`/`prev_token` of the previous response (keyset mode only).
+                Without a valid cursor the page is located by `page`.
 
         Returns:
             dict: Paginated response with the following keys:
@@ -254,49 +695,163 @@ class FilmSearchService:
                 - page (int): current page number
                 - page_size (int): number of items per page
                 - pages (int): total number of pages
+                - next_token (str | None): keyset mode only, token of the next page
+                - prev_token (str | None): keyset mode only, token of the previous page
         """
 
-        conn = get_mysql_connection()
-
         offset = (page - 1) * page_size
         category_id = dict_category.get("category_id")
         category_name = dict_category.get("category_name")
+
+        period = self.get_year_range_by_category(dict_category) or {}
+        norm_year_from, norm_year_to = normalize_year_range_for_category(
+            year_from, year_to, int(period.get("year_from", 0)), int(period.get("year_to", 0))
+        )
+
+        cache_key = ("category_year", _to_int_or_none(category_id), norm_year_from, norm_year_to,
+                     page_size, offset, keyset, cursor)
+        items, total = self._cached(
+            cache_key, lambda: self._fetch_by_category_year(category_id, norm_year_from, norm_year_to,
+                                                            page_size, offset, keyset, cursor)
+        )
+        pages = calculate_total_pages(total, page_size)
+
+        years_range = f"{year_from} - {year_to}"
+
+        if log:
+            search_type = "category_year"
+            params = {"category_name": category_name,
+                      "years_range": years_range,
+                      "results_count": total}
+            log_search_query(search_type, params)
+
+        result = {
+            "items": items,
+            "total": total,
+            "page": page,
+            "page_size": page_size,
+            "pages": pages
+        }
+        if keyset:
+            add_page_tokens(result)
+        return result
+
+    def _run_batch_query(self, key: tuple, log: bool) -> dict:
+        """Run one unique `search_many` query; errors are returned as the outcome."""
         try:
+            search_type, page, page_size = key[0], key[-2], key[-1]
+            if search_type == "keyword":
+                result = self.search_by_keyword(key[1], page_size=page_size, page=page, log=log)
+                return {"ok": True, "result": result}
+
+            dict_category = self.get_dict_category_by_name(key[1])
+            if dict_category is None:
+                return {"ok": False, "error": f"Category not found: {key[1]}"}
+            if search_type == "category":
+                result = self.search_by_category(dict_category, page_size=page_size, page=page, log=log)
+            else:
+                result = self.search_by_category_year(dict_category, key[2], key[3], page_size=page_size,
+                                                      page=page, log=log)
+            return {"ok": True, "result": result}
+        except Exception as err:  # one failed query must not fail the batch
+            return {"ok": False, "error": str(err) or type(err).__name__}
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "search_many"))
+    def search_many(self, queries: list[dict], log: bool = False,
+                    max_page_size: Optional[int] = None) -> list[dict]:
+        """
+        Run a batch of heterogeneous searches.
 
-            period = repo.get_year_range_by_category(conn, category_id)
-            allowed_from = int(period.get("year_from", 0))
-            allowed_to = int(period.get("year_to", 0))
+        Identical queries (same `batch_query_key`) run once. The unique queries run
+        concurrently on up to `search_many_max_workers` threads, each with its own pooled
+        MySQL connection; with the in-memory catalog they run inline, since the lookups
+        are CPU-bound and threads would only add overhead.
 
-            norm_year_from, norm_year_to = normalize_year_range_for_category(
-                year_from, year_to, allowed_from, allowed_to
-            )
+        Args:
+            queries: Queries, each a dict with:
+                - type (str): "keyword", "category" or "category_year"
+                - keyword (str): for "keyword"
+                - category_name (str): for "category" and "category_year" (case-insensitive)
+                - year_from, year_to (int, optional): for "category_year"
+                - page (int, optional): page number, default 1
+                - page_size (int, optional): page size, default 10
+            log: If True, every unique query is written to the search query logs.
+            max_page_size: Largest allowed page_size (None: no limit).
 
-            items = repo.search_films_by_category_in_year_range(conn, category_id,
-                                                                norm_year_from, norm_year_to,
-                                                                page_size, offset)
-            total = repo.count_films_by_category_in_year_range(conn, category_id,
-                                                               norm_year_from, norm_year_to)
-            pages = calculate_total_pages(total, page_size)
-
-            years_range = f"{year_from} - {year_to}"
-
-            if log:
-                search_type = "category_year"
-                params = {"category_name": category_name,
-                          "years_range": years_range,
-                          "results_count": total}
-                log_search_query(search_type, params)
-
-            return {
-                "items": items,
-                "total": total,
-                "page": page,
-                "page_size": page_size,
-                "pages": pages
-            }
-        finally:
-            conn.close()
+        Returns:
+            list[dict]: One outcome per query, in the order of `queries` (a malformed
+                query only fails its own outcome):
+                - ok (bool): whether the query succeeded
+                - result (dict): paginated response of the search method (if ok)
+                - error (str): error message (if not ok)
+        """
+        keys = batch_query_keys(queries, max_page_size)
+        unique = list(dict.fromkeys(key for key in keys if not isinstance(key, ValueError)))
+
+        if self.catalog is not None or len(unique) <= 1:
+            outcomes = {key: self._run_batch_query(key, log) for key in unique}
+        else:
+            workers = min(len(unique), search_many_max_workers)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="search-many") as executor:
+                outcomes = dict(zip(unique, executor.map(lambda key: self._run_batch_query(key, log), unique)))
+        return batch_results(keys, outcomes)
+
+    def export_by_keyword(self, keyword: str, export_format: str = "csv") -> Iterator[str]:
+        """
+        Export all films matching a keyword in the film title.
+
+        Rows are streamed from MySQL, so memory use does not depend on the result size.
+
+        Args:
+            keyword: Keyword to search for.
+            export_format: "csv" or "ndjson".
+
+        Returns:
+            Iterator[str]: Text chunks of the export file.
+
+        Raises:
+            ValueError: If the format is not supported.
+        """
+        return encode_export(stream_from_mysql(repo.stream_films_by_title_like, keyword), export_format)
 
+    def export_by_category(self, dict_category, export_format: str = "csv") -> Iterator[str]:
+        """
+        Export all films of a selected category (see `export_by_keyword`).
+
+        Args:
+            dict_category: Category info dict containing:
+                -- category_id (int)
+                -- category_name (str)
+            export_format: "csv" or "ndjson".
+        """
+        category_id = dict_category.get("category_id")
+        return encode_export(stream_from_mysql(repo.stream_films_by_category, category_id), export_format)
+
+    def export_by_category_year(self, dict_category, year_from, year_to,
+                                export_format: str = "csv") -> Iterator[str]:
+        """
+        Export all films of a selected category and release year range (see `export_by_keyword`).
+
+        The year range is normalized the same way as in `search_by_category_year`.
+
+        Args:
+            dict_category: Category info dict containing:
+                -- category_id (int)
+                -- category_name (str)
+            year_from: Start year (inclusive).
+            year_to: End year (inclusive).
+            export_format: "csv" or "ndjson".
+        """
+        category_id = dict_category.get("category_id")
+        period = self.get_year_range_by_category(dict_category) or {}
+        norm_year_from, norm_year_to = normalize_year_range_for_category(
+            year_from, year_to, int(period.get("year_from", 0)), int(period.get("year_to", 0))
+        )
+        batches = stream_from_mysql(repo.stream_films_by_category_in_year_range,
+                                    category_id, norm_year_from, norm_year_to)
+        return encode_export(batches, export_format)
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "get_year_range_by_category"))
     def get_year_range_by_category(self, dict_category: dict) -> list[dict]:
         """
         Get the available release year range for a selected category.
@@ -315,14 +870,15 @@ class FilmSearchService:
                 - year_to (int): maximum release year in the selected category
                 - category (str): category name
         """
-        conn = get_mysql_connection()
         category_id = dict_category.get("category_id")
-        try:
-            items = repo.get_year_range_by_category(conn, category_id)
-            return items
-        finally:
-            conn.close()
+        if self.categories is not None:
+            return self.categories.get_year_range(category_id)
+        if self.catalog is not None:
+            return self.catalog.get_year_range_by_category(category_id)
+
+        return run_mysql_read(repo.get_year_range_by_category, category_id)
 
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "list_all_categories"))
     def list_all_categories(self):
         """
         Get the full list of available film categories.
@@ -334,29 +890,103 @@ class FilmSearchService:
                 - category_id (int)
                 - category_name (str)
         """
+        if self.categories is not None:
+            return self.categories.list_categories()
 
-        conn = get_mysql_connection()
-        try:
-            return repo.list_categories(conn)
-        finally:
-            conn.close()
+        return run_mysql_read(repo.list_categories)
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "suggest_titles"))
+    def suggest_titles(self, prefix: str, limit: int = 10) -> list[dict]:
+        """
+        Get film title suggestions for a typed prefix.
+
+        Suggestions come from the in-memory title index (MySQL is only read to build it):
+        titles starting with the prefix first, then titles with a word starting with it.
 
+        Args:
+            prefix: Typed text (case-insensitive).
+            limit: Maximum number of suggestions.
+
+        Returns:
+            list[dict]: Suggested films, each item contains:
+                - film_id (int)
+                - title (str)
+        """
+        return self.titles.suggest(prefix, limit)
+
+    @timed(SERVICE_LATENCY.labels("FilmSearchService", "get_dict_category_by_name"))
     def get_dict_category_by_name(self, category_name):
-        conn = get_mysql_connection()
-        try:
-            dict_category = repo.get_category_by_category_name(conn, category_name)
-            return dict_category
-        finally:
-            conn.close()
+        """
+        Get a category by its name (case-insensitive).
+
+        Returns:
+            dict | None: Category info (category_id, category_name), or None if not found.
+        """
+        if self.categories is not None:
+            return self.categories.get_by_name(category_name)
+
+        return run_mysql_read(repo.get_category_by_category_name, category_name)
 
 
 class QueryLogService:
+    def ensure_indexes(self) -> None:
+        """
+        Create the MongoDB indexes used by the reports (no-op if they already exist).
+
+        Raises:
+            MongoConnectionError: If MongoDB connection fails.
+        """
+        global _report_indexes_ensured
+        db = get_mongo_db()
+        if query_rollup_enabled:
+            rollup = db.get_collection(name_rollup_collection)
+            rollup.create_index(repo_mogo.build_top_queries_rollup_sort(), name="count_last_seen")
+            rollup.create_index(repo_mogo.build_last_unique_rollup_sort(), name="last_seen")
+        else:
+            collection = db.get_collection(name_log_collection)
+            collection.create_index(repo_mogo.LAST_UNIQUE_QUERIES_INDEX, name="last_unique_queries")
+        _report_indexes_ensured = True
+
+    def _ensure_indexes_once(self) -> None:
+        """Create report indexes on the first report of the process (e.g. in the CLI)."""
+        if not _report_indexes_ensured:
+            self.ensure_indexes()
+
+    def rebuild_query_rollup(self) -> int:
+        """
+        Rebuild the query rollup collection from all logged search records.
+
+        Used as a one-off backfill for logs written before the rollup existed.
+
+        Returns:
+            int: Number of distinct queries in the rollup.
+        """
+        db = get_mongo_db()
+        collection = db.get_collection(name_log_collection)
+        timed_aggregate(collection, "aggregate_rollup_backfill", repo_mogo.build_rollup_backfill_pipeline())
+        return db.get_collection(name_rollup_collection).count_documents({})
+
+    def _get_top_queries_from_rollup(self, db, limit: int) -> list[dict]:
+        """Read top queries from the rollup in the same shape as `build_top_queries_pipeline` rows."""
+        rollup = db.get_collection(name_rollup_collection)
+        docs = timed_find(rollup, "find_top_queries_rollup", {},
+                          sort=repo_mogo.build_top_queries_rollup_sort(), limit=limit)
+        return [rollup_doc_to_top_query(doc) for doc in docs]
+
+    def _get_last_unique_queries_from_rollup(self, db, limit: int) -> list[dict]:
+        """Read the latest queries from the rollup in the same shape as `build_last_unique_queries_pipeline` rows."""
+        rollup = db.get_collection(name_rollup_collection)
+        docs = timed_find(rollup, "find_last_unique_queries_rollup", {},
+                          sort=repo_mogo.build_last_unique_rollup_sort(), limit=limit)
+        return [rollup_doc_to_last_query(doc) for doc in docs]
+
     def get_top_queries(self, limit: int = 5) -> list[dict]:
         """
         Get the most frequent search queries from MongoDB logs.
 
         This method builds an aggregated report based on logged search records and returns
-        a list of formatted report rows.
+        a list of formatted report rows. With `query_rollup_enabled` the report is an indexed
+        sort-limit over the pre-aggregated query rollup (results = latest results count).
 
         Args:
             limit: Maximum number of top queries to return (default: 5).
@@ -370,33 +1000,25 @@ class QueryLogService:
                 - results (int): total results count for the query (as stored in logs)
         """
 
+        self._ensure_indexes_once()
         db = get_mongo_db()
-        collection = db.get_collection(name_log_collection)
-        result = collection.aggregate(repo_mogo.build_top_queries_pipeline(limit))
-
-        res = list()
-        for i, item in enumerate(result, 1):
-            format_dict = defaultdict(str)
-            q_type = item.get('search_type')
-            format_dict["idx"] = str(i)
-            format_dict["type"] = q_type
-
-            text_query = get_text_query(item)
-            format_dict["query"] = text_query
+        if query_rollup_enabled:
+            result = self._get_top_queries_from_rollup(db, limit)
+        else:
+            collection = db.get_collection(name_log_collection)
+            result = timed_aggregate(collection, "aggregate_top_queries",
+                                     repo_mogo.build_top_queries_pipeline(limit))
 
-            format_dict["count"] = item.get('count_query')
-            format_dict["results"] = item.get('results_count')
-            res.append(dict(format_dict))
-
-        return res
+        return format_top_queries(result)
 
     def get_last_unique_queries(self, limit: int = 5) -> list[dict]:
         """
         Get the most recent unique search queries from MongoDB logs.
 
-        This method reads recent log records (sorted by timestamp descending) and returns
-        a list of distinct queries (based on the formatted query text). The search is limited
-        to a recent window (up to 200 latest records) to keep processing fast.
+        Queries are deduplicated by search type and query params, keeping the latest
+        occurrence. With `query_rollup_enabled` the report is an indexed sort-limit over the
+        query rollup (one document per query), so its cost does not grow with the log size;
+        otherwise the log records are grouped on the server.
 
         Args:
             limit: Maximum number of unique queries to return (default: 5).
@@ -409,37 +1031,16 @@ class QueryLogService:
                 - timestamp (str): formatted timestamp of the latest occurrence
                 - results (int): total results count for the query (as stored in logs)
         """
+        self._ensure_indexes_once()
         db = get_mongo_db()
-        collection = db.get_collection(name_log_collection)
-        result = collection.aggregate(repo_mogo.build_last_unique_queries_pipeline())
-
-        unique_queries = []
-        res = list()
-        idx = 0
-        for i, item in enumerate(result, 1):
-            format_dict = defaultdict(str)
-            q_type = item.get('search_type')
-
-            format_dict["type"] = q_type
-
-            text_query = get_text_query(item)
-
-            format_dict["query"] = text_query
-
-            format_date = get_format_date(item.get('timestamp'))
-            format_dict["timestamp"] = format_date
-            format_dict["results"] = item.get('results_count')
+        if query_rollup_enabled:
+            return format_last_unique_queries(self._get_last_unique_queries_from_rollup(db, limit))
 
-            if text_query not in unique_queries:
-                unique_queries.append(text_query)
-                idx += 1
-                format_dict["idx"] = str(i)
-                res.append(dict(format_dict))
-
-            if idx >= limit:
-                break
+        collection = db.get_collection(name_log_collection)
+        result = timed_aggregate(collection, "aggregate_last_unique_queries",
+                                 repo_mogo.build_last_unique_queries_pipeline(limit))
 
-        return res
+        return format_last_unique_queries(result)
 
 
 def log_search_query(search_type: str, params: dict) -> None:
@@ -447,7 +1048,8 @@ def log_search_query(search_type: str, params: dict) -> None:
     Write a search query log record to MongoDB.
 
     This function stores analytics data about search requests, including timestamp,
-    search type, and search parameters.
+    search type, and search parameters. With `query_log_async_enabled` the record is
+    queued for the background writer instead of being written inside the request.
 
     Args:
         search_type: Search action type (e.g., "keyword", "category_name", "category_year").
@@ -458,16 +1060,60 @@ def log_search_query(search_type: str, params: dict) -> None:
     rec["timestamp"] = datetime.now().isoformat()
     rec["search_type"] = search_type
     rec["params"] = params
+    if query_log_async_enabled:
+        get_query_log_writer().submit(rec)
+        return
+
     try:
         db = get_mongo_db()
         collection = db.get_collection(name_log_collection)
-        collection.insert_one(rec)
+        timed_write(collection, "insert_one_log", "insert_one", rec)
 
-    except PyMongoError as err:
+        if query_rollup_enabled:
+            query_filter, update = repo_mogo.build_rollup_update(search_type, params, rec["timestamp"])
+            timed_write(db.get_collection(name_rollup_collection), "update_one_rollup", "update_one",
+                        query_filter, update=update, upsert=True)
+
+    except pymongo_error() as err:
         # raise MongoLoggingError("Failed to write query log to MongoDB") from err
         pass
 
 
+def warmup_services() -> None:
+    """
+    Prepare shared service state before the first request.
+
+    Loads the in-memory film catalog (including its trigram title index) and the
+    category registry when they are enabled and the title autocomplete index, so the first
+    request does not pay the load cost, and makes sure the MongoDB report indexes exist
+    (reports keep working without MongoDB).
+
+    Warmup never fails: whatever cannot be loaded now (MySQL or MongoDB unreachable at
+    startup) is loaded lazily on first use.
+    """
+    try:
+        if catalog_engine_enabled:
+            get_film_catalog().snapshot()
+        if category_registry_enabled:
+            get_category_registry().list_categories()
+        get_title_suggester().index()
+    except (DatabaseConnectionError, mysql_error()):
+        pass
+    try:
+        QueryLogService().ensure_indexes()
+    except (pymongo_error(), MongoConnectionError):
+        pass
+
+
+def shutdown_services() -> None:
+    """
+    Release shared service state before the process exits.
+
+    Flushes queued search logs to MongoDB and stops the background log writer.
+    """
+    close_query_log_writer()
+
+
 if __name__ == '__main__':
     search = FilmSearchService()
     print('get_dict_category_by_name', search.get_dict_category_by_name("Action"))
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+from collections import Counter
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from app.core.metrics import Sample, registry
+
+_single_flight = None
+
+
+class _Call:
+    """In-flight sync execution shared by the callers of one key."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+def _search_type(key: Hashable) -> str:
+    """Metric label of a key: the search type of a service cache key ("keyword", "category"...)."""
+    if isinstance(key, tuple) and key and isinstance(key[0], str):
+        return key[0]
+    return "other"
+
+
+class SingleFlight:
+    """
+    Request coalescing for identical concurrent searches.
+
+    While a call for a key is running, other calls with the same key do not run
+    their own function: they wait for the running one and receive its result (or
+    its exception). Sync calls (`do`, worker threads) and async calls (`do_async`,
+    one event loop) are coalesced separately.
+
+    Results are shared between the callers, so they must not be modified in place.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[Hashable, asyncio.Future] = {}
+        self.executions: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run `fn` once for all concurrent sync calls with the same key.
+
+        Args:
+            key: Canonical key of the call (the service cache key).
+            fn: Function that does the work.
+
+        Returns:
+            Any: Result of `fn` (shared with the coalesced callers).
+        """
+        label = _search_type(key)
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.executions[label] += 1
+            else:
+                self.coalesced[label] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def do_async(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async counterpart of `do`: await `fn()` once for all concurrent calls with the same key.
+
+        The shared execution runs as a separate task, so cancelling the caller that
+        started it does not cancel it for the others.
+        """
+        label = _search_type(key)
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._tasks[key] = task
+            task.add_done_callback(lambda done: self._forget_task(key, done))
+            with self._lock:
+                self.executions[label] += 1
+        else:
+            with self._lock:
+                self.coalesced[label] += 1
+        return await asyncio.shield(task)
+
+    def _forget_task(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+        if not task.cancelled():
+            task.exception()  # retrieved even if every caller was cancelled
+
+    def stats(self) -> dict:
+        """
+        Get coalescing statistics.
+
+        Returns:
+            dict: executions and coalesced calls per search type, and their totals.
+        """
+        with self._lock:
+            executions = sum(self.executions.values())
+            coalesced = sum(self.coalesced.values())
+            return {
+                "executions": executions,
+                "coalesced": coalesced,
+                "coalesced_ratio": coalesced / (executions + coalesced) if executions + coalesced else 0.0,
+                "executions_by_type": dict(self.executions),
+                "coalesced_by_type": dict(self.coalesced),
+                "in_flight": len(self._calls) + len(self._tasks),
+            }
+
+
+@registry.register_collector
+def collect_single_flight_stats() -> list[Sample]:
+    """Export the search coalescing counters (if single-flight was used)."""
+    if _single_flight is None:
+        return []
+    stats = _single_flight.stats()
+    samples = [
+        Sample("search_single_flight_in_flight", "gauge", "Searches currently executing under single-flight", {},
+               stats["in_flight"]),
+    ]
+    for search_type, count in stats["executions_by_type"].items():
+        samples.append(Sample("search_single_flight_executions_total", "counter",
+                              "Searches executed (single-flight leaders)", {"search_type": search_type}, count))
+    for search_type, count in stats["coalesced_by_type"].items():
+        samples.append(Sample("search_single_flight_coalesced_total", "counter",
+                              "Searches that shared an identical in-flight execution",
+                              {"search_type": search_type}, count))
+    return samples
+
+
+def get_search_single_flight() -> SingleFlight:
+    """
+    Get (or create) the global single-flight group shared by all service instances.
+
+    Returns:
+        SingleFlight: Single-flight instance.
+    """
+    global _single_flight
+    if _single_flight is None:
+        _single_flight = SingleFlight()
+    return _single_flight
@@ -0,0 +1,150 @@
+import threading
+from bisect import bisect_left
+from typing import Optional
+
+from app.core.catalog_version import get_catalog_version
+from app.core.db.connection import run_mysql_read
+from app.core.repositories import films_mysql_repo as repo
+
+_title_suggester = None
+
+
+class TitleIndex:
+    """
+    Sorted title arrays for prefix autocomplete.
+
+    `keys` holds lowercased titles in sorted order, so all titles with a prefix form
+    one contiguous run found with `bisect`. A second sorted array holds every title
+    from each later word on ("MATRIX HUNCHBACK" -> "hunchback"), so a prefix also
+    matches the start of any word. Lookups cost O(log n + limit); an index is never
+    modified after it was built.
+    """
+
+    def __init__(self, films: list[dict]):
+        """
+        Args:
+            films: Rows from `films_mysql_repo.list_film_titles`.
+        """
+        titles = sorted((film["title"].lower(), film["title"], int(film["film_id"])) for film in films)
+        self.keys = [key for key, _, _ in titles]
+        self.titles = [(film_id, title) for _, title, film_id in titles]
+
+        words = []
+        for key, title, film_id in titles:
+            start = key.find(" ")
+            while start != -1:
+                words.append((key[start + 1:], film_id, title))
+                start = key.find(" ", start + 1)
+        words.sort()
+        self.word_keys = [key for key, _, _ in words]
+        self.word_titles = [(film_id, title) for _, film_id, title in words]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        """
+        Get films whose title starts with the prefix, then films with a later word starting with it.
+
+        Args:
+            prefix: Typed text (case-insensitive, surrounding spaces ignored).
+            limit: Maximum number of suggestions.
+
+        Returns:
+            list[dict]: Up to `limit` films: title-prefix matches first (in title order), then
+                word matches (in order of the matching word), each item contains:
+                - film_id (int)
+                - title (str)
+        """
+        prefix = prefix.strip().lower()
+        if not prefix or limit <= 0:
+            return []
+
+        found: dict[int, str] = {}
+        for keys, titles in ((self.keys, self.titles), (self.word_keys, self.word_titles)):
+            i = bisect_left(keys, prefix)
+            while i < len(keys) and len(found) < limit and keys[i].startswith(prefix):
+                film_id, title = titles[i]
+                found.setdefault(film_id, title)
+                i += 1
+        return [{"film_id": film_id, "title": title} for film_id, title in found.items()]
+
+
+class TitleSuggester:
+    """
+    Process-wide title autocomplete.
+
+    Film titles are loaded from MySQL once (on first use) and answered from a
+    `TitleIndex`. Lookups never read MySQL afterwards: the index is rebuilt only by the
+    catalog version listener (see `CatalogVersion.add_listener`) or on demand.
+    """
+
+    def __init__(self):
+        self._index: Optional[TitleIndex] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        """
+        Load (or reload) film titles from MySQL.
+
+        Raises:
+            DatabaseConnectionError: If a MySQL connection cannot be obtained.
+        """
+        self.load_rows(run_mysql_read(repo.list_film_titles))
+
+    def load_rows(self, films: list[dict]) -> None:
+        """
+        Build the index from already fetched rows.
+
+        Args:
+            films: Rows from `films_mysql_repo.list_film_titles`.
+        """
+        self._index = TitleIndex(films)
+
+    def refresh(self) -> None:
+        """Reload the titles from MySQL on demand."""
+        with self._lock:
+            self.load()
+
+    def on_catalog_change(self, version: str) -> None:
+        """Rebuild a loaded index before a new catalog version is published (see `CatalogVersion`)."""
+        if self._index is not None:
+            with self._lock:
+                self.load()
+
+    def is_stale(self) -> bool:
+        """Check whether the titles have to be loaded from MySQL before the next lookup (only before the first one)."""
+        return self._index is None
+
+    def index(self) -> TitleIndex:
+        """Get the current index, loading it on first use."""
+        if self.is_stale():
+            with self._lock:
+                if self.is_stale():
+                    self.load()
+        return self._index
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[dict]:
+        """
+        Get title suggestions for a prefix (see `TitleIndex.suggest`).
+
+        Only the first call reads MySQL; lookups are served from memory.
+        """
+        return self.index().suggest(prefix, limit)
+
+
+def get_title_suggester() -> TitleSuggester:
+    """
+    Get (or create) the global title autocomplete index.
+
+    The index is created only once; it is loaded from MySQL lazily on first use
+    and rebuilt when the catalog version changes.
+
+    Returns:
+        TitleSuggester: Title suggester instance.
+    """
+    global _title_suggester
+    if _title_suggester is None:
+        _title_suggester = TitleSuggester()
+        get_catalog_version().add_listener(_title_suggester.on_catalog_change)
+    return _title_suggester
@@ -0,0 +1,202 @@
+import re
+from typing import Callable, Optional
+
+TRIGRAM_SIZE = 3
+
+LIKE_WILDCARDS = "%_\\"
+
+
+def split_like_pattern(keyword: str) -> list[str]:
+    """
+    Split a LIKE keyword into literal segments separated by wildcards.
+
+    `%` and `_` are treated as wildcards and `\\` escapes the next character,
+    the same way MySQL parses LIKE patterns.
+
+    Args:
+        keyword: Keyword as entered by the user.
+
+    Returns:
+        list[str]: Literal segments in pattern order (may contain empty strings).
+    """
+    segments = [""]
+    escaped = False
+    for ch in keyword:
+        if escaped:
+            segments[-1] += ch
+            escaped = False
+        elif ch == "\\":
+            escaped = True
+        elif ch in "%_":
+            segments.append(ch)
+            segments.append("")
+        else:
+            segments[-1] += ch
+    if escaped:
+        segments[-1] += "\\"
+    return segments
+
+
+def like_matcher(keyword: str) -> Callable[[str], bool]:
+    """
+    Build a predicate with the same semantics as `LOWER(title) LIKE LOWER('%keyword%')`.
+
+    Plain keywords are matched as a substring. If the keyword contains LIKE
+    wildcards (`%`, `_`) or escapes (`\\`), it is translated into a regular expression.
+
+    Args:
+        keyword: Keyword as entered by the user.
+
+    Returns:
+        Callable[[str], bool]: Predicate that receives a lower-cased title.
+    """
+    kw = keyword.lower()
+    if not any(ch in kw for ch in LIKE_WILDCARDS):
+        return lambda title: kw in title
+
+    parts = []
+    for segment in split_like_pattern(kw):
+        if segment == "%":
+            parts.append(".*")
+        elif segment == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(segment))
+    pattern = re.compile("".join(parts), re.DOTALL)
+    return lambda title: pattern.search(title) is not None
+
+
+def get_trigrams(text: str) -> set[str]:
+    """Get all distinct trigrams of a lower-cased text."""
+    return {text[i:i + TRIGRAM_SIZE] for i in range(len(text) - TRIGRAM_SIZE + 1)}
+
+
+def get_keyword_trigrams(keyword: str) -> set[str]:
+    """
+    Get trigrams that every title matching the keyword must contain.
+
+    Only literal segments of the LIKE pattern are used, so wildcards never
+    produce false negatives.
+    """
+    trigrams = set()
+    for segment in split_like_pattern(keyword.lower()):
+        if segment not in ("%", "_"):
+            trigrams |= get_trigrams(segment)
+    return trigrams
+
+
+class TrigramIndex:
+    """
+    Trigram inverted index over lower-cased film titles.
+
+    Maps every trigram to the set of film ids whose title contains it. An index
+    is never modified in place: `updated` returns a new index that shares all
+    unchanged posting sets with the old one, so readers of the old index are
+    never affected by a refresh.
+    """
+
+    def __init__(self, titles: Optional[dict[int, str]] = None,
+                 postings: Optional[dict[str, frozenset]] = None):
+        """
+        Args:
+            titles: Lower-cased titles by film id.
+            postings: Film id sets by trigram.
+        """
+        self.titles = titles or {}
+        self.postings = postings or {}
+
+    @classmethod
+    def build(cls, titles: dict[int, str]) -> "TrigramIndex":
+        """
+        Build an index from scratch.
+
+        Args:
+            titles: Film titles by film id (any case).
+
+        Returns:
+            TrigramIndex: New index.
+        """
+        return cls().updated(titles)
+
+    def updated(self, titles: dict[int, str]) -> "TrigramIndex":
+        """
+        Build a new index for the given titles, reusing this one incrementally.
+
+        Only films that were added, removed or renamed since this index was built
+        touch the posting sets.
+
+        Args:
+            titles: Film titles by film id (any case).
+
+        Returns:
+            TrigramIndex: New index.
+        """
+        new_titles = {film_id: title.lower() for film_id, title in titles.items()}
+        added: dict[str, set] = {}
+        removed: dict[str, set] = {}
+
+        for film_id, old_title in self.titles.items():
+            new_title = new_titles.get(film_id)
+            if new_title == old_title:
+                continue
+            for trigram in get_trigrams(old_title):
+                removed.setdefault(trigram, set()).add(film_id)
+
+        for film_id, new_title in new_titles.items():
+            old_title = self.titles.get(film_id)
+            if old_title == new_title:
+                continue
+            for trigram in get_trigrams(new_title):
+                added.setdefault(trigram, set()).add(film_id)
+
+        postings = dict(self.postings)
+        for trigram in removed.keys() | added.keys():
+            film_ids = (postings.get(trigram, frozenset()) - removed.get(trigram, set())) | added.get(trigram, set())
+            if film_ids:
+                postings[trigram] = frozenset(film_ids)
+            else:
+                postings.pop(trigram, None)
+
+        return TrigramIndex(new_titles, postings)
+
+    def candidates(self, keyword: str) -> Optional[set]:
+        """
+        Get candidate film ids for a keyword.
+
+        Args:
+            keyword: Keyword as entered by the user (LIKE syntax).
+
+        Returns:
+            set | None: Film ids whose titles contain all keyword trigrams, or None
+                if the keyword is too short to use the index.
+        """
+        trigrams = get_keyword_trigrams(keyword)
+        if not trigrams:
+            return None
+
+        lists = sorted((self.postings.get(t, frozenset()) for t in trigrams), key=len)
+        result = set(lists[0])
+        for film_ids in lists[1:]:
+            if not result:
+                break
+            result &= film_ids
+        return result
+
+    def search(self, keyword: str) -> list[int]:
+        """
+        Get sorted ids of films whose titles match the keyword.
+
+        Candidates from the index are verified against the title, so the result is
+        exactly the same as `LOWER(title) LIKE LOWER('%keyword%')`.
+
+        Args:
+            keyword: Keyword as entered by the user (LIKE syntax).
+
+        Returns:
+            list[int]: Matching film ids in ascending order.
+        """
+        match = like_matcher(keyword)
+        film_ids = self.candidates(keyword)
+        if film_ids is None:
+            film_ids = self.titles.keys()
+        return sorted(film_id for film_id in film_ids if match(self.titles[film_id]))
@@ -0,0 +1,79 @@
+# In-memory catalog engine: serve film searches from an in-process copy of
+# film/film_category/category instead of querying MySQL on every request.
+catalog_engine_enabled = False
+catalog_refresh_seconds = 600
+
+# Fetch a search page and its total count with a single window-function query
+# (MySQL 8.0+). Falls back to separate search and COUNT queries on older servers.
+window_count_enabled = True
+
+# Search result cache shared by all FilmSearchService instances (TTL + LRU).
+result_cache_enabled = True
+result_cache_ttl_seconds = 60
+result_cache_max_entries = 1024
+result_cache_max_bytes = 8 * 1024 * 1024
+
+# Single-flight: concurrent identical searches (same cache key) share one execution
+# instead of each running the same search and COUNT against MySQL.
+single_flight_enabled = True
+
+# Process-wide category dictionary (id <-> name, per-category year range).
+category_registry_enabled = True
+category_registry_refresh_seconds = 600
+
+# Background query log writer: search logs are queued and written to MongoDB
+# in insert_many batches by a worker thread instead of inside the request.
+query_log_async_enabled = True
+query_log_queue_size = 10000
+query_log_batch_size = 100
+query_log_flush_seconds = 1.0
+query_log_full_policy = "drop_oldest"  # or "block"
+query_log_block_timeout_seconds = 0.5  # "block": max wait for free space, then the record is dropped
+
+# Maintain pre-aggregated per-query counters (rollup collection) for the top-queries report.
+query_rollup_enabled = True
+
+# Async MySQL pool used by the FastAPI interface (separate from the sync CLI pool).
+async_mysql_pool_minsize = 1
+async_mysql_pool_maxsize = 50
+
+# Batch search (FilmSearchService.search_many, /api/v1/search/batch): unique queries of a
+# batch run concurrently on at most this many connections (threads or async tasks).
+search_many_max_workers = 8
+
+# Full result set export: rows are streamed from an unbuffered MySQL cursor in batches of this size.
+export_batch_size = 500
+
+# Catalog version (latest last_update of film/film_category/category) used for HTTP
+# ETags; re-read from MySQL at most once per this number of seconds.
+catalog_version_refresh_seconds = 30
+
+# Sync MySQL connection pool: `mysql_pool_size` connections are kept open, up to
+# `mysql_pool_max_overflow` more are opened under load. When all are in use, callers
+# wait in FIFO order up to `mysql_pool_acquire_timeout` seconds. Connections held
+# longer than `mysql_pool_leak_seconds` are reported as leaked.
+mysql_pool_size = 20
+mysql_pool_max_overflow = 10
+mysql_pool_acquire_timeout = 5.0
+mysql_pool_leak_seconds = 60.0
+mysql_pool_trace_checkouts = False
+
+# Read replicas (`replica_dbconfigs` in local_settings: name -> connection config).
+# Repository reads go to a healthy replica, chosen "round_robin" or "least_outstanding";
+# a replica is ejected after `mysql_replica_max_failures` failed connections in a row and
+# re-admitted after `mysql_replica_readmit_successes` passed health checks in a row.
+mysql_replicas_enabled = True
+mysql_replica_selection = "least_outstanding"
+mysql_replica_pool_size = 10
+mysql_replica_max_failures = 3
+mysql_replica_readmit_successes = 2
+mysql_replica_health_check_seconds = 5.0
+mysql_replica_fallback_to_primary = True
+
+# Slow-query log: MySQL statements and MongoDB aggregations slower than the threshold
+# are written as JSON lines to a rotating log file.
+slow_query_log_enabled = True
+slow_query_threshold_ms = 200
+slow_query_log_path = "logs/slow_queries.log"
+slow_query_log_max_bytes = 5 * 1024 * 1024
+slow_query_log_backup_count = 5
@@ -0,0 +1,15 @@
+from app.core.services import QueryLogService
+
+
+def main():
+    """Rebuild the top-queries rollup collection from all existing search logs."""
+    qs = QueryLogService()
+    qs.ensure_indexes()
+    total = qs.rebuild_query_rollup()
+    print(f"Query rollup rebuilt: {total} distinct queries.")
+
+
+if __name__ == '__main__':
+    main()
+
+# python -m app.interfaces.cli.backfill_query_rollup
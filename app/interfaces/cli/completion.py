@@ -0,0 +1,53 @@
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from app.core.services import FilmSearchService
+from app.interfaces.cli.user_settings import title_completion_limit
+
+try:
+    import readline
+except ImportError:  # e.g. Windows without pyreadline
+    readline = None
+
+
+def make_title_completer(service: FilmSearchService, limit: int = title_completion_limit) -> Callable:
+    """
+    Build a readline completer that suggests film titles for the typed line.
+
+    Suggestions come from the same in-memory title index as `/api/v1/suggest`,
+    computed once per typed text (readline calls the completer with state 0, 1, ...).
+    """
+    cached: dict[str, list[str]] = {}
+
+    def complete(text: str, state: int) -> Optional[str]:
+        if state == 0:
+            cached.clear()
+            cached[text] = [item["title"] for item in service.suggest_titles(text, limit)]
+        matches = cached.get(text, [])
+        return matches[state] if state < len(matches) else None
+
+    return complete
+
+
+@contextmanager
+def title_completion(service: FilmSearchService) -> Iterator[None]:
+    """
+    Enable Tab completion of film titles for the `input()` calls inside the block.
+
+    The whole line is completed (titles contain spaces); the previous completer is
+    restored on exit. Does nothing when the `readline` module is not available.
+    """
+    if readline is None:
+        yield
+        return
+
+    previous_completer = readline.get_completer()
+    previous_delims = readline.get_completer_delims()
+    readline.set_completer(make_title_completer(service))
+    readline.set_completer_delims("")
+    readline.parse_and_bind("tab: complete")
+    try:
+        yield
+    finally:
+        readline.set_completer(previous_completer)
+        readline.set_completer_delims(previous_delims)
@@ -0,0 +1,48 @@
+import argparse
+import sys
+
+from app.core.services import FilmSearchService
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Export all films matching a search to CSV or NDJSON.")
+    query = parser.add_mutually_exclusive_group(required=True)
+    query.add_argument("--keyword", help="keyword in the film title")
+    query.add_argument("--genre", help="genre name")
+    parser.add_argument("--year-from", type=int, help="start year (with --genre)")
+    parser.add_argument("--year-to", type=int, help="end year (with --genre)")
+    parser.add_argument("--format", choices=("csv", "ndjson"), default="csv")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Stream a full search result to a file or stdout without loading it into memory."""
+    args = parse_args(argv)
+    service = FilmSearchService()
+
+    if args.keyword:
+        chunks = service.export_by_keyword(args.keyword, args.format)
+    else:
+        dict_category = service.get_dict_category_by_name(args.genre)
+        if dict_category is None:
+            sys.exit(f"Genre not found: {args.genre}")
+        if args.year_from is None and args.year_to is None:
+            chunks = service.export_by_category(dict_category, args.format)
+        else:
+            chunks = service.export_by_category_year(dict_category, args.year_from, args.year_to, args.format)
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+
+if __name__ == '__main__':
+    main()
+
+# python -m app.interfaces.cli.export_films --genre Action --year-from 2005 --year-to 2010 -o action.csv
+# python -m app.interfaces.cli.export_films --keyword love --format ndjson
@@ -1,8 +1,16 @@
 from typing import Optional, Callable, Any
 
 from app.core.services import FilmSearchService, QueryLogService
-from app.interfaces.cli.user_settings import msg, page_size
+from app.interfaces.cli.user_settings import (
+    msg,
+    page_size,
+    prefetch_enabled,
+    prefetch_prev_page,
+    title_completion_enabled,
+)
 from app.interfaces.cli import formatters
+from app.interfaces.cli.completion import title_completion
+from app.interfaces.cli.prefetch import PagePrefetcher
 from app.interfaces.cli.utils import clear_screen
 
 utils_clear_screen = clear_screen
@@ -13,7 +21,11 @@ def search_film_by_keyword() -> None:
     Search films by keyword using interactive pagination.
 
     """
-    user_input = input(msg.menu_keyword).strip()
+    if title_completion_enabled:
+        with title_completion(fs_service):
+            user_input = input(msg.menu_keyword).strip()
+    else:
+        user_input = input(msg.menu_keyword).strip()
     header_text = msg.films_by_keyword_header.format(keyword=user_input)
     render_page = formatters.print_films
     paginate(fs_service.search_by_keyword, render_page, header_text=header_text, keyword=user_input)
@@ -61,7 +73,7 @@ def search_film_by_category() -> None:
     header_text = msg.films_by_category_header.format(category_name=dict_category.get('category_name', '...'))
 
     render_page = formatters.print_films
-    paginate(fs_service.search_by_category, render_page, header_text, dict_category=dict_category)
+    paginate(fs_service.search_by_category, render_page, header_text, dict_category=dict_category, keyset=True)
 
 
 def normalize_year_range_input(period: dict[str, Any], year_1: str, year_2: str) -> tuple[int, int]:
@@ -147,7 +159,7 @@ def search_film_by_category_year():
     render_page = formatters.print_films
 
     paginate(fs_service.search_by_category_year, render_page, header_text,
-             dict_category=dict_category, year_from=year_from, year_to=year_to)
+             dict_category=dict_category, year_from=year_from, year_to=year_to, keyset=True)
 
 
 
@@ -191,6 +203,20 @@ def apply_pagination_command(is_first_page: bool, page: int, pages: int) -> tupl
     return page, error_msg
 
 
+def get_page_cursor(result: dict, current_page: int, page: int) -> Optional[str]:
+    """
+    Get the keyset continuation token to request `page` after `current_page`.
+
+    Returns:
+        str | None: Token for the adjacent page, or None if the page has to be located by number.
+    """
+    if page == current_page + 1:
+        return result.get('next_token')
+    if page == current_page - 1:
+        return result.get('prev_token')
+    return None
+
+
 def paginate(fetch_page_fn: Callable[..., dict],
              render_page: Callable[[list[dict], int], None],
              header_text: Optional[str] = None,
@@ -216,16 +242,49 @@ def paginate(fetch_page_fn: Callable[..., dict],
                 - items: list of result items
                 - start_i: start index for numbering (1-based)
         header_text: Optional text printed above the page results.
-        **kwargs: Extra parameters passed to `fetch_page_fn`.
+        **kwargs: Extra parameters passed to `fetch_page_fn`. With `keyset=True` the next/previous
+            pages are requested with the `next_token`/`prev_token` of the current page.
+
+    With `prefetch_enabled` the next page (and with `prefetch_prev_page` the previous one) is
+    fetched in the background while the current page is shown; prefetches are not logged and
+    are cancelled when the user leaves the paginator.
 
     Returns:
         None
     """
+    kwargs['page_size'] = page_size
+
+    prefetcher = PagePrefetcher(fetch_page_fn) if prefetch_enabled else None
+    try:
+        _pagination_loop(fetch_page_fn, render_page, header_text, prefetcher, kwargs)
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+
+
+def schedule_adjacent_pages(prefetcher: PagePrefetcher, result: dict, page: int, pages: int,
+                            kwargs: dict[str, Any]) -> None:
+    """Start prefetching the pages the user is likely to open next."""
+    adjacent = [page + 1, page - 1] if prefetch_prev_page else [page + 1]
+    for adjacent_page in adjacent:
+        if not 1 <= adjacent_page <= pages:
+            continue
+        page_kwargs = {**kwargs, 'page': adjacent_page}
+        if kwargs.get('keyset'):
+            page_kwargs['cursor'] = get_page_cursor(result, page, adjacent_page)
+        prefetcher.schedule((adjacent_page, page_kwargs.get('cursor')), **page_kwargs)
+
+
+def _pagination_loop(fetch_page_fn: Callable[..., dict],
+                     render_page: Callable[[list[dict], int], None],
+                     header_text: Optional[str],
+                     prefetcher: Optional[PagePrefetcher],
+                     kwargs: dict[str, Any]) -> None:
     pages = 1
     page = last_valid_page = 1
-    kwargs['page_size'] = page_size
 
     is_first_page = True
+    result = {}
     while True:
         print("*" * 50, "\n")
         page, error_msg = apply_pagination_command(is_first_page, page, pages)
@@ -240,7 +299,12 @@ def paginate(fetch_page_fn: Callable[..., dict],
             if header_text:
                 print(header_text)
             kwargs['page'] = page
-            result = fetch_page_fn(log=is_first_page, **kwargs)
+            if kwargs.get('keyset'):
+                kwargs['cursor'] = get_page_cursor(result, last_valid_page, page)
+            prefetched = None
+            if prefetcher is not None and not is_first_page:
+                prefetched = prefetcher.take((page, kwargs.get('cursor')))
+            result = prefetched or fetch_page_fn(log=is_first_page, **kwargs)
             items = result.get('items')
             if items:
                 start_i = page * page_size - page_size + 1
@@ -256,6 +320,8 @@ def paginate(fetch_page_fn: Callable[..., dict],
             if result['pages'] == 1:
                 input(msg.press_enter_to_return_to_menu)
                 break
+            if prefetcher is not None:
+                schedule_adjacent_pages(prefetcher, result, page, pages, kwargs)
         else:
             print(msg.invalid_page_number.format(page=page, pages=pages))
             page = last_valid_page
@@ -1,3 +1,4 @@
+from app.core.services import shutdown_services
 from app.interfaces.cli.utils import clear_screen
 from app.interfaces.cli.user_settings import msg
 from app.interfaces.cli import handlers
@@ -11,6 +12,7 @@ def main():
         clear_screen()
         print("*" * 50, "\n")
         if user_choice == '0':
+            shutdown_services()
             break
         elif user_choice == '1':
             handlers.search_film_by_keyword()
@@ -0,0 +1,60 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+
+
+class PagePrefetcher:
+    """
+    Fetches adjacent result pages on background threads while the user reads the current one.
+
+    Prefetch calls always pass `log=False`, so they never write search query logs.
+    """
+
+    def __init__(self, fetch_page_fn: Callable[..., dict], max_workers: int = 2):
+        """
+        Args:
+            fetch_page_fn: Paginated search function (see `handlers.paginate`).
+            max_workers: Maximum number of pages fetched at the same time.
+        """
+        self.fetch_page_fn = fetch_page_fn
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cli-prefetch")
+        self._futures: dict[Hashable, Future] = {}
+
+    def schedule(self, key: Hashable, **kwargs: Any) -> None:
+        """
+        Start fetching a page unless it is already being fetched.
+
+        Args:
+            key: Identifies the request, e.g. (page, cursor).
+            **kwargs: Parameters passed to `fetch_page_fn`.
+        """
+        if key not in self._futures:
+            self._futures[key] = self._executor.submit(self.fetch_page_fn, log=False, **kwargs)
+
+    def take(self, key: Hashable) -> Optional[dict]:
+        """
+        Get a prefetched page and cancel all other prefetches.
+
+        Waits if the page is still being fetched.
+
+        Returns:
+            dict | None: Page result, or None if the page was not prefetched or the prefetch failed.
+        """
+        future = self._futures.pop(key, None)
+        self._cancel_pending()
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception:
+            # the caller fetches the page again in the foreground, which reports the error
+            return None
+
+    def close(self) -> None:
+        """Cancel pending prefetches and release the worker threads without waiting for running ones."""
+        self._cancel_pending()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _cancel_pending(self) -> None:
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
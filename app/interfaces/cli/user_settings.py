@@ -1,4 +1,13 @@
 from app.interfaces.cli import messages
 
 msg = messages.RuCliMessages()
-page_size = 10
\ No newline at end of file
+page_size = 10
+
+# Fetch the next page (and optionally the previous one) in the background while
+# the current page is shown.
+prefetch_enabled = True
+prefetch_prev_page = False
+
+# Tab completion of film titles at the keyword prompt (needs the readline module).
+title_completion_enabled = True
+title_completion_limit = 20
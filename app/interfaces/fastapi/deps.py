@@ -1,5 +1,6 @@
 from functools import lru_cache
 
+from app.core.async_services import AsyncFilmSearchService, AsyncQueryLogService
 from app.core.services import FilmSearchService
 from app.core.services import QueryLogService
 
@@ -14,3 +15,13 @@ def get_film_service():
 def get_log_service():
     q_service =QueryLogService()
     return q_service
+
+
+@lru_cache
+def get_async_film_service():
+    return AsyncFilmSearchService()
+
+
+@lru_cache
+def get_async_log_service():
+    return AsyncQueryLogService()
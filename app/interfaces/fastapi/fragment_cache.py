@@ -0,0 +1,84 @@
+"""
+Rendered-fragment cache for Jinja templates.
+
+Catalog pages are rendered from a context that only depends on the request URL and
+the catalog data, so identical requests produce byte-identical HTML. The rendered
+body is cached under (template name, request path and query, context hash, catalog
+version); a new catalog version makes the old entries unreachable and they age out
+of the LRU.
+"""
+import hashlib
+
+import orjson
+from fastapi import Request
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from app.core.cache import ResultCache, cache_stats_samples
+from app.core.metrics import Sample, registry
+from .http_cache import current_catalog_version
+from .user_settings import (
+    fragment_cache_enabled,
+    fragment_cache_ttl_seconds,
+    fragment_cache_max_entries,
+    fragment_cache_max_bytes,
+    jinja_bytecode_cache_dir,
+)
+
+fragment_cache = ResultCache(
+    ttl_seconds=fragment_cache_ttl_seconds,
+    max_entries=fragment_cache_max_entries,
+    max_bytes=fragment_cache_max_bytes,
+)
+
+TEMPLATE_RENDER_LATENCY = registry.histogram(
+    "template_render_seconds", "Jinja template rendering latency", ("template",))
+
+
+@registry.register_collector
+def collect_fragment_cache_stats() -> list[Sample]:
+    return cache_stats_samples("fragment", fragment_cache.stats()) if fragment_cache_enabled else []
+
+
+def enable_bytecode_cache(templates: Jinja2Templates) -> None:
+    """Store compiled templates on disk so worker cold starts do not recompile them."""
+    if jinja_bytecode_cache_dir == "":
+        return
+    templates.env.bytecode_cache = FileSystemBytecodeCache(jinja_bytecode_cache_dir)
+
+
+def context_hash(context: dict) -> str:
+    """Stable hash of a template context without `request`."""
+    data = {k: v for k, v in context.items() if k != "request"}
+    payload = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+async def cached_template_response(templates: Jinja2Templates, request: Request, name: str,
+                                   context: dict) -> HTMLResponse:
+    """
+    Drop-in replacement of `templates.TemplateResponse` for catalog pages.
+
+    Args:
+        templates: Templates environment.
+        request: Current request (templates build pagination links from its URL).
+        name: Template name.
+        context: Template context; `request` is added if missing.
+
+    Returns:
+        HTMLResponse: Rendered page, served from the fragment cache when possible.
+    """
+    context = {**context, "request": request}
+    version = await current_catalog_version() if fragment_cache_enabled else None
+    if version is None:
+        with TEMPLATE_RENDER_LATENCY.labels(name).time():
+            return templates.TemplateResponse(name, context)
+
+    key = (name, request.url.path, request.url.query, context_hash(context), version)
+    body = fragment_cache.get(key)
+    if body is None:
+        with TEMPLATE_RENDER_LATENCY.labels(name).time():
+            body = templates.get_template(name).render(context).encode("utf-8")
+        fragment_cache.set(key, body)
+    return HTMLResponse(body)
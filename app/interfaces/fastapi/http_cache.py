@@ -0,0 +1,153 @@
+"""
+HTTP conditional caching for catalog pages.
+
+Catalog pages (genres and searches, HTML and JSON) get a weak ETag built from the
+catalog version and the request URL. A request whose If-None-Match matches gets a 304
+before the route runs, so neither MySQL nor the templates are touched.
+Search pages write the query logs (statistics), so they are `private, no-cache` and
+every view is revalidated. Pages the routes do not log (pages after the first, cursor
+pages) get the 304 right away. For a logged first page the search logs written by the
+route are kept by ETag (same URL and catalog version, so the same results count); a
+matching revalidation writes them again and gets the 304 without running the route.
+Only when they are not known (e.g. evicted) the route runs and the body is dropped.
+Statistics pages only get a short max-age.
+"""
+import asyncio
+import hashlib
+
+from fastapi import Request, Response
+
+from app.core.async_services import log_search_query_async, record_search_logs
+from app.core.cache import ResultCache
+from app.core.catalog_version import get_catalog_version
+from app.core.db.pool import mysql_error
+from app.core.exceptions import DatabaseConnectionError
+from .user_settings import (
+    catalog_max_age,
+    statistics_max_age,
+    search_log_cache_ttl_seconds,
+    search_log_cache_max_entries,
+)
+
+CATALOG_PATHS = (
+    "/genres",
+    "/search/keyword",
+    "/search/genre_year",
+    "/api/v1/genres",
+    "/api/v1/search/keyword",
+    "/api/v1/search/genre_year",
+)
+# catalog pages whose route writes the search query logs: searches and single genre pages
+SEARCH_PATHS = (
+    "/search/keyword",
+    "/search/genre_year",
+    "/api/v1/search/keyword",
+    "/api/v1/search/genre_year",
+)
+GENRE_PAGE_PREFIXES = ("/genres/", "/api/v1/genres/")
+STATISTICS_PATHS = ("/statistics", "/api/v1/statistics")
+SEARCH_CACHE_CONTROL = "private, no-cache"
+
+# ETag -> (search_type, params) of the search logs written by the route for that page
+search_logs_by_etag = ResultCache(ttl_seconds=search_log_cache_ttl_seconds,
+                                  max_entries=search_log_cache_max_entries)
+
+
+def _matches(path: str, prefixes: tuple[str, ...]) -> bool:
+    return any(path == prefix or path.startswith(prefix + "/") for prefix in prefixes)
+
+
+def _is_logged_search(path: str) -> bool:
+    return path.startswith(GENRE_PAGE_PREFIXES) or _matches(path, SEARCH_PATHS)
+
+
+def _may_log(request: Request) -> bool:
+    """False for search pages the routes never log: pages after the first and cursor pages."""
+    query = request.query_params
+    if "cursor" in query:
+        return False
+    try:
+        return int(query.get("page", 1)) == 1
+    except ValueError:
+        return True
+
+
+def build_etag(version: str, request: Request) -> str:
+    """Build a weak ETag from the catalog version and the request path and query."""
+    key = f"{version}|{request.url.path}?{request.url.query}"
+    return f'W/"{hashlib.blake2b(key.encode(), digest_size=12).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+async def current_catalog_version() -> str | None:
+    """
+    Get the catalog version; a re-read from MySQL runs in a worker thread.
+
+    Returns None (no ETag handling, no fragment caching) when the version cannot be read.
+    """
+    tracker = get_catalog_version()
+    try:
+        if tracker.is_stale():
+            return await asyncio.to_thread(tracker.get)
+        return tracker.get()
+    except (DatabaseConnectionError, mysql_error()):
+        return None
+
+
+async def http_cache_middleware(request: Request, call_next):
+    if request.method not in ("GET", "HEAD"):
+        return await call_next(request)
+
+    path = request.url.path
+    if _matches(path, STATISTICS_PATHS):
+        response = await call_next(request)
+        if response.status_code == 200:
+            response.headers["Cache-Control"] = f"public, max-age={statistics_max_age}"
+        return response
+
+    if not _matches(path, CATALOG_PATHS):
+        return await call_next(request)
+
+    version = await current_catalog_version()
+    if version is None:
+        return await call_next(request)
+
+    etag = build_etag(version, request)
+    not_modified = etag_matches(request.headers.get("if-none-match"), etag)
+    if not _is_logged_search(path):
+        cache_control = f"public, max-age={catalog_max_age}"
+        if not_modified:
+            return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+        response = await call_next(request)
+    else:
+        cache_control = SEARCH_CACHE_CONTROL
+        if not_modified:
+            search_logs = search_logs_by_etag.get(etag) if _may_log(request) else []
+            if search_logs is not None:
+                for search_type, params in search_logs:
+                    await log_search_query_async(search_type, params)
+                return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+        with record_search_logs() as search_logs:
+            response = await call_next(request)
+        if response.status_code == 200:
+            search_logs_by_etag.set(etag, search_logs)
+
+    if response.status_code != 200:
+        return response
+    if not_modified:
+        # the search logs of this page were not known: the route ran to write them
+        async for _ in response.body_iterator:
+            pass
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    return response
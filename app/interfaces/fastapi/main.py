@@ -1,10 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from app.core.async_services import shutdown_async_services
+from app.core.services import warmup_services, shutdown_services
+from .http_cache import http_cache_middleware
+from .metrics import metrics_middleware, router as metrics_router
+from .routers.api import router as api_router
 from .routers.pages import router as pages_router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup_services()
+    yield
+    shutdown_services()
+    await shutdown_async_services()
+
+
 def create_app() -> FastAPI:
-    app = FastAPI()
+    app = FastAPI(lifespan=lifespan)
 
     app.mount(
         "/static",
@@ -12,7 +28,13 @@ def create_app() -> FastAPI:
         name="static",
     )
 
+    app.middleware("http")(http_cache_middleware)
+    # added last, so it is the outermost middleware and also times 304 responses
+    app.middleware("http")(metrics_middleware)
+
     app.include_router(pages_router)
+    app.include_router(api_router)
+    app.include_router(metrics_router)
     return app
 
 app = create_app()
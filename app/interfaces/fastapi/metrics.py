@@ -0,0 +1,43 @@
+"""
+Prometheus metrics for the FastAPI interface.
+
+Request latency is recorded per route template (e.g. "/genres/{genre}"), so the
+number of series does not depend on user input. `/metrics` exports it together
+with the service, SQL, MongoDB, template, cache and pool metrics of the process.
+"""
+import time
+
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+
+from app.core.metrics import registry
+
+HTTP_LATENCY = registry.histogram("http_request_seconds", "HTTP request latency", ("method", "route"))
+
+router = APIRouter()
+
+
+def get_route_path(request: Request) -> str:
+    """Route template of the request; also resolved for requests answered before routing (e.g. 304)."""
+    route = request.scope.get("route")
+    if route is None:
+        for candidate in request.app.router.routes:
+            match, _ = candidate.matches(request.scope)
+            if match == Match.FULL:
+                route = candidate
+                break
+    return getattr(route, "path", None) or "unmatched"
+
+
+async def metrics_middleware(request: Request, call_next):
+    started = time.perf_counter()
+    try:
+        return await call_next(request)
+    finally:
+        HTTP_LATENCY.labels(request.method, get_route_path(request)).observe(time.perf_counter() - started)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,181 @@
+from typing import Any, Generator, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from ..deps import get_async_film_service, get_async_log_service, get_film_service
+from ..schemas import BatchRequest, BatchResponse, FilmPage, Statistics, Suggestions
+from ..user_settings import page_size as default_page_size
+from app.core.async_services import AsyncFilmSearchService, AsyncQueryLogService
+from app.core.export import CONTENT_TYPES
+from app.core.services import FilmSearchService
+
+# JSON API for machine clients: service results are returned as they are (no template
+# context, no row renaming) and serialized with orjson. The routes return ORJSONResponse
+# themselves, so FastAPI skips response model validation and `jsonable_encoder`; the
+# models in `schemas` only document the responses (`responses=` in OpenAPI), and the
+# helpers below fill in what the models used to add (optional fields, int idx).
+router = APIRouter(prefix="/api/v1", default_response_class=ORJSONResponse)
+
+MAX_PAGE_SIZE = 100
+MAX_SUGGESTIONS = 20
+
+# FilmPage fields that only keyset pages have
+PAGE_DEFAULTS = {"next_token": None, "prev_token": None}
+
+
+def film_page(result: dict) -> dict:
+    """Get a service search result in the `FilmPage` format (the result itself is not modified)."""
+    return {**PAGE_DEFAULTS, **result}
+
+
+def batch_item(outcome: dict) -> dict:
+    """Get a `search_many` outcome in the `BatchItem` format."""
+    result = outcome.get("result")
+    return {
+        "ok": outcome["ok"],
+        "result": film_page(result) if result is not None else None,
+        "error": outcome.get("error"),
+    }
+
+
+def report_rows(rows: list[dict]) -> list[dict]:
+    """Get statistics report rows with an int `idx` (the HTML report formats it as text)."""
+    return [{**row, "idx": int(row["idx"])} for row in rows]
+
+
+async def get_category_or_404(service: AsyncFilmSearchService, genre: str) -> dict:
+    dict_category = await service.get_dict_category_by_name(genre)
+    if dict_category is None:
+        raise HTTPException(status_code=404, detail=f"Genre not found: {genre}")
+    return dict_category
+
+
+@router.get("/search/keyword", response_model=None, responses={200: {"model": FilmPage}})
+async def api_search_keyword(keyword: str = Query(..., min_length=1),
+                             page: int = Query(1, ge=1),
+                             page_size: int = Query(default_page_size, ge=1, le=MAX_PAGE_SIZE),
+                             service: AsyncFilmSearchService = Depends(get_async_film_service)):
+    result = await service.search_by_keyword(keyword, page_size=page_size, page=page, log=page == 1)
+    return ORJSONResponse(film_page(result))
+
+
+@router.get("/genres/{genre}", response_model=None, responses={200: {"model": FilmPage}})
+async def api_genre(genre: str,
+                    page: int = Query(1, ge=1),
+                    page_size: int = Query(default_page_size, ge=1, le=MAX_PAGE_SIZE),
+                    cursor: str | None = None,
+                    service: AsyncFilmSearchService = Depends(get_async_film_service)):
+    dict_category = await get_category_or_404(service, genre)
+    result = await service.search_by_category(dict_category, page_size=page_size, page=page,
+                                              log=page == 1 and cursor is None, keyset=True, cursor=cursor)
+    return ORJSONResponse(film_page(result))
+
+
+@router.get("/search/genre_year", response_model=None, responses={200: {"model": FilmPage}})
+async def api_search_genre_year(genre: str,
+                                year_from: int | None = None,
+                                year_to: int | None = None,
+                                page: int = Query(1, ge=1),
+                                page_size: int = Query(default_page_size, ge=1, le=MAX_PAGE_SIZE),
+                                cursor: str | None = None,
+                                service: AsyncFilmSearchService = Depends(get_async_film_service)):
+    dict_category = await get_category_or_404(service, genre)
+    result = await service.search_by_category_year(dict_category, year_from=year_from, year_to=year_to,
+                                                   page_size=page_size, page=page,
+                                                   log=page == 1 and cursor is None, keyset=True, cursor=cursor)
+    return ORJSONResponse(film_page(result))
+
+
+# batch query types of the API ("genre" pages) -> FilmSearchService.search_many query types
+BATCH_QUERY_TYPES = {"keyword": "keyword", "genre": "category", "genre_year": "category_year"}
+
+
+def batch_query_from_api(query: Any) -> Any:
+    """Translate an API batch query into a `search_many` query (malformed ones are left for the service to report)."""
+    if not isinstance(query, dict):
+        return query
+    service_query = {key: value for key, value in query.items() if key != "genre"}
+    service_query["category_name"] = query.get("genre")
+    if isinstance(query.get("type"), str):
+        service_query["type"] = BATCH_QUERY_TYPES.get(query["type"], query["type"])
+    return service_query
+
+
+@router.post("/search/batch", response_model=None, responses={200: {"model": BatchResponse}})
+async def api_search_batch(batch: BatchRequest,
+                           service: AsyncFilmSearchService = Depends(get_async_film_service)):
+    # duplicates run once, unique queries run concurrently; a failed query only fails its own item.
+    # Batch lookups come from other services, so they are not written to the search query logs.
+    queries = [batch_query_from_api(query) for query in batch.queries]
+    outcomes = await service.search_many(queries, max_page_size=MAX_PAGE_SIZE)
+    return ORJSONResponse({"items": [batch_item(outcome) for outcome in outcomes]})
+
+
+@router.get("/suggest", response_model=None, responses={200: {"model": Suggestions}})
+async def api_suggest(prefix: str = Query(..., min_length=1, max_length=100),
+                      limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS),
+                      service: AsyncFilmSearchService = Depends(get_async_film_service)):
+    # answered from the in-memory title index: no MySQL access once it is loaded, no query log
+    return ORJSONResponse({"prefix": prefix, "items": await service.suggest_titles(prefix, limit)})
+
+
+@router.get("/statistics", response_model=None, responses={200: {"model": Statistics}})
+async def api_statistics(limit: int = Query(5, ge=1, le=MAX_PAGE_SIZE),
+                         q_service: AsyncQueryLogService = Depends(get_async_log_service)):
+    return ORJSONResponse({
+        "last_unique": report_rows(await q_service.get_last_unique_queries(limit)),
+        "top_queries": report_rows(await q_service.get_top_queries(limit)),
+    })
+
+
+# export: full result sets streamed from MySQL. The routes are sync, so FastAPI runs
+# them and iterates the (blocking) row stream in the thread pool.
+
+ExportFormat = Literal["csv", "ndjson"]
+
+
+def export_response(chunks: Generator[str, None, None], export_format: str, filename: str) -> StreamingResponse:
+    # A client that disconnects stops the iteration, but nothing closes the generator
+    # (only GC would). The background task runs after the response ends either way and
+    # closes it, so the MySQL connection is released (or dropped if rows are left unread).
+    return StreamingResponse(
+        chunks,
+        media_type=CONTENT_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{export_format}"'},
+        background=BackgroundTask(chunks.close),
+    )
+
+
+def get_category_or_404_sync(service: FilmSearchService, genre: str) -> dict:
+    dict_category = service.get_dict_category_by_name(genre)
+    if dict_category is None:
+        raise HTTPException(status_code=404, detail=f"Genre not found: {genre}")
+    return dict_category
+
+
+@router.get("/export/keyword")
+def api_export_keyword(keyword: str = Query(..., min_length=1),
+                       format: ExportFormat = "csv",
+                       service: FilmSearchService = Depends(get_film_service)):
+    return export_response(service.export_by_keyword(keyword, format), format, "films_keyword")
+
+
+@router.get("/export/genres/{genre}")
+def api_export_genre(genre: str,
+                     format: ExportFormat = "csv",
+                     service: FilmSearchService = Depends(get_film_service)):
+    dict_category = get_category_or_404_sync(service, genre)
+    return export_response(service.export_by_category(dict_category, format), format, "films_genre")
+
+
+@router.get("/export/genre_year")
+def api_export_genre_year(genre: str,
+                          year_from: int | None = None,
+                          year_to: int | None = None,
+                          format: ExportFormat = "csv",
+                          service: FilmSearchService = Depends(get_film_service)):
+    dict_category = get_category_or_404_sync(service, genre)
+    chunks = service.export_by_category_year(dict_category, year_from, year_to, format)
+    return export_response(chunks, format, "films_genre_year")
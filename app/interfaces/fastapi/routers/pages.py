@@ -10,26 +10,28 @@ from fastapi.responses import RedirectResponse
 
 from ..user_settings import page_size
 
-from ..deps import get_film_service, get_log_service
-from app.core.services import FilmSearchService, QueryLogService
+from ..deps import get_async_film_service, get_async_log_service
+from ..fragment_cache import cached_template_response, enable_bytecode_cache
+from app.core.async_services import AsyncFilmSearchService, AsyncQueryLogService
 
 router = APIRouter()
 templates = Jinja2Templates(directory="app/interfaces/fastapi/templates")
+enable_bytecode_cache(templates)
 
 # print("=== PAGES.PY LOADED v.1.0 ===", datetime.now())
 
 
 @router.get("/")
-def home(request: Request):
+async def home(request: Request):
     # print("home", datetime.now())
     return templates.TemplateResponse("home.html", {"request": request})
 
 
 @router.get("/search/keyword")
-def keyword_form(request: Request,
-                 keyword: str | None = None,
-                 page: int = Query(1, ge=1),
-                 service: FilmSearchService = Depends(get_film_service)):
+async def keyword_form(request: Request,
+                       keyword: str | None = None,
+                       page: int = Query(1, ge=1),
+                       service: AsyncFilmSearchService = Depends(get_async_film_service)):
     # print("keyword_form", datetime.now(), keyword, page)
 
     if not keyword:
@@ -46,20 +48,17 @@ def keyword_form(request: Request,
             "page_size": page_size,
             "page": 1,
         }
-        return templates.TemplateResponse("keyword.html", context)
+        return await cached_template_response(templates, request, "keyword.html", context)
 
-    context = get_context_films_table(service=service, method='keyword', keyword=keyword, page=page)
+    context = await get_context_films_table(service=service, method='keyword', keyword=keyword, page=page)
     context.update({"request": request})
 
     # print('keyword_form 3', datetime.now(), context)
-    return templates.TemplateResponse(
-        "keyword.html",
-        context,
-    )
+    return await cached_template_response(templates, request, "keyword.html", context)
 
 
 @router.post("/search/keyword")
-def keyword_page(
+async def keyword_page(
         request: Request,
         keyword: str = Form(...),
         page: int = Query(1, ge=1),
@@ -70,40 +69,36 @@ def keyword_page(
 
 
 @router.get("/genres")
-def categories(request: Request, service: FilmSearchService = Depends(get_film_service)):
+async def categories(request: Request, service: AsyncFilmSearchService = Depends(get_async_film_service)):
     # print("categories", datetime.now())
-    items = service.list_all_categories()
+    items = await service.list_all_categories()
     genres = [g.get("category_name") for g in items]
 
-    return templates.TemplateResponse(
-        "genres.html",
-        {"request": request, "genres": genres},
-    )
+    return await cached_template_response(templates, request, "genres.html", {"genres": genres})
 
 
 @router.get("/genres/{genre}")
-def genre_page(request: Request, genre: str, page: int = 1, service: FilmSearchService = Depends(get_film_service)):
+async def genre_page(request: Request, genre: str, page: int = 1, cursor: str | None = None,
+                     service: AsyncFilmSearchService = Depends(get_async_film_service)):
     # print("genre_page 111", datetime.now(), genre, page)
 
-    context = get_context_films_table(service=service, method='genre', genre=genre, page=page)
+    context = await get_context_films_table(service=service, method='genre', genre=genre, page=page, cursor=cursor)
     context.update({"request": request})
-    return templates.TemplateResponse(
-        "genre.html",
-        context,
-    )
+    return await cached_template_response(templates, request, "genre.html", context)
 
 
 @router.get("/search/genre_year")
-def genre_year_form(request: Request,
-                    genre: str | None = None,
-                    year_from: int | None = None,
-                    year_to: int | None = None,
-                    page: int = 1,
-                    service: FilmSearchService = Depends(get_film_service)):
+async def genre_year_form(request: Request,
+                          genre: str | None = None,
+                          year_from: int | None = None,
+                          year_to: int | None = None,
+                          page: int = 1,
+                          cursor: str | None = None,
+                          service: AsyncFilmSearchService = Depends(get_async_film_service)):
     # print("get.genre_year", datetime.now(), genre, year_from, year_to, page)
 
     # список жанров для выпадающего списка
-    all_categories = service.list_all_categories()
+    all_categories = await service.list_all_categories()
     genres = [c.get("category_name") for c in all_categories]
 
     if not genre:
@@ -123,9 +118,9 @@ def genre_year_form(request: Request,
             "page_size": page_size,
             "page": 1,
         }
-        return templates.TemplateResponse("genre_year.html", context)
+        return await cached_template_response(templates, request, "genre_year.html", context)
 
-    context = get_context_films_table(
+    context = await get_context_films_table(
         service=service,
         method="genre_year",
         genre=genre,
@@ -133,6 +128,7 @@ def genre_year_form(request: Request,
         year_to=year_to,
         page=page,
         page_size=page_size,
+        cursor=cursor,
     )
     context.update({
         "request": request,
@@ -141,11 +137,11 @@ def genre_year_form(request: Request,
         "year_from": year_from or "",
         "year_to": year_to or "",
     })
-    return templates.TemplateResponse("genre_year.html", context)
+    return await cached_template_response(templates, request, "genre_year.html", context)
 
 
 @router.post("/search/genre_year")
-def genre_year_page(
+async def genre_year_page(
         genre: str = Form(...),
         year_from: int = Form(...),
         year_to: int = Form(...),
@@ -155,8 +151,8 @@ def genre_year_page(
     return RedirectResponse(url=f"/search/genre_year?{qs}", status_code=303)
 
 
-def get_context_films_table(
-        service: FilmSearchService = Depends(get_film_service),
+async def get_context_films_table(
+        service: AsyncFilmSearchService = Depends(get_async_film_service),
         method: str | None = None,
         keyword: str | None = None,
         genre: str | None = None,
@@ -164,22 +160,24 @@ def get_context_films_table(
         year_to: int | None = None,
         page: int = 1,
         page_size: int = 10,
+        cursor: str | None = None,
 ):
     context = result = defaultdict()
     # print("films_table", datetime.now())
 
-    log = page == 1
+    # like the API: only the first page is logged, pages reached by a cursor are not
+    log = page == 1 and cursor is None
     if page == 0:
         page = 1
 
     if method == 'keyword':
-        result = service.search_by_keyword(keyword, page_size=page_size, page=page, log=log)
+        result = await service.search_by_keyword(keyword, page_size=page_size, page=page, log=log)
         pages = result.get("pages", 1)
 
         # print("pages", pages, "page", page)
         if page > pages:
             page = max(pages, 1)
-            result = service.search_by_keyword(keyword, page_size=page_size, page=page, log=log)
+            result = await service.search_by_keyword(keyword, page_size=page_size, page=page, log=log)
 
         # print('3', datetime.now())
         count_films = result.get("total", 0)
@@ -191,14 +189,16 @@ def get_context_films_table(
         )
 
     elif method == 'genre':
-        dict_category = service.get_dict_category_by_name(genre)
-        result = service.search_by_category(dict_category, page_size=page_size, page=page, log=log)
+        dict_category = await service.get_dict_category_by_name(genre)
+        result = await service.search_by_category(dict_category, page_size=page_size, page=page, log=log,
+                                                  keyset=True, cursor=cursor)
         pages = result.get("pages", 1)
 
         # print("pages", pages, "page", page)
         if page > pages:
             page = pages
-            result = service.search_by_category(dict_category, page_size=page_size, page=page, log=log)
+            result = await service.search_by_category(dict_category, page_size=page_size, page=page, log=log,
+                                                      keyset=True)
 
         count_films = result.get("total", 0)
         context.update(
@@ -209,18 +209,20 @@ def get_context_films_table(
         )
 
     elif method == 'genre_year':
-        dict_category = service.get_dict_category_by_name(genre)
-        result = service.search_by_category_year(dict_category,
-                                                 year_from=year_from, year_to=year_to,
-                                                 page_size=page_size, page=page, log=log)
+        dict_category = await service.get_dict_category_by_name(genre)
+        result = await service.search_by_category_year(dict_category,
+                                                       year_from=year_from, year_to=year_to,
+                                                       page_size=page_size, page=page, log=log,
+                                                       keyset=True, cursor=cursor)
         pages = result.get("pages", 1)
 
         # print("pages", pages, "page", page)
         if page > pages:
             page = pages
-            result = service.search_by_category_year(dict_category,
-                                                     year_from=year_from, year_to=year_to,
-                                                     page_size=page_size, page=page, log=log)
+            result = await service.search_by_category_year(dict_category,
+                                                           year_from=year_from, year_to=year_to,
+                                                           page_size=page_size, page=page, log=log,
+                                                           keyset=True)
 
         count_films = result.get("total", 0)
         context.update(
@@ -254,7 +256,9 @@ def get_context_films_table(
         "has_next": has_next,
         "offset": start_i,
         "page_size": page_size,
-        "page": page, })
+        "page": page,
+        "next_token": result.get("next_token"),
+        "prev_token": result.get("prev_token"), })
 
     return context
 
@@ -262,10 +266,10 @@ def get_context_films_table(
 # statistics
 
 @router.get("/statistics")
-def statistics(request: Request, q_service: QueryLogService = Depends(get_log_service)):
+async def statistics(request: Request, q_service: AsyncQueryLogService = Depends(get_async_log_service)):
     # print("statistics", datetime.now())
-    last_unique = q_service.get_last_unique_queries()
-    top_5_q = q_service.get_top_queries(5)
+    last_unique = await q_service.get_last_unique_queries()
+    top_5_q = await q_service.get_top_queries(5)
 
     context = {"last_unique": last_unique, "top_5_q": top_5_q,
                "request": request}
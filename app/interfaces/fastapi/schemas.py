@@ -0,0 +1,71 @@
+from typing import Any, Optional
+
+from pydantic import BaseModel, Field
+
+
+class Film(BaseModel):
+    film_id: int
+    title: str
+    release_year: Optional[int] = None
+    category_name: Optional[str] = None
+
+
+class FilmPage(BaseModel):
+    items: list[Film]
+    total: int
+    page: int
+    page_size: int
+    pages: int
+    next_token: Optional[str] = None
+    prev_token: Optional[str] = None
+
+
+class BatchRequest(BaseModel):
+    # Items are not validated here: the service validates every query on its own, so a
+    # malformed one fails its own BatchItem instead of the whole batch (422).
+    queries: list[Any] = Field(
+        ..., min_length=1, max_length=500,
+        description='Queries: {"type": "keyword" | "genre" | "genre_year", "keyword", "genre", '
+                    '"year_from", "year_to", "page" (default 1), "page_size" (default 10, max 100)}',
+    )
+
+
+class BatchItem(BaseModel):
+    ok: bool
+    result: Optional[FilmPage] = None
+    error: Optional[str] = None
+
+
+class BatchResponse(BaseModel):
+    items: list[BatchItem]
+
+
+class Suggestion(BaseModel):
+    film_id: int
+    title: str
+
+
+class Suggestions(BaseModel):
+    prefix: str
+    items: list[Suggestion]
+
+
+class TopQuery(BaseModel):
+    idx: int
+    type: Optional[str] = None
+    query: str
+    count: Optional[int] = None
+    results: Optional[int] = None
+
+
+class LastQuery(BaseModel):
+    idx: int
+    type: Optional[str] = None
+    query: str
+    timestamp: str
+    results: Optional[int] = None
+
+
+class Statistics(BaseModel):
+    last_unique: list[LastQuery]
+    top_queries: list[TopQuery]
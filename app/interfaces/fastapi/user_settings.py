@@ -1,4 +1,24 @@
 from app.interfaces.cli import messages
 
 msg = messages.RuCliMessages()
-page_size = 10
\ No newline at end of file
+page_size = 10
+
+# HTTP caching: catalog pages get an ETag (catalog version) and may be reused for
+# `catalog_max_age` seconds; statistics pages change with every search.
+catalog_max_age = 60
+statistics_max_age = 10
+# search logs of answered first pages by ETag: a matching If-None-Match writes the log
+# entries again and gets a 304 without running the search (LRU bounded)
+search_log_cache_ttl_seconds = 600
+search_log_cache_max_entries = 4096
+
+# Rendered-fragment cache for catalog pages: rendered HTML keyed on template name,
+# request URL, context hash and catalog version (LRU bounded).
+fragment_cache_enabled = True
+fragment_cache_ttl_seconds = 600
+fragment_cache_max_entries = 512
+fragment_cache_max_bytes = 16 * 1024 * 1024
+
+# Jinja bytecode cache directory (compiled templates survive worker restarts).
+# None uses a per-user directory in the system temp dir; "" disables the cache.
+jinja_bytecode_cache_dir = None
@@ -1,4 +1,3 @@
-import subprocess
 import sys
 
 
@@ -16,6 +15,8 @@ def main():
             cli_main()
 
         elif choice == "2":
+            import subprocess
+
             print("Starting FastAPI server...")
 
             proc = subprocess.Popen(
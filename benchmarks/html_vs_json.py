@@ -0,0 +1,91 @@
+"""
+HTML pages vs JSON API throughput benchmark.
+
+The FastAPI app runs in-process (TestClient) on an in-memory catalog filled with
+synthetic films, so only routing, the service layer and template rendering / JSON
+serialization are measured. MySQL and MongoDB are not used: the requests ask for
+page 2, which is not logged, and send no If-None-Match (no 304 short-cuts).
+
+Run from the project root (templates and static files are resolved from there):
+
+    python -m benchmarks.html_vs_json --requests 2000 --films 1000
+"""
+import argparse
+import time
+
+from fastapi.testclient import TestClient
+
+from app.core.async_services import AsyncFilmSearchService
+from app.core.catalog import FilmCatalog
+from app.core.catalog_version import get_catalog_version
+from app.core.categories import CategoryRegistry
+from app.interfaces.fastapi.deps import get_async_film_service
+from app.interfaces.fastapi.main import create_app
+from benchmarks.synthetic import generate_categories, generate_films, year_ranges_by_category
+
+ROUTES = [
+    ("keyword",
+     "/search/keyword?keyword=an&page=2",
+     "/api/v1/search/keyword?keyword=an&page=2"),
+    ("genre",
+     "/genres/Action?page=2",
+     "/api/v1/genres/Action?page=2"),
+    ("genre_year",
+     "/search/genre_year?genre=Drama&year_from=1995&year_to=2008&page=2",
+     "/api/v1/search/genre_year?genre=Drama&year_from=1995&year_to=2008&page=2"),
+]
+
+
+def build_service(films_count: int) -> AsyncFilmSearchService:
+    films = generate_films(films_count)
+    categories = generate_categories()
+
+    catalog = FilmCatalog()
+    catalog.load_rows(films, categories)
+    registry = CategoryRegistry()
+    registry.load_rows(categories, year_ranges_by_category(films))
+    # no result cache: both paths do the same catalog lookup on every request
+    service = AsyncFilmSearchService(catalog=catalog, categories=registry)
+    service.cache = None
+    return service
+
+
+def measure(client: TestClient, url: str, requests: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        client.get(url)
+
+    size = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = client.get(url)
+        response.raise_for_status()
+        size = len(response.content)
+    elapsed = time.perf_counter() - started
+
+    return {"rps": requests / elapsed, "avg_ms": elapsed / requests * 1000, "bytes": size}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTML vs JSON API throughput")
+    parser.add_argument("--requests", type=int, default=1000, help="requests per route")
+    parser.add_argument("--warmup", type=int, default=50, help="warmup requests per route")
+    parser.add_argument("--films", type=int, default=1000, help="number of synthetic films")
+    args = parser.parse_args()
+
+    service = build_service(args.films)
+    get_catalog_version().set_version("synthetic")
+    app = create_app()
+    app.dependency_overrides[get_async_film_service] = lambda: service
+    client = TestClient(app)
+
+    print(f"{'route':<12}{'format':<8}{'req/s':>10}{'avg ms':>10}{'bytes':>10}")
+    for name, html_url, json_url in ROUTES:
+        html = measure(client, html_url, args.requests, args.warmup)
+        json = measure(client, json_url, args.requests, args.warmup)
+        for fmt, res in (("html", html), ("json", json)):
+            print(f"{name:<12}{fmt:<8}{res['rps']:>10.0f}{res['avg_ms']:>10.3f}{res['bytes']:>10}")
+        print(f"{'':<12}{'json/html':<8}{json['rps'] / html['rps']:>10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
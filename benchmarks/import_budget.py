@@ -0,0 +1,134 @@
+"""
+Import-time budget check for the application entry points.
+
+Each entry point is imported in a fresh interpreter (several times, the median is
+reported) and compared with its budget from `BUDGETS_MS`. Importing an entry point
+must not load the database drivers either: they are imported with the first
+connection (or an explicit warmup), not at startup.
+
+The check exits with status 1 if a budget is exceeded or a driver was imported,
+so it can run in CI next to `benchmarks.suite`:
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --entry app.interfaces.cli.main --top 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+# Median import time, in milliseconds, allowed for each entry point.
+BUDGETS_MS = {
+    "app.main": 20.0,
+    "app.core.registry": 20.0,
+    "app.interfaces.cli.main": 150.0,
+    "app.interfaces.fastapi.main": 800.0,
+}
+
+# Modules that must not be loaded by importing an entry point.
+DEFERRED_MODULES = ("mysql.connector", "pymongo", "aiomysql", "pymysql")
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps({{"ms": elapsed * 1000, "loaded": [m for m in {deferred!r} if m in sys.modules]}}))
+"""
+
+
+def measure_import(module: str, runs: int) -> tuple[float, list[str]]:
+    """
+    Import a module in `runs` fresh interpreters.
+
+    Returns:
+        tuple: (median import time in ms, deferred modules loaded by the import).
+    """
+    timings = []
+    loaded: set[str] = set()
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, deferred=DEFERRED_MODULES)],
+            capture_output=True, text=True, env=_child_env(), check=False,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to import {module}:\n{result.stderr.strip()}")
+        probe = json.loads(result.stdout.strip().splitlines()[-1])
+        timings.append(probe["ms"])
+        loaded.update(probe["loaded"])
+    return statistics.median(timings), sorted(loaded)
+
+
+def import_time_report(module: str, top: int) -> list[tuple[int, int, str]]:
+    """
+    Get the slowest imports of a module from `python -X importtime`.
+
+    Returns:
+        list: Up to `top` (cumulative us, self us, module name) tuples, slowest first.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=_child_env(), check=False,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative_us), int(self_us), name.rstrip()))
+    rows.sort(reverse=True)
+    return rows[:top]
+
+
+def _child_env() -> dict:
+    """Environment for the probe interpreters: the project root on the path, no bytecode writes."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check the import time of the application entry points.")
+    parser.add_argument("--entry", action="append", choices=sorted(BUDGETS_MS),
+                        help="Entry point to check (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per entry point")
+    parser.add_argument("--scale", type=float, default=1.0,
+                        help="Multiply every budget (slower CI machines)")
+    parser.add_argument("--top", type=int, default=0, help="Show the N slowest imports of each entry point")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache so the first run does not pay for compilation.
+    subprocess.run([sys.executable, "-m", "compileall", "-q", "app"], check=False)
+
+    failed = False
+    print(f"{'entry point':32} {'median ms':>10} {'budget ms':>10}  status")
+    for module in args.entry or list(BUDGETS_MS):
+        budget = BUDGETS_MS[module] * args.scale
+        try:
+            median_ms, loaded = measure_import(module, args.runs)
+        except RuntimeError as err:
+            print(f"{module:32} {'-':>10} {budget:10.1f}  error")
+            print(f"    {err}")
+            failed = True
+            continue
+
+        problems = []
+        if median_ms > budget:
+            problems.append("over budget")
+        if loaded:
+            problems.append("loads " + ", ".join(loaded))
+        failed = failed or bool(problems)
+        print(f"{module:32} {median_ms:10.1f} {budget:10.1f}  {'; '.join(problems) or 'ok'}")
+
+        if args.top:
+            for cumulative_us, self_us, name in import_time_report(module, args.top):
+                print(f"    {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,378 @@
+"""
+Load test for the FastAPI app over a real local socket.
+
+The app (`benchmarks.loadtest_app`, backed by local database stand-ins) is started
+with uvicorn in a child process, so the worker count can be varied; the load
+generator runs in this process: `--concurrency` virtual users on keep-alive HTTP/1.1
+connections send a weighted mix of requests for `--duration` seconds. Requests of
+the first `--warmup` seconds are not counted.
+
+The report has RPS, p50/p95/p99 latency and the error rate (status >= 400,
+connection errors and timeouts) per route. Lists of worker counts, pool sizes and
+concurrency levels are swept as their cartesian product; the server is restarted only
+when the worker count or pool size changes.
+
+Run from the project root (templates and static files are resolved from there):
+
+    python -m benchmarks.loadtest --duration 20 --concurrency 32
+    python -m benchmarks.loadtest --workers 1,2,4 --pool-sizes 5,20 --concurrency 16,64 \\
+        --backend sql --db-latency-ms 2 --output benchmarks/results/sweep.json
+    python -m benchmarks.loadtest --backend sql --db-latency-ms 2 --replicas 3
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --mix api_keyword=1,api_genre=1
+
+The generator is a single asyncio loop; when it saturates one CPU core, the
+reported ceiling is the client's, not the server's (watch the CPU usage).
+"""
+import argparse
+import asyncio
+import http.client
+import itertools
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Iterator, Optional
+from urllib.parse import quote, urlencode, urlsplit
+
+from benchmarks.synthetic import CATEGORY_NAMES, TITLE_WORDS
+
+DEFAULT_MIX = "keyword=4,genre=3,genre_year=2,statistics=1"
+
+
+def _keyword(rnd: random.Random) -> str:
+    word = rnd.choice(TITLE_WORDS).lower()
+    start = rnd.randrange(max(len(word) - 2, 1))
+    return word[start:start + rnd.randint(2, 4)]
+
+
+def _year_range(rnd: random.Random) -> tuple[int, int]:
+    year_from = rnd.randint(1990, 2008)
+    return year_from, rnd.randint(year_from, 2012)
+
+
+def _page(rnd: random.Random) -> int:
+    # page 1 (logged) is the most common page
+    return rnd.choice((1, 1, 1, 2, 2, 3, 4, 5))
+
+
+def _keyword_query(rnd: random.Random) -> str:
+    return urlencode({"keyword": _keyword(rnd), "page": _page(rnd)})
+
+
+def _genre_year_query(rnd: random.Random) -> str:
+    year_from, year_to = _year_range(rnd)
+    return urlencode({"genre": rnd.choice(CATEGORY_NAMES), "year_from": year_from, "year_to": year_to,
+                      "page": _page(rnd)})
+
+
+ROUTES: dict[str, Callable[[random.Random], str]] = {
+    "keyword": lambda rnd: f"/search/keyword?{_keyword_query(rnd)}",
+    "genre": lambda rnd: f"/genres/{quote(rnd.choice(CATEGORY_NAMES))}?page={_page(rnd)}",
+    "genre_year": lambda rnd: f"/search/genre_year?{_genre_year_query(rnd)}",
+    "statistics": lambda rnd: "/statistics",
+    "api_keyword": lambda rnd: f"/api/v1/search/keyword?{_keyword_query(rnd)}",
+    "api_genre": lambda rnd: f"/api/v1/genres/{quote(rnd.choice(CATEGORY_NAMES))}?page={_page(rnd)}",
+    "api_genre_year": lambda rnd: f"/api/v1/search/genre_year?{_genre_year_query(rnd)}",
+    "api_statistics": lambda rnd: "/api/v1/statistics",
+}
+
+
+def parse_mix(text: str) -> dict[str, float]:
+    """Parse "keyword=4,genre=3" into route weights."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.strip().partition("=")
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route {name!r} (known: {', '.join(ROUTES)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_int_list(text: Optional[str]) -> list[Optional[int]]:
+    return [int(v) for v in text.split(",")] if text else [None]
+
+
+class HttpConnection:
+    """Minimal keep-alive HTTP/1.1 client connection (GET only)."""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def get(self, path: str) -> int:
+        """Send a GET request and read the whole response; returns the status code."""
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        self._writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n\r\n".encode("latin-1"))
+        await self._writer.drain()
+
+        status_line = await self._reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed by the server")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self._reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if "content-length" in headers:
+            await self._reader.readexactly(int(headers["content-length"]))
+        elif headers.get("transfer-encoding", "").lower() == "chunked":
+            while True:
+                size = int((await self._reader.readline()).split(b";")[0], 16)
+                await self._reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        else:
+            await self._reader.read()
+            self.close()
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+
+class RouteStats:
+    def __init__(self):
+        self.latencies: list[float] = []
+        self.errors = 0
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.latencies.append(seconds)
+        if not ok:
+            self.errors += 1
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(q / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(stats: RouteStats, seconds: float) -> dict:
+    latencies = sorted(stats.latencies)
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "errors": stats.errors,
+        "error_rate": stats.errors / requests if requests else 0.0,
+        "rps": requests / seconds if seconds else 0.0,
+        "mean_ms": sum(latencies) / requests * 1000 if requests else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def _virtual_user(host: str, port: int, mix: dict[str, float], rnd: random.Random, record_from: float,
+                        stop_at: float, timeout: float, stats: dict[str, RouteStats]) -> None:
+    conn = HttpConnection(host, port)
+    names, weights = list(mix), list(mix.values())
+    try:
+        while time.perf_counter() < stop_at:
+            name = rnd.choices(names, weights)[0]
+            path = ROUTES[name](rnd)
+            started = time.perf_counter()
+            try:
+                status = await asyncio.wait_for(conn.get(path), timeout)
+                ok = status < 400
+            except (OSError, ConnectionError, ValueError, asyncio.IncompleteReadError, asyncio.TimeoutError):
+                conn.close()
+                ok = False
+            if started >= record_from:
+                stats[name].record(time.perf_counter() - started, ok)
+    finally:
+        conn.close()
+
+
+async def _run_load(host: str, port: int, concurrency: int, duration: float, warmup: float,
+                    mix: dict[str, float], seed: int, timeout: float) -> dict:
+    stats = {name: RouteStats() for name in mix}
+    started = time.perf_counter()
+    record_from, stop_at = started + warmup, started + warmup + duration
+    await asyncio.gather(*(
+        _virtual_user(host, port, mix, random.Random(seed + i), record_from, stop_at, timeout, stats)
+        for i in range(concurrency)
+    ))
+    measured = max(time.perf_counter() - record_from, 1e-9)
+
+    total = RouteStats()
+    for route_stats in stats.values():
+        total.latencies.extend(route_stats.latencies)
+        total.errors += route_stats.errors
+    routes = {name: summarize(route_stats, measured) for name, route_stats in stats.items()}
+    return {"routes": routes, "total": summarize(total, measured), "seconds": measured}
+
+
+def run_load(host: str, port: int, concurrency: int, duration: float, warmup: float = 3.0,
+             mix: Optional[dict[str, float]] = None, seed: int = 1, timeout: float = 10.0) -> dict:
+    """
+    Drive the server with `concurrency` virtual users.
+
+    Returns:
+        dict: routes (per-route summary), total and seconds (measured duration).
+            Summaries have requests, errors, error_rate, rps, mean_ms, p50_ms, p95_ms and p99_ms.
+    """
+    return asyncio.run(_run_load(host, port, concurrency, duration, warmup,
+                                 mix or parse_mix(DEFAULT_MIX), seed, timeout))
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _wait_until_ready(host: str, port: int, proc: subprocess.Popen, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with code {proc.returncode}")
+        try:
+            conn = http.client.HTTPConnection(host, port, timeout=2)
+            conn.request("GET", "/genres")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return
+            conn.close()
+        except OSError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Server did not become ready in {timeout}s")
+
+
+@contextmanager
+def serve(host: str, workers: int, pool_size: Optional[int], films: int, db_latency_ms: float,
+          backend: str, caches: bool, replicas: int = 0, replica_selection: Optional[str] = None,
+          startup_timeout: float = 60.0) -> Iterator[int]:
+    """Run `benchmarks.loadtest_app` under uvicorn; yields the port."""
+    port = _free_port(host)
+    env = {
+        **os.environ,
+        "LOADTEST_FILMS": str(films),
+        "LOADTEST_DB_LATENCY_MS": str(db_latency_ms),
+        "LOADTEST_BACKEND": backend,
+        "LOADTEST_CACHES": "1" if caches else "0",
+        "LOADTEST_REPLICAS": str(replicas),
+    }
+    if pool_size is not None:
+        env["LOADTEST_POOL_SIZE"] = str(pool_size)
+    if replica_selection is not None:
+        env["LOADTEST_REPLICA_SELECTION"] = replica_selection
+    cmd = [sys.executable, "-m", "uvicorn", "benchmarks.loadtest_app:app", "--host", host, "--port", str(port),
+           "--workers", str(workers), "--no-access-log", "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        _wait_until_ready(host, port, proc, startup_timeout)
+        yield port
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(15)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def print_report(title: str, result: dict) -> None:
+    print(f"\n{title}")
+    print(f"{'route':<16}{'requests':>10}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for name, row in [*result["routes"].items(), ("total", result["total"])]:
+        print(f"{name:<16}{row['requests']:>10}{row['rps']:>10.1f}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+              f"{row['p99_ms']:>10.2f}{row['error_rate']:>9.2%}")
+
+
+def print_sweep(runs: list[dict]) -> None:
+    print("\nSweep summary")
+    print(f"{'workers':>8}{'pool':>6}{'conc':>6}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}")
+    for run in runs:
+        total = run["result"]["total"]
+        pool = run["pool_size"] if run["pool_size"] is not None else "-"
+        print(f"{run['workers']:>8}{pool:>6}{run['concurrency']:>6}{total['rps']:>10.1f}{total['p50_ms']:>10.2f}"
+              f"{total['p95_ms']:>10.2f}{total['p99_ms']:>10.2f}{total['error_rate']:>9.2%}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Load test for the FastAPI app")
+    parser.add_argument("--url", help="test an already running server instead of starting one")
+    parser.add_argument("--host", default="127.0.0.1", help="interface for the started server")
+    parser.add_argument("--workers", default="1", help="uvicorn worker counts, comma-separated")
+    parser.add_argument("--pool-sizes", help="MySQL pool sizes, comma-separated (default: user_settings)")
+    parser.add_argument("--concurrency", default="32", help="virtual users, comma-separated")
+    parser.add_argument("--duration", type=float, default=20.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=3.0, help="unmeasured seconds before each run")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"route weights ({', '.join(ROUTES)})")
+    parser.add_argument("--timeout", type=float, default=10.0, help="request timeout (counted as an error)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--films", type=int, default=1000, help="number of synthetic films")
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="emulated MySQL round-trip per statement")
+    parser.add_argument("--backend", choices=("catalog", "sql"), default="catalog",
+                        help="answer searches from the in-memory catalog or from the MySQL stand-in")
+    parser.add_argument("--no-caches", action="store_true", help="disable the result and fragment caches")
+    parser.add_argument("--replicas", type=int, default=0,
+                        help="route reads to this many MySQL read replica stand-ins (each with its own data copy)")
+    parser.add_argument("--replica-selection", choices=("round_robin", "least_outstanding"),
+                        help="replica selection (default: user_settings)")
+    parser.add_argument("--output", help="write all runs as JSON")
+    args = parser.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+    except ValueError as err:
+        parser.error(str(err))
+
+    runs = []
+    concurrency_levels = parse_int_list(args.concurrency)
+    if args.url:
+        target = urlsplit(args.url)
+        for concurrency in concurrency_levels:
+            result = run_load(target.hostname, target.port or 80, concurrency, args.duration, args.warmup,
+                              mix, args.seed, args.timeout)
+            print_report(f"{args.url} concurrency={concurrency}", result)
+            runs.append({"workers": None, "pool_size": None, "concurrency": concurrency, "result": result})
+    else:
+        for workers, pool_size in itertools.product(parse_int_list(args.workers), parse_int_list(args.pool_sizes)):
+            with serve(args.host, workers, pool_size, args.films, args.db_latency_ms, args.backend,
+                       not args.no_caches, args.replicas, args.replica_selection) as port:
+                for concurrency in concurrency_levels:
+                    result = run_load(args.host, port, concurrency, args.duration, args.warmup,
+                                      mix, args.seed, args.timeout)
+                    print_report(f"workers={workers} pool={pool_size or 'default'} concurrency={concurrency}",
+                                 result)
+                    runs.append({"workers": workers, "pool_size": pool_size, "concurrency": concurrency,
+                                 "result": result})
+
+    if len(runs) > 1:
+        print_sweep(runs)
+    if args.output:
+        directory = os.path.dirname(args.output)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        meta = {"created": datetime.now().isoformat(timespec="seconds"), "mix": mix, "duration": args.duration,
+                "backend": args.backend, "caches": not args.no_caches, "films": args.films,
+                "db_latency_ms": args.db_latency_ms, "replicas": args.replicas}
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"meta": meta, "runs": runs}, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
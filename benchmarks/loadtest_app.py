@@ -0,0 +1,90 @@
+"""
+FastAPI app on local database stand-ins, for `benchmarks.loadtest`.
+
+Importing this module replaces the MySQL pools and MongoDB clients of `app.core.db`
+with the stand-ins from `benchmarks.standins` (before the services are imported) and
+then creates the app. It is loaded by uvicorn, once per worker process, so it is
+configured with environment variables:
+
+    LOADTEST_FILMS          number of synthetic films (default 1000)
+    LOADTEST_POOL_SIZE      sync MySQL pool size and async pool maxsize (default: user_settings)
+    LOADTEST_DB_LATENCY_MS  emulated MySQL round-trip per statement (default 0)
+    LOADTEST_BACKEND        "catalog" (in-memory catalog, default) or "sql" (every search hits the pool)
+    LOADTEST_CACHES         "1" (default) keeps the result and fragment caches, "0" disables them
+    LOADTEST_REPLICAS       number of read replica stand-ins (default 0: all reads go to the primary)
+    LOADTEST_REPLICA_SELECTION  "round_robin" or "least_outstanding" (default: user_settings)
+
+    uvicorn benchmarks.loadtest_app:app --workers 4
+"""
+import os
+
+from app.core import user_settings
+from app.core.db import async_connection, async_mongo_connection, connection, mongo_connection
+from app.core.db.pool import MySQLPool
+from app.core.db.replicas import ReplicaSet
+from benchmarks.standins import (
+    AsyncInMemoryMongoClient,
+    AsyncSQLitePool,
+    InMemoryMongoClient,
+    create_sakila_standin,
+)
+
+FILMS = int(os.environ.get("LOADTEST_FILMS", "1000"))
+POOL_SIZE = int(os.environ.get("LOADTEST_POOL_SIZE") or user_settings.mysql_pool_size)
+DB_LATENCY_MS = float(os.environ.get("LOADTEST_DB_LATENCY_MS", "0"))
+BACKEND = os.environ.get("LOADTEST_BACKEND", "catalog")
+CACHES = os.environ.get("LOADTEST_CACHES", "1") != "0"
+REPLICAS = int(os.environ.get("LOADTEST_REPLICAS", "0"))
+REPLICA_SELECTION = os.environ.get("LOADTEST_REPLICA_SELECTION") or user_settings.mysql_replica_selection
+
+
+def install_standins() -> None:
+    db = create_sakila_standin(FILMS, latency=DB_LATENCY_MS / 1000)
+    connection._pool = MySQLPool(lambda: db, pool_size=POOL_SIZE, max_overflow=0,
+                                 acquire_timeout=user_settings.mysql_pool_acquire_timeout)
+    async_connection._async_pool = AsyncSQLitePool(db, maxsize=POOL_SIZE)
+
+    if REPLICAS:
+        install_replica_standins()
+
+    mongo = InMemoryMongoClient()
+    mongo_connection._client = mongo
+    async_mongo_connection._async_client = AsyncInMemoryMongoClient(mongo)
+
+
+def install_replica_standins() -> None:
+    """Give every replica its own stand-in database (a separate copy of the same data)."""
+    names = [f"replica{i + 1}" for i in range(REPLICAS)]
+    for name in names:
+        replica_db = create_sakila_standin(FILMS, latency=DB_LATENCY_MS / 1000)
+        connection._replica_pools[name] = MySQLPool(lambda replica_db=replica_db: replica_db,
+                                                    pool_size=POOL_SIZE, max_overflow=0,
+                                                    acquire_timeout=user_settings.mysql_pool_acquire_timeout)
+        async_connection._async_replica_pools[name] = AsyncSQLitePool(replica_db, maxsize=POOL_SIZE)
+    connection._replicas = ReplicaSet(
+        names,
+        connection._check_replica,
+        selection=REPLICA_SELECTION,
+        max_failures=user_settings.mysql_replica_max_failures,
+        readmit_successes=user_settings.mysql_replica_readmit_successes,
+        health_check_seconds=user_settings.mysql_replica_health_check_seconds,
+    )
+    connection._replicas.start()
+
+
+install_standins()
+
+from app.core import services  # noqa: E402  (after the stand-ins are installed)
+from app.interfaces.fastapi import fragment_cache  # noqa: E402
+from app.interfaces.fastapi.main import create_app  # noqa: E402
+
+if BACKEND == "sql":
+    services.catalog_engine_enabled = False
+    services.category_registry_enabled = False
+elif BACKEND != "catalog":
+    raise ValueError(f"Unknown LOADTEST_BACKEND: {BACKEND}")
+if not CACHES:
+    services.result_cache_enabled = False
+    fragment_cache.fragment_cache_enabled = False
+
+app = create_app()
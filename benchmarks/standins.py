@@ -0,0 +1,548 @@
+"""
+Local stand-ins for MySQL and MongoDB used by the offline benchmark suite.
+
+`SQLiteMySQLConnection` runs the `films_mysql_repo` SQL on an in-memory SQLite
+database seeded with Sakila-shaped tables (film, category, film_category). The
+few MySQL-only constructs the repository uses are rewritten by `translate_sql`.
+
+`InMemoryMongoDatabase` keeps documents in lists and implements the collection
+methods and aggregation stages used by `QueryLogService` and `log_search_query`.
+
+The async variants (`AsyncSQLitePool`, `AsyncInMemoryMongoClient`) replace the
+aiomysql pool and the async MongoDB client for the load test; they share the data
+of the sync stand-ins. `latency` arguments add a fixed wait per MySQL statement
+to emulate the network round-trip.
+
+Neither stand-in is meant to be fast in the same way as the real servers; they
+make the Python side of every code path measurable and comparable between runs.
+"""
+import asyncio
+import copy
+import functools
+import itertools
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Iterable, Optional
+
+from benchmarks.synthetic import generate_categories, generate_films
+
+_PARAM_RE = re.compile(r"%\((\w+)\)s")
+_CAST_UNSIGNED_RE = re.compile(r"CAST\((.+?) AS UNSIGNED\)", re.IGNORECASE)
+_GREATEST_RE = re.compile(r"\bGREATEST\(", re.IGNORECASE)
+
+SAKILA_SCHEMA = """
+CREATE TABLE category (
+    category_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    last_update TEXT NOT NULL DEFAULT '2006-02-15 04:46:27'
+);
+CREATE TABLE film (
+    film_id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    release_year INTEGER,
+    last_update TEXT NOT NULL DEFAULT '2006-02-15 05:03:42'
+);
+CREATE TABLE film_category (
+    film_id INTEGER NOT NULL REFERENCES film (film_id),
+    category_id INTEGER NOT NULL REFERENCES category (category_id),
+    last_update TEXT NOT NULL DEFAULT '2006-02-15 05:07:09',
+    PRIMARY KEY (film_id, category_id)
+);
+CREATE INDEX idx_title ON film (title);
+CREATE INDEX fk_film_category_category ON film_category (category_id);
+"""
+
+
+@functools.lru_cache(maxsize=None)
+def translate_sql(sql: str) -> str:
+    """
+    Rewrite a MySQL statement of the repository for SQLite.
+
+    Named `%(name)s` parameters become `:name`, `CAST(... AS UNSIGNED)` becomes
+    `CAST(... AS INTEGER)` and `GREATEST(...)` becomes the multi-argument `MAX(...)`.
+    """
+    sql = _PARAM_RE.sub(r":\1", sql)
+    sql = _CAST_UNSIGNED_RE.sub(r"CAST(\1 AS INTEGER)", sql)
+    return _GREATEST_RE.sub("MAX(", sql)
+
+
+class _Cursor:
+    """The part of the mysql-connector cursor API used by the repository."""
+
+    def __init__(self, conn: sqlite3.Connection, dictionary: bool, lock: threading.RLock, latency: float = 0.0):
+        self._cursor = conn.cursor()
+        self._dictionary = dictionary
+        self._lock = lock
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def execute(self, operation: str, params: Optional[dict] = None) -> None:
+        if self._latency:
+            time.sleep(self._latency)
+        with self._lock:
+            self._cursor.execute(translate_sql(operation), params or {})
+
+    def _row(self, row):
+        if row is None or not self._dictionary:
+            return row
+        return dict(zip([column[0] for column in self._cursor.description], row))
+
+    def fetchone(self):
+        with self._lock:
+            return self._row(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1) -> list:
+        with self._lock:
+            return [self._row(row) for row in self._cursor.fetchmany(size)]
+
+    def fetchall(self) -> list:
+        with self._lock:
+            return [self._row(row) for row in self._cursor.fetchall()]
+
+    def close(self) -> None:
+        self._cursor.close()
+
+
+class SQLiteMySQLConnection:
+    """
+    MySQL connection stand-in over one in-memory SQLite database.
+
+    `close()` does nothing, so the same object can be returned for every
+    connection request of a benchmark run. Statements of all threads are
+    serialized on one lock.
+    """
+
+    server_version = (8, 0, 36)
+
+    def __init__(self, latency: float = 0.0):
+        """
+        Args:
+            latency: Seconds to wait before every statement (emulated round-trip).
+        """
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.executescript(SAKILA_SCHEMA)
+        self._lock = threading.RLock()
+        self.latency = latency
+        self.unread_result = False
+
+    def cursor(self, dictionary: bool = False, **kwargs) -> _Cursor:
+        return _Cursor(self._conn, dictionary, self._lock, self.latency)
+
+    def get_server_version(self) -> tuple:
+        return self.server_version
+
+    def get_server_info(self) -> str:
+        return ".".join(map(str, self.server_version))
+
+    def is_connected(self) -> bool:
+        return True
+
+    def consume_results(self) -> None:
+        pass
+
+    def reset_session(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def seed(self, films: list[dict], categories: list[dict], extra_category_ratio: float = 0.1) -> None:
+        """
+        Fill the Sakila tables.
+
+        Args:
+            films: Rows in the `benchmarks.synthetic.generate_films` format.
+            categories: Rows in the `benchmarks.synthetic.generate_categories` format.
+            extra_category_ratio: Share of films that get a second category, so the
+                keyword queries see films repeated across categories as in Sakila.
+        """
+        every = int(1 / extra_category_ratio) if extra_category_ratio else 0
+        links = []
+        for film in films:
+            links.append((film["film_id"], film["category_id"]))
+            if every and film["film_id"] % every == 0:
+                links.append((film["film_id"], film["category_id"] % len(categories) + 1))
+
+        with self._conn:
+            self._conn.executemany("INSERT INTO category (category_id, name) VALUES (?, ?)",
+                                   [(c["category_id"], c["category_name"]) for c in categories])
+            self._conn.executemany("INSERT INTO film (film_id, title, release_year) VALUES (?, ?, ?)",
+                                   [(f["film_id"], f["title"], f["release_year"]) for f in films])
+            self._conn.executemany("INSERT INTO film_category (film_id, category_id) VALUES (?, ?)", links)
+        self._conn.execute("ANALYZE")
+
+
+def create_sakila_standin(films_count: int = 1000, seed: int = 42, latency: float = 0.0) -> SQLiteMySQLConnection:
+    """Create a SQLite stand-in seeded with `films_count` synthetic films."""
+    conn = SQLiteMySQLConnection(latency)
+    conn.seed(generate_films(films_count, seed), generate_categories())
+    return conn
+
+
+
+class _AsyncCursor:
+    """The part of the aiomysql cursor API used by `films_mysql_async_repo`."""
+
+    def __init__(self, cursor: _Cursor, latency: float):
+        self._cursor = cursor
+        self._latency = latency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._cursor.close()
+
+    async def execute(self, operation: str, params: Optional[dict] = None) -> None:
+        if self._latency:
+            await asyncio.sleep(self._latency)
+        self._cursor.execute(operation, params)
+
+    async def fetchone(self):
+        return self._cursor.fetchone()
+
+    async def fetchall(self) -> list:
+        return self._cursor.fetchall()
+
+
+class AsyncSQLiteConnection:
+    """aiomysql connection stand-in over the database of a `SQLiteMySQLConnection`."""
+
+    def __init__(self, db: SQLiteMySQLConnection):
+        self._db = db
+
+    def cursor(self, cursor_class=None) -> _AsyncCursor:
+        # the wait is awaited by the async cursor instead of blocking the event loop
+        return _AsyncCursor(_Cursor(self._db._conn, True, self._db._lock), self._db.latency)
+
+    def get_server_info(self) -> str:
+        return self._db.get_server_info()
+
+
+class AsyncSQLitePool:
+    """
+    aiomysql `Pool` stand-in: at most `maxsize` connections; `acquire` waits for a free one.
+    """
+
+    def __init__(self, db: SQLiteMySQLConnection, maxsize: int = 10):
+        self._db = db
+        self.maxsize = maxsize
+        self._free: deque[AsyncSQLiteConnection] = deque()
+        self._used: set[AsyncSQLiteConnection] = set()
+        self._cond: Optional[asyncio.Condition] = None
+
+    @property
+    def size(self) -> int:
+        return len(self._free) + len(self._used)
+
+    @property
+    def freesize(self) -> int:
+        return len(self._free)
+
+    async def acquire(self) -> AsyncSQLiteConnection:
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            while not self._free and self.size >= self.maxsize:
+                await self._cond.wait()
+            conn = self._free.popleft() if self._free else AsyncSQLiteConnection(self._db)
+            self._used.add(conn)
+            return conn
+
+    def release(self, conn: AsyncSQLiteConnection) -> None:
+        self._used.discard(conn)
+        self._free.append(conn)
+        asyncio.ensure_future(self._notify())
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify()
+
+    def close(self) -> None:
+        self._free.clear()
+
+    async def wait_closed(self) -> None:
+        pass
+
+
+# --- MongoDB ---
+
+_MISSING = object()
+
+
+def _get_path(doc: Any, path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return _MISSING
+        doc = doc[part]
+    return doc
+
+
+def _set_path(doc: dict, path: str, value: Any) -> None:
+    *parents, last = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[last] = value
+
+
+def _evaluate(expr: Any, doc: dict) -> Any:
+    """Evaluate an aggregation expression (field paths, object literals, $mergeObjects)."""
+    if isinstance(expr, str) and expr.startswith("$"):
+        return _get_path(doc, expr[1:])
+    if isinstance(expr, dict):
+        if len(expr) == 1 and next(iter(expr)).startswith("$"):
+            operator, args = next(iter(expr.items()))
+            if operator == "$mergeObjects":
+                merged = {}
+                for arg in args:
+                    value = _evaluate(arg, doc)
+                    if isinstance(value, dict):
+                        merged.update(value)
+                return merged
+            raise NotImplementedError(f"Unsupported expression operator: {operator}")
+        result = {}
+        for key, value in expr.items():
+            value = _evaluate(value, doc)
+            if value is not _MISSING:
+                result[key] = value
+        return result
+    return expr
+
+
+def _sort_key(value: Any) -> tuple:
+    # None/missing sort first, as in MongoDB
+    return (0, "") if value is None or value is _MISSING else (1, value)
+
+
+def _sort(docs: list[dict], spec: Iterable[tuple[str, int]]) -> list[dict]:
+    docs = list(docs)
+    for field, direction in reversed(list(spec)):
+        docs.sort(key=lambda d: _sort_key(_get_path(d, field)), reverse=direction < 0)
+    return docs
+
+
+def _matches(doc: dict, query: Optional[dict]) -> bool:
+    return all(_get_path(doc, field) == value for field, value in (query or {}).items())
+
+
+def _group(docs: list[dict], spec: dict) -> list[dict]:
+    groups: dict[str, dict] = {}
+    for doc in docs:
+        key = _evaluate(spec["_id"], doc)
+        group_key = json.dumps(key, default=str)
+        group = groups.get(group_key)
+        first = group is None
+        if first:
+            group = groups[group_key] = {"_id": key}
+        for field, accumulator in spec.items():
+            if field == "_id":
+                continue
+            operator, arg = next(iter(accumulator.items()))
+            value = _evaluate(arg, doc)
+            value = None if value is _MISSING else value
+            if operator == "$sum":
+                group[field] = group.get(field, 0) + (value or 0)
+            elif operator == "$first":
+                if first:
+                    group[field] = value
+            elif operator == "$last":
+                group[field] = value
+            elif operator == "$max":
+                group[field] = value if first else max(group[field], value, key=_sort_key)
+            elif operator == "$min":
+                group[field] = value if first else min(group[field], value, key=_sort_key)
+            else:
+                raise NotImplementedError(f"Unsupported accumulator: {operator}")
+    return list(groups.values())
+
+
+class InMemoryCollection:
+    """The part of the pymongo `Collection` API used by the services."""
+
+    def __init__(self, database: "InMemoryMongoDatabase", name: str):
+        self.database = database
+        self.name = name
+        self.docs: list[dict] = []
+        self._ids = itertools.count(1)
+
+    def create_index(self, keys, name: Optional[str] = None, **kwargs) -> str:
+        return name or "_".join(f"{field}_{direction}" for field, direction in keys)
+
+    def insert_one(self, document: dict) -> None:
+        with self.database.lock:
+            if "_id" not in document:
+                document["_id"] = next(self._ids)
+            self.docs.append(copy.deepcopy(document))
+
+    def insert_many(self, documents: Iterable[dict], ordered: bool = True) -> None:
+        for document in documents:
+            self.insert_one(document)
+
+    def update_one(self, query: dict, update: dict, upsert: bool = False) -> None:
+        with self.database.lock:
+            doc = next((d for d in self.docs if _matches(d, query)), None)
+            if doc is None:
+                if not upsert:
+                    return
+                doc = copy.deepcopy(query)
+                self.docs.append(doc)
+            for field, value in update.get("$inc", {}).items():
+                current = _get_path(doc, field)
+                _set_path(doc, field, (0 if current is _MISSING else current) + value)
+            for field, value in update.get("$set", {}).items():
+                _set_path(doc, field, value)
+
+    def bulk_write(self, requests: Iterable, ordered: bool = True) -> None:
+        """Apply pymongo `InsertOne`/`UpdateOne` requests (read from their private attributes)."""
+        for request in requests:
+            if hasattr(request, "_upsert"):
+                self.update_one(request._filter, request._doc, upsert=request._upsert)
+            else:
+                self.insert_one(request._doc)
+
+    def find(self, query: Optional[dict] = None, sort=None, limit: int = 0) -> list[dict]:
+        with self.database.lock:
+            docs = [d for d in self.docs if _matches(d, query)]
+            if sort:
+                docs = _sort(docs, sort)
+            if limit:
+                docs = docs[:limit]
+            return [copy.deepcopy(d) for d in docs]
+
+    def count_documents(self, query: dict) -> int:
+        with self.database.lock:
+            return sum(1 for d in self.docs if _matches(d, query))
+
+    def aggregate(self, pipeline: list[dict]) -> list[dict]:
+        with self.database.lock:
+            docs = [copy.deepcopy(d) for d in self.docs]
+            return self._run_pipeline(docs, pipeline)
+
+    def _run_pipeline(self, docs: list[dict], pipeline: list[dict]) -> list[dict]:
+        for stage in pipeline:
+            operator, spec = next(iter(stage.items()))
+            if operator == "$match":
+                docs = [d for d in docs if _matches(d, spec)]
+            elif operator == "$addFields":
+                for doc in docs:
+                    values = {field: _evaluate(expr, doc) for field, expr in spec.items()}
+                    for field, value in values.items():
+                        _set_path(doc, field, value)
+            elif operator == "$group":
+                docs = _group(docs, spec)
+            elif operator == "$sort":
+                docs = _sort(docs, spec.items())
+            elif operator == "$limit":
+                docs = docs[:spec]
+            elif operator == "$skip":
+                docs = docs[spec:]
+            elif operator == "$replaceRoot":
+                docs = [_evaluate(spec["newRoot"], doc) for doc in docs]
+            elif operator == "$merge":
+                target = self.database.get_collection(spec["into"])
+                merged = {json.dumps(d["_id"], default=str): d for d in target.docs}
+                for doc in docs:
+                    merged[json.dumps(doc["_id"], default=str)] = doc
+                target.docs = list(merged.values())
+                docs = []
+            else:
+                raise NotImplementedError(f"Unsupported aggregation stage: {operator}")
+        return docs
+
+
+class InMemoryMongoDatabase:
+    """MongoDB database stand-in; collections are created on first use."""
+
+    def __init__(self):
+        self._collections: dict[str, InMemoryCollection] = {}
+        # the query log writer thread and request handlers use the same data
+        self.lock = threading.RLock()
+
+    def get_collection(self, name: str) -> InMemoryCollection:
+        with self.lock:
+            collection = self._collections.get(name)
+            if collection is None:
+                collection = self._collections[name] = InMemoryCollection(self, name)
+            return collection
+
+    def __getitem__(self, name: str) -> InMemoryCollection:
+        return self.get_collection(name)
+
+
+class InMemoryMongoClient:
+    """`MongoClient` stand-in: `client[name]` returns an `InMemoryMongoDatabase`."""
+
+    def __init__(self):
+        self._databases: dict[str, InMemoryMongoDatabase] = {}
+
+    def __getitem__(self, name: str) -> InMemoryMongoDatabase:
+        return self._databases.setdefault(name, InMemoryMongoDatabase())
+
+    def close(self) -> None:
+        pass
+
+
+class _AsyncResultCursor:
+    def __init__(self, docs: list[dict]):
+        self._docs = docs
+
+    async def to_list(self, length: Optional[int] = None) -> list[dict]:
+        return self._docs if length is None else self._docs[:length]
+
+
+class AsyncInMemoryCollection:
+    """`AsyncCollection` stand-in over an `InMemoryCollection`."""
+
+    def __init__(self, collection: InMemoryCollection):
+        self._collection = collection
+
+    async def insert_one(self, document: dict) -> None:
+        self._collection.insert_one(document)
+
+    async def update_one(self, query: dict, update: dict, upsert: bool = False) -> None:
+        self._collection.update_one(query, update, upsert)
+
+    async def create_index(self, keys, name: Optional[str] = None, **kwargs) -> str:
+        return self._collection.create_index(keys, name)
+
+    async def count_documents(self, query: dict) -> int:
+        return self._collection.count_documents(query)
+
+    def find(self, query: Optional[dict] = None, sort=None, limit: int = 0) -> _AsyncResultCursor:
+        return _AsyncResultCursor(self._collection.find(query, sort, limit))
+
+    async def aggregate(self, pipeline: list[dict]) -> _AsyncResultCursor:
+        return _AsyncResultCursor(self._collection.aggregate(pipeline))
+
+
+class AsyncInMemoryMongoDatabase:
+    def __init__(self, database: InMemoryMongoDatabase):
+        self._database = database
+
+    def get_collection(self, name: str) -> AsyncInMemoryCollection:
+        return AsyncInMemoryCollection(self._database.get_collection(name))
+
+    def __getitem__(self, name: str) -> AsyncInMemoryCollection:
+        return self.get_collection(name)
+
+
+class AsyncInMemoryMongoClient:
+    """`AsyncMongoClient` stand-in sharing the databases of an `InMemoryMongoClient`."""
+
+    def __init__(self, client: InMemoryMongoClient):
+        self._client = client
+
+    def __getitem__(self, name: str) -> AsyncInMemoryMongoDatabase:
+        return AsyncInMemoryMongoDatabase(self._client[name])
+
+    async def close(self) -> None:
+        pass
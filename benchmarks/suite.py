@@ -0,0 +1,375 @@
+"""
+Offline micro-benchmark suite with regression check.
+
+Every `FilmSearchService` and `QueryLogService` method, `get_context_films_table` and
+the catalog page templates are timed against local stand-ins (see
+`benchmarks.standins`): the repository SQL runs on SQLite seeded with Sakila-shaped
+data and the query log lives in an in-memory MongoDB stand-in. No MySQL or MongoDB
+server is needed.
+
+Groups:
+    sql      - FilmSearchService without catalog/registry/cache: every call runs the repository SQL
+    catalog  - FilmSearchService on the in-memory catalog and category registry
+    mongo    - QueryLogService reports and log_search_query
+    pages    - get_context_films_table and template rendering (needs the FastAPI extras)
+
+Results are written as JSON. With `--baseline` every benchmark is compared with the
+baseline median; a benchmark slower by more than `--tolerance` is a regression and
+the run exits with status 1.
+
+Run from the project root:
+
+    python -m benchmarks.suite --output benchmarks/results/baseline.json
+    python -m benchmarks.suite --baseline benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional
+
+from app.core import catalog as catalog_module
+from app.core import categories as categories_module
+from app.core import services
+from app.core.catalog import FilmCatalog
+from app.core.categories import CategoryRegistry
+from app.core.services import FilmSearchService, QueryLogService, log_search_query
+from benchmarks.standins import InMemoryMongoDatabase, SQLiteMySQLConnection, create_sakila_standin
+
+GROUPS = ("sql", "catalog", "mongo", "pages")
+
+KEYWORD = "an"
+GENRE = "Drama"
+YEAR_FROM, YEAR_TO = 1995, 2008
+
+
+class Benchmark(NamedTuple):
+    name: str
+    fn: Callable[[], object]
+
+
+class Environment(NamedTuple):
+    mysql: SQLiteMySQLConnection
+    mongo: InMemoryMongoDatabase
+    catalog: FilmCatalog
+    categories: CategoryRegistry
+
+
+def install_standins(films_count: int, log_records: int) -> Environment:
+    """
+    Point the services at the stand-ins and load the catalog and registry from them.
+
+    Query logs are written synchronously (the background writer is bypassed) so that
+    `log_search_query` measures the full insert.
+    """
+    mysql = create_sakila_standin(films_count)
+    mongo = InMemoryMongoDatabase()
+
+    def run_on_standin(query, *args, **kwargs):
+        return query(mysql, *args, **kwargs)
+
+    for module in (services, catalog_module, categories_module):
+        module.run_mysql_read = run_on_standin
+    services.mysql_read_connection = lambda: contextlib.nullcontext(mysql)
+    services.get_mongo_db = lambda: mongo
+    services.query_log_async_enabled = False
+
+    catalog = FilmCatalog()
+    catalog.load()
+    categories = CategoryRegistry()
+    categories.load()
+
+    seed_query_logs(catalog, log_records)
+    return Environment(mysql, mongo, catalog, categories)
+
+
+def seed_query_logs(catalog: FilmCatalog, count: int) -> None:
+    """Write `count` search log records (with rollup updates) in the usual proportions."""
+    rollup_enabled, services.query_rollup_enabled = services.query_rollup_enabled, True
+    try:
+        genres = [c["category_name"] for c in film_service(catalog, None).list_all_categories()]
+        keywords = ["an", "love", "dragon", "ace", "bear", "kiss", "zorro", "blade"]
+        for i in range(count):
+            kind = i % 3
+            if kind == 0:
+                log_search_query("keyword", {"keyword": keywords[i % len(keywords)], "results_count": i % 50})
+            elif kind == 1:
+                log_search_query("category", {"category_name": genres[i % len(genres)], "results_count": 60})
+            else:
+                log_search_query("category_year", {"category_name": genres[i % len(genres)],
+                                                   "years_range": f"{1990 + i % 10} - 2010",
+                                                   "results_count": i % 40})
+    finally:
+        services.query_rollup_enabled = rollup_enabled
+
+
+def film_service_benchmarks(prefix: str, service: FilmSearchService) -> list[Benchmark]:
+    category = service.get_dict_category_by_name(GENRE)
+    next_token = service.search_by_category(category, page=1, log=False, keyset=True)["next_token"]
+
+    def consume(chunks):
+        for _ in chunks:
+            pass
+
+    return [
+        Benchmark(f"{prefix}.search_by_keyword",
+                  lambda: service.search_by_keyword(KEYWORD, page=2, log=False)),
+        Benchmark(f"{prefix}.search_by_category",
+                  lambda: service.search_by_category(category, page=2, log=False)),
+        Benchmark(f"{prefix}.search_by_category.keyset",
+                  lambda: service.search_by_category(category, page=2, log=False, keyset=True, cursor=next_token)),
+        Benchmark(f"{prefix}.search_by_category_year",
+                  lambda: service.search_by_category_year(category, YEAR_FROM, YEAR_TO, page=2, log=False)),
+        Benchmark(f"{prefix}.search_by_category_year.keyset",
+                  lambda: service.search_by_category_year(category, YEAR_FROM, YEAR_TO, page=1, log=False,
+                                                          keyset=True)),
+        Benchmark(f"{prefix}.get_year_range_by_category",
+                  lambda: service.get_year_range_by_category(category)),
+        Benchmark(f"{prefix}.list_all_categories", service.list_all_categories),
+        Benchmark(f"{prefix}.get_dict_category_by_name",
+                  lambda: service.get_dict_category_by_name(GENRE.lower())),
+        Benchmark(f"{prefix}.export_by_category.csv",
+                  lambda: consume(service.export_by_category(category, "csv"))),
+        Benchmark(f"{prefix}.export_by_keyword.ndjson",
+                  lambda: consume(service.export_by_keyword(KEYWORD, "ndjson"))),
+    ]
+
+
+def film_service(catalog: Optional[FilmCatalog], categories: Optional[CategoryRegistry]) -> FilmSearchService:
+    """FilmSearchService without the result cache (None disables the catalog/registry)."""
+    service = FilmSearchService()
+    service.catalog, service.categories, service.cache = catalog, categories, None
+    return service
+
+
+def sql_benchmarks(env: Environment) -> list[Benchmark]:
+    return film_service_benchmarks("sql", film_service(None, None))
+
+
+def catalog_benchmarks(env: Environment) -> list[Benchmark]:
+    return film_service_benchmarks("catalog", film_service(env.catalog, env.categories))
+
+
+def mongo_benchmarks(env: Environment) -> list[Benchmark]:
+    service = QueryLogService()
+
+    def with_rollup(enabled: bool, fn: Callable[[], object]) -> Callable[[], object]:
+        def run():
+            services.query_rollup_enabled = enabled
+            return fn()
+        return run
+
+    return [
+        Benchmark("mongo.get_top_queries.pipeline", with_rollup(False, service.get_top_queries)),
+        Benchmark("mongo.get_top_queries.rollup", with_rollup(True, service.get_top_queries)),
+        Benchmark("mongo.get_last_unique_queries.pipeline", with_rollup(False, service.get_last_unique_queries)),
+        Benchmark("mongo.get_last_unique_queries.rollup", with_rollup(True, service.get_last_unique_queries)),
+        Benchmark("mongo.log_search_query",
+                  with_rollup(True, lambda: log_search_query("keyword", {"keyword": "bench", "results_count": 3}))),
+    ]
+
+
+def pages_benchmarks(env: Environment) -> list[Benchmark]:
+    from starlette.requests import Request
+
+    from app.core.async_services import AsyncFilmSearchService
+    from app.interfaces.fastapi.routers.pages import get_context_films_table, templates
+
+    service = AsyncFilmSearchService()
+    service.catalog, service.categories, service.cache = env.catalog, env.categories, None
+    loop = asyncio.new_event_loop()
+
+    def make_request(path: str, query: str) -> Request:
+        return Request({"type": "http", "method": "GET", "path": path, "root_path": "", "scheme": "http",
+                        "query_string": query.encode(), "headers": [], "server": ("bench", 80)})
+
+    def context(method: str, **kwargs) -> Callable[[], dict]:
+        return lambda: loop.run_until_complete(
+            get_context_films_table(service=service, method=method, page=2, page_size=10, **kwargs))
+
+    pages = [
+        ("keyword.html", "/search/keyword", f"keyword={KEYWORD}&page=2",
+         context("keyword", keyword=KEYWORD)),
+        ("genre.html", f"/genres/{GENRE}", "page=2",
+         context("genre", genre=GENRE)),
+        ("genre_year.html", "/search/genre_year", f"genre={GENRE}&year_from={YEAR_FROM}&year_to={YEAR_TO}&page=2",
+         context("genre_year", genre=GENRE, year_from=YEAR_FROM, year_to=YEAR_TO)),
+    ]
+
+    benchmarks = []
+    for template_name, path, query, build_context in pages:
+        page_context = {**build_context(), "request": make_request(path, query)}
+        template = templates.get_template(template_name)
+        benchmarks.append(Benchmark(f"pages.get_context_films_table.{template_name[:-5]}", build_context))
+        benchmarks.append(Benchmark(f"pages.render.{template_name[:-5]}",
+                                    lambda t=template, c=page_context: t.render(c)))
+    return benchmarks
+
+
+BENCHMARK_GROUPS: dict[str, Callable[[Environment], list[Benchmark]]] = {
+    "sql": sql_benchmarks,
+    "catalog": catalog_benchmarks,
+    "mongo": mongo_benchmarks,
+    "pages": pages_benchmarks,
+}
+
+
+def measure(fn: Callable[[], object], repeat: int, min_time: float, warmup: int) -> dict:
+    """
+    Time one benchmark.
+
+    The number of calls per repeat is doubled until a repeat takes at least
+    `min_time` seconds; per-call times are reported in microseconds.
+    """
+    for _ in range(warmup):
+        fn()
+
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2
+
+    per_call = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(number):
+            fn()
+        per_call.append((time.perf_counter() - started) / number * 1e6)
+
+    median = statistics.median(per_call)
+    return {
+        "median_us": median,
+        "min_us": min(per_call),
+        "mean_us": statistics.fmean(per_call),
+        "stdev_us": statistics.stdev(per_call) if len(per_call) > 1 else 0.0,
+        "ops_per_sec": 1e6 / median if median else 0.0,
+        "number": number,
+        "repeat": repeat,
+    }
+
+
+def run_suite(groups: list[str], films_count: int, log_records: int, repeat: int, min_time: float,
+              warmup: int, pattern: Optional[str] = None) -> dict:
+    env = install_standins(films_count, log_records)
+    results = {}
+    for group in groups:
+        for benchmark in BENCHMARK_GROUPS[group](env):
+            if pattern and pattern not in benchmark.name:
+                continue
+            results[benchmark.name] = measure(benchmark.fn, repeat, min_time, warmup)
+            print(f"{benchmark.name:<50}{results[benchmark.name]['median_us']:>12.1f} us", flush=True)
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "films": films_count,
+            "log_records": log_records,
+            "groups": groups,
+        },
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> list[dict]:
+    """
+    Compare benchmark medians with a baseline run.
+
+    Only benchmarks of the current run are compared, so a run filtered with
+    `--groups`/`-k` can be checked against a full baseline.
+
+    Returns:
+        list[dict]: name, baseline_us, current_us, ratio and status ("ok", "regression",
+            "improved" or "new") per benchmark.
+    """
+    rows = []
+    baseline_results = baseline.get("results", {})
+    for name, now in sorted(current["results"].items()):
+        before = baseline_results.get(name)
+        if before is None:
+            rows.append({"name": name, "baseline_us": None, "current_us": now["median_us"],
+                         "ratio": None, "status": "new"})
+            continue
+        ratio = now["median_us"] / before["median_us"] if before["median_us"] else 1.0
+        if ratio > 1 + tolerance:
+            status = "regression"
+        elif ratio < 1 / (1 + tolerance):
+            status = "improved"
+        else:
+            status = "ok"
+        rows.append({"name": name, "baseline_us": before["median_us"], "current_us": now["median_us"],
+                     "ratio": ratio, "status": status})
+    return rows
+
+
+def print_comparison(rows: list[dict]) -> None:
+    print()
+    print(f"{'benchmark':<50}{'baseline us':>14}{'current us':>14}{'ratio':>8}  status")
+    for row in rows:
+        baseline = f"{row['baseline_us']:.1f}" if row["baseline_us"] is not None else "-"
+        current = f"{row['current_us']:.1f}" if row["current_us"] is not None else "-"
+        ratio = f"{row['ratio']:.2f}" if row["ratio"] is not None else "-"
+        status = row["status"].upper() if row["status"] == "regression" else row["status"]
+        print(f"{row['name']:<50}{baseline:>14}{current:>14}{ratio:>8}  {status}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmark suite")
+    parser.add_argument("--groups", default="sql,catalog,mongo,pages",
+                        help=f"comma-separated benchmark groups ({', '.join(GROUPS)})")
+    parser.add_argument("-k", dest="pattern", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--films", type=int, default=1000, help="number of synthetic films")
+    parser.add_argument("--log-records", type=int, default=3000, help="number of seeded search log records")
+    parser.add_argument("--repeat", type=int, default=5, help="timed repeats per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum seconds per repeat")
+    parser.add_argument("--warmup", type=int, default=3, help="untimed calls before measuring")
+    parser.add_argument("--output", default="benchmarks/results/latest.json", help="where to write results")
+    parser.add_argument("--baseline", help="results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown of the median before a benchmark fails (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    groups = [g.strip() for g in args.groups.split(",") if g.strip()]
+    unknown = [g for g in groups if g not in BENCHMARK_GROUPS]
+    if unknown:
+        parser.error(f"unknown groups: {', '.join(unknown)}")
+
+    current = run_suite(groups, args.films, args.log_records, args.repeat, args.min_time, args.warmup,
+                        args.pattern)
+
+    directory = os.path.dirname(args.output)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(current, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(current, baseline, args.tolerance)
+    print_comparison(rows)
+
+    regressions = [row for row in rows if row["status"] == "regression"]
+    if regressions:
+        print(f"\nFAILED: {len(regressions)} benchmark(s) slower than the baseline by more than "
+              f"{args.tolerance:.0%}: {', '.join(row['name'] for row in regressions)}", file=sys.stderr)
+        return 1
+    print(f"\nOK: no regressions (tolerance {args.tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""
+Synthetic film data for benchmarks.
+
+Rows have the same shape as the `films_mysql_repo` listing functions, so they can be
+loaded into `FilmCatalog` / `CategoryRegistry` with `load_rows` without MySQL.
+"""
+import random
+
+CATEGORY_NAMES = [
+    "Action", "Animation", "Children", "Classics", "Comedy", "Documentary", "Drama", "Family",
+    "Foreign", "Games", "Horror", "Music", "New", "Sci-Fi", "Sports", "Travel",
+]
+
+TITLE_WORDS = [
+    "ACADEMY", "ACE", "ADAPTATION", "AFFAIR", "AFRICAN", "AGENT", "AIRPLANE", "ALABAMA", "ALADDIN",
+    "ALAMO", "ALASKA", "ALI", "ALLEY", "ALONE", "AMADEUS", "AMELIE", "ANACONDA", "ANGELS", "ANNIE",
+    "ANTHEM", "APACHE", "ARABIA", "ARMAGEDDON", "ARMY", "ATLANTIS", "BABY", "BACKLASH", "BADMAN",
+    "BANG", "BAREFOOT", "BEACH", "BEAR", "BEAST", "BEDAZZLED", "BILL", "BIRDS", "BLADE", "BLOOD",
+    "BRIDE", "BROTHERHOOD", "CANDLES", "CAPER", "CASPER", "CHAMBER", "CHARIOTS", "CHICAGO", "CIRCUS",
+    "CLONES", "COAST", "CONFIDENTIAL", "DINOSAUR", "DRAGON", "EGG", "FIDELITY", "GOLDFINGER",
+    "GROSSE", "HUNTER", "IMPACT", "JEKYLL", "KISS", "LOVE", "MADNESS", "NECKLACE", "OPUS", "PRIX",
+    "RAINBOW", "SADDLE", "SPIRITED", "TITANS", "UNFORGIVEN", "VANILLA", "WONDERLAND", "ZORRO",
+]
+
+
+def generate_categories() -> list[dict]:
+    """Rows in the `films_mysql_repo.list_categories` format."""
+    return [{"category_id": i, "category_name": name} for i, name in enumerate(CATEGORY_NAMES, 1)]
+
+
+def generate_films(count: int = 1000, seed: int = 42) -> list[dict]:
+    """Rows in the `films_mysql_repo.list_films_with_categories` format."""
+    rnd = random.Random(seed)
+    return [
+        {
+            "film_id": film_id,
+            "title": f"{rnd.choice(TITLE_WORDS)} {rnd.choice(TITLE_WORDS)}",
+            "release_year": rnd.randint(1990, 2012),
+            "category_id": rnd.randint(1, len(CATEGORY_NAMES)),
+        }
+        for film_id in range(1, count + 1)
+    ]
+
+
+def year_ranges_by_category(films: list[dict]) -> list[dict]:
+    """Rows in the `films_mysql_repo.list_year_ranges_by_category` format."""
+    bounds: dict[int, tuple[int, int]] = {}
+    for film in films:
+        year_from, year_to = bounds.get(film["category_id"], (film["release_year"], film["release_year"]))
+        bounds[film["category_id"]] = (min(year_from, film["release_year"]), max(year_to, film["release_year"]))
+    return [{"category_id": category_id, "year_from": year_from, "year_to": year_to}
+            for category_id, (year_from, year_to) in sorted(bounds.items())]
@@ -0,0 +1,198 @@
+import re
+import sqlite3
+
+import pytest
+
+from app.core import catalog as catalog_module
+from app.core.catalog import FilmCatalog, collation_key
+from app.core.repositories import films_mysql_repo as repo
+
+CATEGORIES = [{"category_id": 1, "category_name": "Action"}]
+
+
+def make_catalog(films: list[dict]) -> FilmCatalog:
+    catalog = FilmCatalog()
+    catalog.load_rows(films, CATEGORIES)
+    return catalog
+
+
+def test_collation_key_ignores_case_and_accents():
+    assert collation_key("Émile") == collation_key("EMILE") == "emile"
+    assert sorted(["b", "A", "á", "C"], key=collation_key) == ["A", "á", "b", "C"]
+
+
+def test_keyset_pages_follow_the_collation_order():
+    titles = ["alpha", "Beta", "ÉCLAIR", "delta", "echo", "Zulu", "alpha"]
+    films = [{"film_id": i, "title": t, "release_year": 2006, "category_id": 1} for i, t in enumerate(titles, 1)]
+    catalog = make_catalog(films)
+
+    # the order MySQL returns for ORDER BY f.title, f.film_id under utf8mb4_0900_ai_ci
+    expected = [1, 7, 2, 4, 5, 3, 6]
+    seen, after = [], None
+    while True:
+        items, total = catalog.search_by_category_keyset(1, limit=2, after=after)
+        if not items:
+            break
+        seen += [item["film_id"] for item in items]
+        after = (items[-1]["title"], items[-1]["film_id"])
+    assert seen == expected and total == 7
+
+    # a token issued by MySQL for "echo" (a title equal to "ÉCHO" under the collation)
+    items, _ = catalog.search_by_category_keyset(1, limit=2, after=("ÉCHO", 5))
+    assert [item["film_id"] for item in items] == [3, 6]
+    items, _ = catalog.search_by_category_keyset(1, limit=2, before=("delta", 4))
+    assert [item["film_id"] for item in items] == [7, 2]
+
+
+class SqliteCursor:
+    """DB-API cursor of the repository functions (dict rows, %(name)s parameters) over sqlite3."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self._cursor = conn.cursor()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self._cursor.close()
+
+    def execute(self, sql: str, params: dict | None = None) -> None:
+        self._cursor.execute(re.sub(r"%\((\w+)\)s", r":\1", sql), params or {})
+
+    def fetchall(self) -> list[dict]:
+        columns = [column[0] for column in self._cursor.description]
+        return [dict(zip(columns, row)) for row in self._cursor.fetchall()]
+
+    def fetchone(self) -> dict | None:
+        rows = self.fetchall()
+        return rows[0] if rows else None
+
+
+class SqliteConnection:
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+
+    def cursor(self, dictionary: bool = True) -> SqliteCursor:
+        return SqliteCursor(self.db)
+
+
+SCHEMA_SQL = """
+CREATE TABLE category (category_id INTEGER PRIMARY KEY, name TEXT);
+CREATE TABLE film (film_id INTEGER PRIMARY KEY, title TEXT, release_year INTEGER);
+CREATE TABLE film_category (film_id INTEGER, category_id INTEGER, PRIMARY KEY (film_id, category_id));
+"""
+# (film_id, title, release_year, category ids); Sakila-like upper case titles, so sqlite's
+# binary order of titles is the order of the MySQL collation
+FIXTURE_FILMS = [
+    (1, "ACADEMY DINOSAUR", 2006, [1]),
+    (2, "ACE GOLDFINGER", 2004, [1, 2]),
+    (3, "ADAPTATION HOLES", 2010, [2]),
+    (4, "AFFAIR PREJUDICE", 2006, [1]),
+    (5, "AFRICAN EGG", None, [1]),
+    (6, "AGENT TRUMAN", 2001, [3]),
+    (7, "AIRPLANE SIERRA", 2006, [1, 3]),
+    (8, "ALADDIN CALENDAR", 2008, [2]),
+    (9, "ACE GOLDFINGER", 2006, [1]),
+    (10, "DINOSAUR SECRETARY", 2012, [1, 2]),
+]
+FIXTURE_CATEGORIES = [(1, "Action"), (2, "Animation"), (3, "Children")]
+
+
+@pytest.fixture
+def sql_conn() -> SqliteConnection:
+    conn = SqliteConnection()
+    conn.db.executescript(SCHEMA_SQL)
+    conn.db.executemany("INSERT INTO category VALUES (?, ?)", FIXTURE_CATEGORIES)
+    conn.db.executemany("INSERT INTO film VALUES (?, ?, ?)", [film[:3] for film in FIXTURE_FILMS])
+    conn.db.executemany("INSERT INTO film_category VALUES (?, ?)",
+                        [(film[0], category_id) for film in FIXTURE_FILMS for category_id in film[3]])
+    return conn
+
+
+@pytest.fixture
+def sql_catalog(sql_conn, monkeypatch) -> FilmCatalog:
+    """Catalog loaded from the sqlite fixture through `FilmCatalog.load` (as from MySQL)."""
+    monkeypatch.setattr(catalog_module, "run_mysql_read", lambda fn: fn(sql_conn))
+    catalog = FilmCatalog()
+    catalog.load()
+    return catalog
+
+
+def by_film(items: list[dict]) -> list[dict]:
+    """Rows in a fixed order (the SQL pages have no ORDER BY)."""
+    return sorted(items, key=lambda item: (item["film_id"], item["category_name"]))
+
+
+@pytest.mark.parametrize("keyword", ["ace", "DINOSAUR", "a", "in", "zzz", "n s"])
+def test_keyword_search_matches_sql(sql_conn, sql_catalog, keyword):
+    items, total = sql_catalog.search_by_keyword(keyword, limit=100)
+    assert by_film(items) == by_film(repo.search_films_by_title_like(sql_conn, keyword, limit=100))
+    assert total == repo.count_films_by_title_like(sql_conn, keyword)
+    assert (by_film(items), total) == (
+        by_film(repo.search_films_by_title_like_with_total(sql_conn, keyword, limit=100)[0]), total)
+
+
+@pytest.mark.parametrize("category_id", [1, 2, 3, 99])
+def test_category_search_matches_sql(sql_conn, sql_catalog, category_id):
+    items, total = sql_catalog.search_by_category(category_id, limit=100)
+    assert by_film(items) == by_film(repo.search_films_by_category(sql_conn, category_id, limit=100))
+    assert total == repo.count_films_by_category(sql_conn, category_id)
+    # pages of the catalog cover the same rows as one large page
+    pages = [sql_catalog.search_by_category(category_id, limit=3, offset=offset)[0] for offset in range(0, 9, 3)]
+    assert by_film([item for page in pages for item in page]) == by_film(items)
+
+
+@pytest.mark.parametrize("category_id, year_from, year_to", [(1, 2004, 2006), (1, 0, 3000), (2, 2008, 2012),
+                                                             (3, 2010, 2000)])
+def test_category_year_search_matches_sql(sql_conn, sql_catalog, category_id, year_from, year_to):
+    items, total = sql_catalog.search_by_category_in_year_range(category_id, year_from, year_to, limit=100)
+    expected = repo.search_films_by_category_in_year_range(sql_conn, category_id, year_from, year_to, limit=100)
+    assert by_film(items) == by_film(expected)
+    assert total == repo.count_films_by_category_in_year_range(sql_conn, category_id, year_from, year_to)
+
+
+def test_year_ranges_match_sql(sql_conn, sql_catalog):
+    for category_id in (1, 2, 3):
+        assert sql_catalog.get_year_range_by_category(category_id) == repo.get_year_range_by_category(
+            sql_conn, category_id)
+    assert sql_catalog.get_year_range_by_category(99) is None
+
+
+@pytest.mark.parametrize("after, before, offset", [
+    (None, None, 0),
+    (None, None, 2),
+    (("ACE GOLDFINGER", 2), None, 0),
+    (("ACE GOLDFINGER", 9), None, 1),
+    (None, ("AIRPLANE SIERRA", 7), 0),
+    (None, ("ACADEMY DINOSAUR", 1), 0),
+])
+def test_keyset_seek_matches_sql(sql_conn, sql_catalog, after, before, offset):
+    items, total = sql_catalog.search_by_category_keyset(1, limit=3, after=after, before=before, offset=offset)
+    assert items == repo.search_films_by_category_keyset(sql_conn, 1, limit=3, after=after, before=before,
+                                                         offset=offset)
+    assert total == repo.count_films_by_category(sql_conn, 1)
+
+    items, total = sql_catalog.search_by_category_in_year_range_keyset(1, 2000, 2010, limit=3, after=after,
+                                                                       before=before, offset=offset)
+    assert items == repo.search_films_by_category_in_year_range_keyset(sql_conn, 1, 2000, 2010, limit=3,
+                                                                       after=after, before=before, offset=offset)
+    assert total == repo.count_films_by_category_in_year_range(sql_conn, 1, 2000, 2010)
+
+
+def test_refresh_picks_up_changed_rows(sql_conn, sql_catalog):
+    snapshot = sql_catalog.snapshot()
+    sql_conn.db.execute("INSERT INTO film VALUES (11, 'ACE VENTURA', 2011)")
+    sql_conn.db.execute("INSERT INTO film_category VALUES (11, 3)")
+    sql_conn.db.execute("DELETE FROM film_category WHERE film_id = 2 AND category_id = 2")
+    assert sql_catalog.search_by_keyword("ace", limit=100)[1] == 2  # not reloaded yet
+
+    sql_catalog.refresh()
+    assert sql_catalog.snapshot() is not snapshot
+    for keyword in ("ace", "a"):
+        items, total = sql_catalog.search_by_keyword(keyword, limit=100)
+        assert by_film(items) == by_film(repo.search_films_by_title_like(sql_conn, keyword, limit=100))
+        assert total == repo.count_films_by_title_like(sql_conn, keyword)
+    for category_id in (2, 3):
+        items, total = sql_catalog.search_by_category(category_id, limit=100)
+        assert by_film(items) == by_film(repo.search_films_by_category(sql_conn, category_id, limit=100))
+        assert total == repo.count_films_by_category(sql_conn, category_id)
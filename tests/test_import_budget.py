@@ -0,0 +1,21 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from benchmarks.import_budget import BUDGETS_MS, measure_import
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Slower CI machines can relax the budgets, like `benchmarks.import_budget --scale`.
+SCALE = float(os.environ.get("IMPORT_BUDGET_SCALE", "1"))
+
+
+@pytest.mark.parametrize("module", ["app.interfaces.cli.main", "app.core.registry"])
+def test_entry_point_imports_within_budget_without_drivers(module, monkeypatch):
+    monkeypatch.chdir(ROOT)  # the probe interpreters put the working directory on the path
+    median_ms, loaded = measure_import(module, runs=3)
+
+    assert "mysql.connector" not in loaded
+    assert "pymongo" not in loaded
+    assert median_ms <= BUDGETS_MS[module] * SCALE
@@ -0,0 +1,49 @@
+import base64
+import json
+
+import pytest
+
+from app.core.services import add_page_tokens, decode_page_token, encode_page_token
+
+
+@pytest.mark.parametrize("direction", ["next", "prev"])
+def test_token_round_trip(direction):
+    item = {"film_id": 42, "title": "ÅNGEL / \"QUOTED\" TITLE", "release_year": 2006}
+    token = encode_page_token(item, direction)
+    assert "=" not in token and "/" not in token and "+" not in token
+    assert decode_page_token(token) == (direction, ("ÅNGEL / \"QUOTED\" TITLE", 42))
+
+
+def _token(payload) -> str:
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("token", [
+    None,
+    "",
+    "not base64!",
+    "////",
+    _token("next"),
+    _token(["next", "TITLE"]),
+    _token(["sideways", "TITLE", 1]),
+    _token(["next", 1, 1]),
+    _token(["next", "TITLE", "1"]),
+    base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+])
+def test_invalid_tokens_decode_to_none(token):
+    assert decode_page_token(token) is None
+
+
+def test_add_page_tokens_on_a_middle_page():
+    items = [{"film_id": 1, "title": "A"}, {"film_id": 2, "title": "B"}]
+    result = add_page_tokens({"items": items, "page": 2, "pages": 3})
+    assert decode_page_token(result["next_token"]) == ("next", ("B", 2))
+    assert decode_page_token(result["prev_token"]) == ("prev", ("A", 1))
+
+
+def test_add_page_tokens_on_the_only_page():
+    result = add_page_tokens({"items": [{"film_id": 1, "title": "A"}], "page": 1, "pages": 1})
+    assert result["next_token"] is None and result["prev_token"] is None
+
+    empty = add_page_tokens({"items": [], "page": 1, "pages": 0})
+    assert empty["next_token"] is None and empty["prev_token"] is None
@@ -0,0 +1,158 @@
+import gc
+import threading
+import time
+
+import pytest
+
+from app.core.db.pool import MySQLPool, close_without_reading
+from app.core.exceptions import DatabaseConnectionError, PoolTimeoutError
+
+
+class FakeConnection:
+    def __init__(self, number: int):
+        self.number = number
+        self.connected = True
+        self.resets = 0
+        self.closed = False
+        self.shut_down = False
+        self.unread_result = False
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def reset_session(self) -> None:
+        self.resets += 1
+
+    def shutdown(self) -> None:
+        self.shut_down = True
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeConnect:
+    """`connect` function that counts the opened connections."""
+
+    def __init__(self):
+        self.opened: list[FakeConnection] = []
+
+    def __call__(self) -> FakeConnection:
+        conn = FakeConnection(len(self.opened))
+        self.opened.append(conn)
+        return conn
+
+
+@pytest.fixture
+def connect():
+    return FakeConnect()
+
+
+def test_returned_connection_is_reset_and_reused(connect):
+    pool = MySQLPool(connect, pool_size=2, max_overflow=0)
+    conn = pool.acquire()
+    conn.close()
+    conn.close()  # a second close is a no-op
+    with pool.acquire() as again:
+        assert again.number == 0
+    assert len(connect.opened) == 1
+    assert connect.opened[0].resets == 2
+    stats = pool.stats()
+    assert (stats["opened"], stats["idle"], stats["in_use"], stats["checkouts"]) == (1, 1, 0, 2)
+
+
+def test_overflow_connections_are_closed_when_returned(connect):
+    pool = MySQLPool(connect, pool_size=1, max_overflow=1)
+    first, second = pool.acquire(), pool.acquire()
+    first.close()
+    second.close()
+    # the connection returned while the pool is over its size is closed
+    assert [c.closed for c in connect.opened] == [True, False]
+    assert pool.stats()["opened"] == 1
+
+
+def test_acquire_times_out_when_the_pool_is_exhausted(connect):
+    pool = MySQLPool(connect, pool_size=1, max_overflow=0)
+    held = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire(timeout=0.01)
+    assert pool.stats()["timeouts"] == 1 and pool.stats()["waiters"] == 0
+    held.close()
+
+
+def test_returned_connection_is_handed_to_the_waiting_thread(connect):
+    pool = MySQLPool(connect, pool_size=1, max_overflow=0)
+    held = pool.acquire()
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire(timeout=5)))
+    waiter.start()
+    while pool.stats()["waiters"] == 0:
+        time.sleep(0.001)
+    held.close()
+    waiter.join(5)
+    assert got[0].number == 0
+    got[0].close()
+
+
+def test_dead_idle_connection_is_replaced(connect):
+    pool = MySQLPool(connect, pool_size=1, max_overflow=0)
+    pool.acquire().close()
+    connect.opened[0].connected = False
+    with pool.acquire() as conn:
+        assert conn.number == 1
+    assert connect.opened[0].closed
+    assert pool.stats()["opened"] == 1
+
+
+def test_failed_connect_frees_the_slot(connect):
+    def fail():
+        raise DatabaseConnectionError("down")
+
+    pool = MySQLPool(fail, pool_size=1, max_overflow=0)
+    with pytest.raises(DatabaseConnectionError):
+        pool.acquire()
+    assert pool.stats()["opened"] == 0
+
+
+def test_garbage_collected_connection_is_reclaimed(connect):
+    pool = MySQLPool(connect, pool_size=1, max_overflow=0)
+    pool.acquire()  # never closed
+    gc.collect()
+    with pool.acquire(timeout=0.01) as conn:
+        assert conn.number == 0
+    assert pool.stats()["collected_unreturned"] == 1
+
+
+def test_connection_with_unread_rows_is_dropped_from_the_pool(connect):
+    pool = MySQLPool(connect, pool_size=1, max_overflow=0)
+    conn = pool.acquire()
+    connect.opened[0].unread_result = True
+    close_without_reading(conn)
+    conn.close()
+
+    raw = connect.opened[0]
+    assert raw.shut_down and raw.closed and raw.resets == 0
+    assert pool.stats()["opened"] == 0
+    with pool.acquire() as again:
+        assert again.number == 1
+
+
+def test_long_checkouts_are_reported_as_leaks(connect):
+    pool = MySQLPool(connect, leak_seconds=0, trace_checkouts=True)
+    conn = pool.acquire()
+    leaks = pool.leaked_connections()
+    assert len(leaks) == 1 and leaks[0]["trace"]
+    conn.close()
+    assert pool.leaked_connections() == []
+
+
+def test_closed_pool_closes_idle_connections_and_refuses_checkouts(connect):
+    pool = MySQLPool(connect, pool_size=2, max_overflow=0)
+    idle, in_use = pool.acquire(), pool.acquire()
+    idle.close()
+    pool.close()
+    assert connect.opened[0].closed
+    with pytest.raises(DatabaseConnectionError):
+        pool.acquire()
+    in_use.close()
+    assert connect.opened[1].closed
+    assert pool.stats()["opened"] == 0
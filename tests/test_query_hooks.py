@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from app.core import query_hooks
+from app.core.metrics import MONGO_LATENCY
+from app.core.query_hooks import timed_aggregate, timed_find, timed_find_async, timed_write, timed_write_async
+
+
+class FakeCollection:
+    def __init__(self, docs: list[dict]):
+        self.docs = docs
+        self.calls = []
+
+    def find(self, query_filter, **kwargs):
+        self.calls.append(("find", query_filter, kwargs))
+        return iter(self.docs[:kwargs.get("limit", len(self.docs))])
+
+    def aggregate(self, pipeline):
+        return iter(self.docs)
+
+    def insert_many(self, documents, **kwargs):
+        self.calls.append(("insert_many", documents, kwargs))
+        return "inserted"
+
+    def update_one(self, query_filter, update=None, upsert=False):
+        self.calls.append(("update_one", query_filter, {"update": update, "upsert": upsert}))
+        return "updated"
+
+
+class FakeAsyncCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self):
+        return list(self.docs)
+
+
+class FakeAsyncCollection(FakeCollection):
+    def find(self, query_filter, **kwargs):
+        return FakeAsyncCursor(super().find(query_filter, **kwargs))
+
+    async def insert_many(self, documents, **kwargs):
+        return super().insert_many(documents, **kwargs)
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Query events passed to the hooks during the test (only this hook is registered)."""
+    received = []
+    monkeypatch.setattr(query_hooks, "_hooks", [received.append])
+    return received
+
+
+def test_find_reports_filter_options_and_rows(events):
+    collection = FakeCollection([{"n": 1}, {"n": 2}, {"n": 3}])
+    docs = timed_find(collection, "find_top_queries_rollup", {}, sort=[("count", -1)], limit=2)
+
+    assert docs == [{"n": 1}, {"n": 2}]
+    assert collection.calls == [("find", {}, {"sort": [("count", -1)], "limit": 2})]
+    [event] = events
+    assert (event.backend, event.name, event.rows) == ("mongo", "find_top_queries_rollup", 2)
+    assert event.params == {"filter": {}, "sort": [("count", -1)], "limit": 2}
+
+
+def test_batch_writes_are_reported_by_size(events):
+    collection = FakeCollection([])
+    records = [{"n": i} for i in range(5)]
+    assert timed_write(collection, "insert_many_logs", "insert_many", records, ordered=False) == "inserted"
+
+    assert collection.calls == [("insert_many", records, {"ordered": False})]
+    [event] = events
+    assert (event.name, event.params, event.rows, event.fetch_seconds) == ("insert_many_logs", {"count": 5}, 5, 0.0)
+
+
+def test_single_writes_are_reported_with_their_argument(events):
+    collection = FakeCollection([])
+    timed_write(collection, "update_one_rollup", "update_one", {"key": "k"}, update={"$inc": {"count": 1}}, upsert=True)
+
+    assert collection.calls == [("update_one", {"key": "k"}, {"update": {"$inc": {"count": 1}}, "upsert": True})]
+    assert events[0].params == {"key": "k"} and events[0].rows == 1
+
+
+def test_async_find_and_write_report_events(events):
+    collection = FakeAsyncCollection([{"n": 1}])
+
+    async def main():
+        docs = await timed_find_async(collection, "find_top_queries_rollup", {}, limit=5)
+        await timed_write_async(collection, "insert_many_logs", "insert_many", [{"n": 2}])
+        return docs
+
+    assert asyncio.run(main()) == [{"n": 1}]
+    assert [(event.name, event.rows) for event in events] == [("find_top_queries_rollup", 1), ("insert_many_logs", 1)]
+
+
+def test_no_events_without_hooks(monkeypatch):
+    monkeypatch.setattr(query_hooks, "_hooks", [])
+    assert timed_aggregate(FakeCollection([{"n": 1}]), "aggregate", []) == [{"n": 1}]
+    assert timed_find(FakeCollection([{"n": 1}]), "find", {}) == [{"n": 1}]
+
+
+def test_latency_metrics_hook_observes_the_backend_histogram(monkeypatch):
+    monkeypatch.setattr(query_hooks, "_hooks", [query_hooks.latency_metrics_hook])
+    before = MONGO_LATENCY.labels("find_hook_test").snapshot()["count"]
+    timed_find(FakeCollection([{"n": 1}]), "find_hook_test", {})
+    assert MONGO_LATENCY.labels("find_hook_test").snapshot()["count"] == before + 1
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+
+from app.core.query_log_writer import BLOCK, DROP_OLDEST, QueryLogWriter
+
+
+class FakeSink:
+    """`write_batch` that records the batches; fails while `error` is set."""
+
+    def __init__(self):
+        self.batches: list[list[dict]] = []
+        self.error = None
+
+    def __call__(self, batch: list[dict]) -> None:
+        if self.error is not None:
+            raise self.error
+        self.batches.append(batch)
+
+    @property
+    def records(self) -> list[dict]:
+        return [record for batch in self.batches for record in batch]
+
+
+def make_writer(sink, **kwargs) -> QueryLogWriter:
+    kwargs.setdefault("flush_interval", 60.0)
+    return QueryLogWriter(write_batch=sink, **kwargs)
+
+
+def test_records_are_written_in_batches():
+    sink = FakeSink()
+    writer = make_writer(sink, batch_size=3)
+    for i in range(7):
+        assert writer.submit({"i": i})
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    assert [record["i"] for record in sink.records] == list(range(7))
+    assert all(len(batch) <= 3 for batch in sink.batches)
+    stats = writer.stats()
+    assert stats["written"] == 7
+    assert stats["queue_depth"] == 0 and stats["in_flight"] == 0
+
+
+def test_batch_is_written_after_the_flush_interval():
+    sink = FakeSink()
+    writer = make_writer(sink, batch_size=100, flush_interval=0.01)
+    writer.submit({"i": 0})
+    writer.close()
+    assert sink.records == [{"i": 0}]
+
+
+def test_full_queue_drops_the_oldest_record():
+    sink = FakeSink()
+    release = threading.Event()
+
+    def slow_sink(batch):
+        release.wait(5)
+        sink(batch)
+
+    writer = make_writer(slow_sink, max_queue_size=2, batch_size=1, full_policy=DROP_OLDEST)
+    writer.submit({"i": 0})
+    assert writer.flush(timeout=0.05) is False  # the worker holds record 0
+    for i in range(1, 4):
+        writer.submit({"i": i})
+    release.set()
+    writer.close()
+
+    assert [record["i"] for record in sink.records] == [0, 2, 3]
+    assert writer.stats()["dropped"] == 1
+
+
+def test_full_queue_with_block_policy_drops_the_new_record_after_the_timeout():
+    release = threading.Event()
+    writer = make_writer(lambda batch: release.wait(5), max_queue_size=1, batch_size=1,
+                         full_policy=BLOCK, block_timeout=0.01)
+    writer.submit({"i": 0})
+    writer.flush(timeout=0.05)
+    assert writer.submit({"i": 1})
+    assert writer.submit({"i": 2}) is False
+    release.set()
+    writer.close()
+    assert writer.stats()["dropped"] == 1
+
+
+def test_failed_batch_is_counted_and_the_worker_keeps_running():
+    sink = FakeSink()
+    writer = make_writer(sink, batch_size=2)
+    sink.error = RuntimeError("unexpected")
+    writer.submit({"i": 0})
+    writer.submit({"i": 1})
+    assert writer.flush(timeout=5)
+
+    sink.error = None
+    writer.submit({"i": 2})
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    assert sink.records == [{"i": 2}]
+    stats = writer.stats()
+    assert stats["failed"] == 2 and stats["written"] == 1 and stats["batches"] == 2
+
+
+def test_records_submitted_after_close_are_dropped():
+    sink = FakeSink()
+    writer = make_writer(sink)
+    writer.close()
+    assert writer.submit({"i": 0}) is False
+    assert writer.stats()["dropped"] == 1
+
+
+def test_unknown_full_policy_is_rejected():
+    with pytest.raises(ValueError):
+        QueryLogWriter(write_batch=FakeSink(), full_policy="wait")
@@ -0,0 +1,174 @@
+import pytest
+
+from app.core.db import connection
+from app.core.db.pool import MySQLPool
+from app.core.db.replicas import LEAST_OUTSTANDING, NoHealthyReplicaError, ReplicaSet
+
+
+class FakeConnection:
+    def __init__(self, server: str):
+        self.server = server
+
+    def is_connected(self) -> bool:
+        return True
+
+    def reset_session(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def make_replica_set(names=("r1", "r2", "r3"), down=(), **kwargs) -> ReplicaSet:
+    def check(name: str) -> None:
+        if name in down:
+            raise ConnectionError(name)
+
+    kwargs.setdefault("health_check_seconds", None)
+    return ReplicaSet(list(names), check, **kwargs)
+
+
+def test_round_robin_rotates_the_first_choice():
+    replicas = make_replica_set()
+    firsts = [replicas.select()[0] for _ in range(6)]
+    assert firsts == ["r1", "r2", "r3", "r1", "r2", "r3"]
+    assert sorted(replicas.select()) == ["r1", "r2", "r3"]
+
+
+def test_least_outstanding_prefers_the_least_busy_replica():
+    replicas = make_replica_set(selection=LEAST_OUTSTANDING)
+    in_use = {"r1": 4, "r2": 0, "r3": 2}
+    for _ in range(3):
+        assert replicas.select(in_use.get) == ["r2", "r3", "r1"]
+
+
+def test_unknown_selection_is_rejected():
+    with pytest.raises(ValueError):
+        make_replica_set(selection="random")
+
+
+def test_replica_is_ejected_after_max_failures_in_a_row():
+    replicas = make_replica_set(max_failures=3)
+    replicas.record_failure("r1")
+    replicas.record_failure("r1")
+    replicas.record_success("r1")  # a completed read resets the count
+    replicas.record_failure("r1")
+    replicas.record_failure("r1")
+    assert "r1" in replicas.select()
+
+    replicas.record_failure("r1", ConnectionError("gone"))
+    assert "r1" not in replicas.select()
+    stats = replicas.stats()["r1"]
+    assert stats["healthy"] is False
+    assert stats["ejections"] == 1
+    assert "gone" in stats["last_error"]
+
+
+def test_checkouts_do_not_reset_failures():
+    replicas = make_replica_set(max_failures=2)
+    for _ in range(2):
+        replicas.record_checkout("r1")
+        replicas.record_failure("r1")
+    stats = replicas.stats()["r1"]
+    assert stats["checkouts"] == 2
+    assert stats["healthy"] is False
+
+
+def test_ejected_replica_is_readmitted_after_readmit_successes():
+    down = {"r1"}
+    replicas = make_replica_set(down=down, max_failures=1, readmit_successes=2)
+    replicas.check_health()
+    assert replicas.select() and "r1" not in replicas.select()
+
+    down.clear()
+    replicas.check_health()
+    assert "r1" not in replicas.select()
+    replicas.check_health()
+    assert "r1" in replicas.select()
+    assert replicas.stats()["r1"]["readmissions"] == 1
+
+
+def test_failed_check_restarts_the_readmission_count():
+    down = {"r1"}
+    replicas = make_replica_set(down=down, max_failures=1, readmit_successes=2)
+    replicas.check_health()
+    down.clear()
+    replicas.check_health()
+    down.add("r1")
+    replicas.check_health()
+    down.clear()
+    replicas.check_health()
+    assert "r1" not in replicas.select()
+    replicas.check_health()
+    assert "r1" in replicas.select()
+
+
+def test_all_replicas_down_selects_nothing():
+    replicas = make_replica_set(down={"r1", "r2", "r3"}, max_failures=1)
+    replicas.check_health()
+    assert replicas.select() == []
+
+
+def test_background_health_check_thread_starts_and_stops():
+    replicas = make_replica_set(health_check_seconds=0.01)
+    replicas.start()
+    replicas.start()  # only one thread
+    replicas.stop()
+    assert replicas._thread is None
+
+
+@pytest.fixture
+def servers(monkeypatch):
+    """Primary and two replica pools of fake connections installed in the connection module."""
+    monkeypatch.setattr(connection, "_pool", MySQLPool(lambda: FakeConnection("primary")))
+    monkeypatch.setattr(connection, "_replica_pools", {
+        name: MySQLPool(lambda name=name: FakeConnection(name)) for name in ("r1", "r2")
+    })
+    replicas = make_replica_set(names=("r1", "r2"), max_failures=1)
+    monkeypatch.setattr(connection, "_replicas", replicas)
+    monkeypatch.setattr(connection, "mysql_replica_fallback_to_primary", True)
+    return replicas
+
+
+def server_name(conn) -> str:
+    return conn.server
+
+
+def test_reads_go_to_replicas_and_writes_to_the_primary(servers):
+    assert {connection.run_mysql_read(server_name) for _ in range(4)} == {"r1", "r2"}
+    conn = connection.get_mysql_connection(connection.WRITE)
+    try:
+        assert conn.server == "primary"
+    finally:
+        conn.close()
+
+
+def test_reads_fall_back_to_the_primary_when_all_replicas_are_down(servers, monkeypatch):
+    servers.record_failure("r1")
+    servers.record_failure("r2")
+    assert connection.run_mysql_read(server_name) == "primary"
+
+    monkeypatch.setattr(connection, "mysql_replica_fallback_to_primary", False)
+    with pytest.raises(NoHealthyReplicaError):
+        connection.run_mysql_read(server_name)
+
+
+def test_query_failure_on_a_replica_is_recorded_and_retried_on_the_primary(servers):
+    failure = connection.replica_failure_errors()[-1]
+
+    def query(conn):
+        if conn.server != "primary":
+            raise failure("lost connection")
+        return conn.server
+
+    assert connection.run_mysql_read(query) == "primary"
+    assert len(servers.select()) == 1  # the failing replica was ejected (max_failures=1)
+
+
+def test_statement_errors_are_not_replica_failures(servers):
+    def query(conn):
+        raise ValueError("bad statement")
+
+    with pytest.raises(ValueError):
+        connection.run_mysql_read(query)
+    assert sorted(servers.select()) == ["r1", "r2"]
@@ -0,0 +1,76 @@
+import pytest
+
+from app.core import cache
+from app.core.cache import ResultCache, approx_size
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable `time.monotonic` of the cache module."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_get_returns_stored_value_and_counts_hits_and_misses():
+    results = ResultCache()
+    assert results.get(("keyword", "ace")) is None
+    results.set(("keyword", "ace"), {"items": [1]})
+    assert results.get(("keyword", "ace")) == {"items": [1]}
+    stats = results.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+
+
+def test_entries_expire_after_the_ttl(clock):
+    results = ResultCache(ttl_seconds=10)
+    results.set("key", "value")
+    clock[0] += 10
+    assert results.get("key") == "value"
+    clock[0] += 0.1
+    assert results.get("key") is None
+    assert len(results) == 0 and results.stats()["bytes"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    results = ResultCache(max_entries=2)
+    results.set("a", 1)
+    results.set("b", 2)
+    results.get("a")
+    results.set("c", 3)
+    assert results.get("b") is None
+    assert results.get("a") == 1 and results.get("c") == 3
+    assert results.stats()["evictions"] == 1
+
+
+def test_size_bound_evicts_and_oversized_values_are_not_stored():
+    value = ["x" * 100]
+    size = approx_size(value)
+    results = ResultCache(max_bytes=2 * size)
+    results.set("a", value)
+    results.set("b", value)
+    results.set("c", value)
+    assert results.get("a") is None and len(results) == 2
+    assert results.stats()["bytes"] == 2 * size
+
+    results.set("big", ["x" * 10 * size])
+    assert results.get("big") is None and len(results) == 2
+
+
+def test_replacing_a_key_keeps_the_byte_count():
+    results = ResultCache()
+    results.set("a", [1, 2, 3])
+    results.set("a", [1])
+    assert results.stats()["bytes"] == approx_size([1])
+    assert results.get("a") == [1]
+
+
+def test_invalidate_by_search_type_or_everything():
+    results = ResultCache()
+    results.set(("keyword", "ace"), 1)
+    results.set(("keyword", "dino"), 2)
+    results.set(("category", "1"), 3)
+    results.invalidate("keyword")
+    assert len(results) == 1 and results.get(("category", "1")) == 3
+
+    results.invalidate()
+    assert len(results) == 0 and results.stats()["bytes"] == 0
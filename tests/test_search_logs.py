@@ -0,0 +1,22 @@
+import asyncio
+
+from app.core import async_services
+from app.core.async_services import log_search_query_async, record_search_logs
+
+
+def test_search_logs_written_by_tasks_inside_the_block_are_recorded(monkeypatch):
+    written = []
+    monkeypatch.setattr(async_services, "query_log_async_enabled", True)
+    monkeypatch.setattr(async_services, "log_search_query", lambda search_type, params: written.append(search_type))
+
+    async def route():
+        await log_search_query_async("keyword", {"keyword": "ace", "results_count": 3})
+
+    async def main():
+        with record_search_logs() as recorded:
+            await asyncio.create_task(route())
+        await route()  # outside the block: written, not recorded
+        return recorded
+
+    assert asyncio.run(main()) == [("keyword", {"keyword": "ace", "results_count": 3})]
+    assert written == ["keyword", "keyword"]
@@ -0,0 +1,103 @@
+import threading
+
+import pytest
+
+from app.core import services
+from app.core.cache import ResultCache
+from app.core.catalog import FilmCatalog
+from app.core.categories import CategoryRegistry
+from app.core.services import FilmSearchService
+
+CATEGORIES = [{"category_id": 1, "category_name": "Action"}, {"category_id": 2, "category_name": "Comedy"}]
+FILMS = [
+    {"film_id": 1, "title": "ACE GOLDFINGER", "release_year": 2006, "category_id": 1},
+    {"film_id": 2, "title": "ACADEMY DINOSAUR", "release_year": 2004, "category_id": 1},
+    {"film_id": 2, "title": "ACADEMY DINOSAUR", "release_year": 2004, "category_id": 2},
+    {"film_id": 3, "title": "BEAST HUNCHBACK", "release_year": 2010, "category_id": 2},
+]
+YEAR_RANGES = [{"category_id": 1, "year_from": 2004, "year_to": 2006},
+               {"category_id": 2, "year_from": 2004, "year_to": 2010}]
+
+
+class RecordingService(FilmSearchService):
+    """Service that records the unique queries it runs and the threads they run on."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.runs = []
+
+    def _run_batch_query(self, key: tuple, log: bool) -> dict:
+        self.runs.append((key, threading.current_thread().name))
+        return super()._run_batch_query(key, log)
+
+
+@pytest.fixture
+def service() -> RecordingService:
+    catalog = FilmCatalog()
+    catalog.load_rows(FILMS, CATEGORIES)
+    categories = CategoryRegistry()
+    categories.load_rows(CATEGORIES, YEAR_RANGES)
+    return RecordingService(catalog=catalog, cache=ResultCache(), categories=categories)
+
+
+def test_outcomes_follow_the_query_order(service):
+    outcomes = service.search_many([
+        {"type": "category", "category_name": "comedy"},
+        {"type": "keyword", "keyword": "dinosaur"},
+        {"type": "category_year", "category_name": "Action", "year_from": 2005, "year_to": 2010},
+    ])
+    assert [outcome["ok"] for outcome in outcomes] == [True, True, True]
+    assert [[item["film_id"] for item in outcome["result"]["items"]] for outcome in outcomes] == [[2, 3], [2, 2], [1]]
+    assert [outcome["result"]["total"] for outcome in outcomes] == [2, 1, 1]
+
+
+def test_duplicate_queries_run_once_and_get_their_own_items(service):
+    outcomes = service.search_many([
+        {"type": "keyword", "keyword": "ACE"},
+        {"type": "category", "category_name": "Action"},
+        {"type": "keyword", "keyword": "ace", "page": 1, "page_size": 10},
+    ])
+    assert [key for key, _ in service.runs] == [("keyword", "ace", 1, 10), ("category", "action", 1, 10)]
+    first, _, duplicate = outcomes
+    assert duplicate["result"] == first["result"]
+    duplicate["result"]["items"][0]["title"] = "changed"
+    assert first["result"]["items"][0]["title"] == "ACE GOLDFINGER"
+
+
+def test_a_malformed_query_only_fails_its_own_item(service):
+    outcomes = service.search_many([
+        {"type": "keyword", "keyword": "ace"},
+        "not a query",
+        {"type": "keyword"},
+        {"type": "genre", "category_name": "Action"},
+        {"type": "category", "category_name": "Horror"},
+        {"type": "keyword", "keyword": "ace", "page_size": 500},
+    ], max_page_size=100)
+    assert [outcome["ok"] for outcome in outcomes] == [True, False, False, False, False, False]
+    assert [outcome["error"] for outcome in outcomes[1:]] == [
+        "query must be an object",
+        "keyword is required",
+        "Unknown query type: genre",
+        "Category not found: horror",
+        "page_size must not exceed 100",
+    ]
+    assert len(service.runs) == 2
+
+
+def test_catalog_lookups_run_inline(service):
+    service.search_many([{"type": "keyword", "keyword": "ace"}, {"type": "category", "category_name": "Action"}])
+    assert {thread for _, thread in service.runs} == {threading.current_thread().name}
+
+
+def test_mysql_lookups_run_on_the_thread_pool(service, monkeypatch):
+    service.catalog = None
+    monkeypatch.setattr(services, "run_mysql_read", lambda fn, *args: fn(None, *args))
+    monkeypatch.setattr(services.repo, "search_films_by_title_like", lambda conn, keyword, limit, offset: [])
+    monkeypatch.setattr(services.repo, "count_films_by_title_like", lambda conn, keyword: 0)
+    monkeypatch.setattr(services, "use_window_count", lambda conn: False)
+
+    outcomes = service.search_many([{"type": "keyword", "keyword": "ace"}, {"type": "keyword", "keyword": "dino"},
+                                    {"type": "keyword", "keyword": "ace"}])
+    assert [outcome["ok"] for outcome in outcomes] == [True, True, True]
+    assert len(service.runs) == 2
+    assert all(thread.startswith("search-many") for _, thread in service.runs)
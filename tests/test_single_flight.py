@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+def test_concurrent_sync_calls_with_one_key_run_once():
+    group = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"items": []}
+
+    with ThreadPoolExecutor(max_workers=5) as pool:
+        leader = pool.submit(group.do, ("keyword", "ace"), work)
+        assert started.wait(5)
+        followers = [pool.submit(group.do, ("keyword", "ace"), work) for _ in range(4)]
+        while group.stats()["coalesced"] < 4:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    stats = group.stats()
+    assert stats["executions_by_type"] == {"keyword": 1}
+    assert stats["coalesced_by_type"] == {"keyword": 4}
+    assert stats["coalesced_ratio"] == 0.8 and stats["in_flight"] == 0
+
+
+def test_sync_error_is_shared_and_the_key_is_released():
+    group = SingleFlight()
+
+    def fail():
+        raise LookupError("boom")
+
+    with pytest.raises(LookupError):
+        group.do("key", fail)
+    assert group.do("key", lambda: "ok") == "ok"
+    assert group.stats()["executions"] == 2
+
+
+def test_sequential_calls_are_not_coalesced():
+    group = SingleFlight()
+    assert [group.do(("category", "1"), lambda: n) for n in range(3)] == [0, 1, 2]
+    assert group.stats()["coalesced"] == 0
+
+
+def test_concurrent_async_calls_with_one_key_run_once():
+    group = SingleFlight()
+    calls = []
+
+    async def work():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    async def main():
+        return await asyncio.gather(*(group.do_async(("keyword", "ace"), work) for _ in range(5)))
+
+    assert asyncio.run(main()) == [1] * 5
+    assert group.stats()["coalesced"] == 4 and group.stats()["in_flight"] == 0
+
+
+def test_cancelling_the_first_async_caller_does_not_cancel_the_others():
+    group = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def main():
+        first = asyncio.ensure_future(group.do_async("key", work))
+        second = asyncio.ensure_future(group.do_async("key", work))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second, first.cancelled()
+
+    assert asyncio.run(main()) == ("done", True)
@@ -0,0 +1,72 @@
+import pytest
+
+from app.core.trigram_index import TrigramIndex, get_keyword_trigrams, like_matcher, split_like_pattern
+
+TITLES = {
+    1: "ACADEMY DINOSAUR",
+    2: "ACE GOLDFINGER",
+    3: "ADAPTATION HOLES",
+    4: "AFFAIR PREJUDICE",
+    5: "100% LOVE",
+    6: "A_B TEST",
+}
+
+
+@pytest.mark.parametrize("keyword, title, expected", [
+    ("dino", "academy dinosaur", True),
+    ("DINO", "academy dinosaur", True),
+    ("saur ", "academy dinosaur", False),
+    ("a%y", "academy dinosaur", True),
+    ("ac_d", "academy dinosaur", True),
+    ("ac_d", "acdemy", False),
+    ("100\\%", "100% love", True),
+    ("100\\%", "1000 love", False),
+    ("a\\_b", "a_b test", True),
+    ("a\\_b", "axb test", False),
+    ("", "anything", True),
+    ("%", "", True),
+])
+def test_like_matcher_follows_mysql_like_semantics(keyword, title, expected):
+    assert like_matcher(keyword)(title) is expected
+
+
+def test_split_like_pattern_keeps_escaped_wildcards_literal():
+    assert split_like_pattern("a%b_c\\%d") == ["a", "%", "b", "_", "c%d"]
+    assert split_like_pattern("end\\") == ["end\\"]
+
+
+def test_keyword_trigrams_come_from_literal_segments_only():
+    assert get_keyword_trigrams("ACAD%y") == {"aca", "cad"}
+    assert get_keyword_trigrams("ab") == set()
+
+
+@pytest.mark.parametrize("keyword", ["dino", "a", "ac", "ace", "a%e", "ad_p", "100\\%", "a\\_b", "es", "zzz", ""])
+def test_search_matches_a_full_scan(keyword):
+    index = TrigramIndex.build(TITLES)
+    match = like_matcher(keyword)
+    expected = sorted(film_id for film_id, title in TITLES.items() if match(title.lower()))
+    assert index.search(keyword) == expected
+
+
+def test_short_keywords_have_no_candidates():
+    index = TrigramIndex.build(TITLES)
+    assert index.candidates("ac") is None
+    assert index.candidates("ace") == {2}
+
+
+def test_updated_index_equals_a_rebuilt_one_and_leaves_the_old_one_intact():
+    old = TrigramIndex.build(TITLES)
+    old_postings = {trigram: set(film_ids) for trigram, film_ids in old.postings.items()}
+
+    titles = dict(TITLES)
+    del titles[1]
+    titles[2] = "ACE GOLDMEMBER"
+    titles[7] = "ZORRO ARK"
+    new = old.updated(titles)
+
+    rebuilt = TrigramIndex.build(titles)
+    assert new.titles == rebuilt.titles
+    assert new.postings == rebuilt.postings
+    assert {trigram: set(film_ids) for trigram, film_ids in old.postings.items()} == old_postings
+    assert old.search("dino") == [1] and new.search("dino") == []
+    assert new.search("zorro") == [7]